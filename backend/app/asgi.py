@@ -0,0 +1,203 @@
+"""
+Optional ASGI entry point for high-concurrency deployments.
+
+    uvicorn backend.app.asgi:app --workers 2
+
+Serves the read side of the same namespaces as backend.app.main
+(recipes, ingredients and cuisines reads, /health, /db/health) with async
+handlers on pymongo's async client or Motor, so a worker is not tied up
+while a Mongo round trip is in flight. Filters, sorting and pagination
+come from the Flask route modules, so both apps return the same documents.
+
+The app is read-only. Writes go to the Flask app, whose handlers
+keep its in-process state in step: the document caches, the list
+snapshots, and the /recipes/match and /search indexes. A write made here
+would leave that state stale in the Flask processes, and it would also
+skip the role guards. Bulk import, exports, /recipes/match and /search
+stay on the Flask app as well.
+"""
+from __future__ import annotations
+
+import inspect
+from contextlib import asynccontextmanager
+
+from bson import ObjectId
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from backend.app.db import DB_NAME, make_async_client
+from backend.app.features.cuisines.routes import _serialize_cuisine
+from backend.app.features.ingredients.routes import _to_public
+from backend.app.features.recipes.routes import (
+    _after_condition,
+    _page_links,
+    _parse_listing,
+    _serialize_recipe,
+)
+from backend.app.json_codec import dumps
+
+
+def json_response(data, status: int = 200) -> Response:
+    return Response(dumps(data), status_code=status, media_type="application/json")
+
+
+def _error(message: str, status: int = 400) -> Response:
+    return json_response({"error": message}, status)
+
+
+def _abort(message: str, status: int = 400) -> Response:
+    # The ingredients namespace reports errors the flask-restx way.
+    return json_response({"message": message}, status)
+
+
+def _object_id(value: str) -> ObjectId | None:
+    try:
+        return ObjectId(value)
+    except Exception:
+        return None
+
+
+# -----------------------
+# Health / DB
+# -----------------------
+async def health(request: Request) -> Response:
+    return json_response({"status": "ok"})
+
+
+async def db_health(request: Request) -> Response:
+    try:
+        await request.app.state.db.client.admin.command("ping")
+        return json_response({"mongo": "ok"})
+    except Exception:
+        return json_response({"mongo": "down"}, 500)
+
+
+# -----------------------
+# Recipes
+# -----------------------
+async def recipes_collection(request: Request) -> Response:
+    db = request.app.state.db
+    args = request.query_params
+    try:
+        limit, projection, query, sort = _parse_listing(args)
+    except ValueError as e:
+        return _error(str(e))
+
+    after = args.get("after")
+    if after:
+        after_oid = _object_id(after)
+        if after_oid is None:
+            return _error("Invalid 'after' id format.")
+        anchor = None
+        field = sort[0][0]
+        if field != "_id":
+            anchor = await db.recipes.find_one({"_id": after_oid}, {field: 1})
+            if anchor is None:
+                return _error("Recipe in 'after' not found.")
+        keyset = _after_condition(sort, after_oid, anchor)
+        query = {"$and": [query, keyset]} if query else keyset
+
+    cursor = db.recipes.find(query, projection).sort(sort).limit(limit + 1).batch_size(limit + 1)
+    recipes = [_serialize_recipe(doc) for doc in await cursor.to_list(limit + 1)]
+    has_more = len(recipes) > limit
+    recipes = recipes[:limit]
+
+    params = {key: args.getlist(key) for key in args.keys()}
+    links = _page_links(
+        str(request.url), str(request.base_url).rstrip("/"), params,
+        limit, recipes[-1]["_id"] if has_more else None,
+    )
+    return json_response({"recipes": recipes, "_links": links})
+
+
+async def recipe_item(request: Request) -> Response:
+    db = request.app.state.db
+    recipe_id = request.path_params["recipe_id"]
+    oid = _object_id(recipe_id)
+    if oid is None:
+        return _error("Invalid recipe id format.")
+
+    doc = await db.recipes.find_one({"_id": oid})
+    if doc is None:
+        return _error("Recipe not found.", 404)
+    return json_response(_serialize_recipe(doc))
+
+
+# -----------------------
+# Ingredients
+# -----------------------
+async def ingredients_collection(request: Request) -> Response:
+    db = request.app.state.db
+    docs = await db.ingredients.find({}).sort("name", 1).to_list(None)
+    return json_response([_to_public(d) for d in docs])
+
+
+async def ingredient_item(request: Request) -> Response:
+    db = request.app.state.db
+    ingredient_id = request.path_params["ingredient_id"]
+    oid = _object_id(ingredient_id)
+    if oid is None:
+        return _abort("Invalid id")
+
+    doc = await db.ingredients.find_one({"_id": oid})
+    if not doc:
+        return _abort("Ingredient not found", 404)
+    return json_response(_to_public(doc))
+
+
+# -----------------------
+# Cuisines
+# -----------------------
+async def cuisines_collection(request: Request) -> Response:
+    db = request.app.state.db
+    docs = await db.cuisines.find({}).sort("name", 1).to_list(None)
+    return json_response({"cuisines": [_serialize_cuisine(d) for d in docs]})
+
+
+async def cuisine_item(request: Request) -> Response:
+    db = request.app.state.db
+    cuisine_id = request.path_params["cuisine_id"]
+    oid = _object_id(cuisine_id)
+    if oid is None:
+        return _error("Invalid cuisine id format.")
+
+    doc = await db.cuisines.find_one({"_id": oid})
+    if doc is None:
+        return _error("Cuisine not found.", 404)
+    return json_response(_serialize_cuisine(doc))
+
+
+@asynccontextmanager
+async def lifespan(app: Starlette):
+    # The client is bound to the running event loop, so it is created here
+    # rather than at import time.
+    client = make_async_client()
+    app.state.db = client[DB_NAME]
+    try:
+        yield
+    finally:
+        closed = client.close()
+        if inspect.isawaitable(closed):
+            await closed
+
+
+def create_asgi_app() -> Starlette:
+    routes = [
+        Route("/health", health),
+        Route("/db/health", db_health),
+        Route("/recipes", recipes_collection),
+        Route("/recipes/{recipe_id}", recipe_item),
+        Route("/ingredients", ingredients_collection),
+        Route("/ingredients/{ingredient_id}", ingredient_item),
+        Route("/cuisines", cuisines_collection),
+        Route("/cuisines/{cuisine_id}", cuisine_item),
+    ]
+    middleware = [Middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["GET"], allow_headers=["*"])]
+    return Starlette(routes=routes, middleware=middleware, lifespan=lifespan)
+
+
+app = create_asgi_app()
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from bson import ObjectId
+
+DOC_CACHE_SIZE = int(os.getenv("DOC_CACHE_SIZE", "10000"))
+DOC_CACHE_TTL = float(os.getenv("DOC_CACHE_TTL", "60"))
+INGREDIENT_CACHE_SIZE = int(os.getenv("INGREDIENT_CACHE_SIZE", "2048"))
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+TOKEN_CACHE_TTL = float(os.getenv("TOKEN_CACHE_TTL", "300"))
+
+
+class DocumentCache:
+    """
+    Process-wide read-through cache for single documents.
+    Keyed by (collection, ObjectId), bounded in size (LRU) and age (TTL).
+    """
+
+    def __init__(self, maxsize: int = DOC_CACHE_SIZE, ttl: float = DOC_CACHE_TTL,
+                 clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()
+        # key -> [loads in flight, generation]; invalidate() bumps the
+        # generation so a load that started before it is not stored.
+        self._loading: dict = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, collection: str, oid: ObjectId):
+        key = (collection, oid)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, doc = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            # Callers serialize in place, so hand out a shallow copy.
+            return dict(doc)
+
+    def put(self, collection: str, oid: ObjectId, doc: dict):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._store((collection, oid), doc)
+
+    def _store(self, key: tuple, doc: dict):
+        self._entries[key] = (self._clock() + self.ttl, dict(doc))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_load(self, collection: str, oid: ObjectId, loader: Callable[[], dict | None]):
+        """
+        Return the cached document or call loader() and cache its result.
+        Misses (None) are not cached so a later insert is seen right away,
+        and neither is a load that an invalidate() overlapped, since it may
+        have read the document from before that write.
+        """
+        doc = self.get(collection, oid)
+        if doc is not None:
+            return doc
+        key = (collection, oid)
+        with self._lock:
+            loading = self._loading.setdefault(key, [0, 0])
+            loading[0] += 1
+            generation = loading[1]
+        try:
+            doc = loader()
+        finally:
+            with self._lock:
+                loading[0] -= 1
+                if not loading[0]:
+                    del self._loading[key]
+                if doc is not None and self.maxsize > 0 and loading[1] == generation:
+                    self._store(key, doc)
+        return doc
+
+    def invalidate(self, collection: str, oid: ObjectId):
+        key = (collection, oid)
+        with self._lock:
+            self._entries.pop(key, None)
+            loading = self._loading.get(key)
+            if loading is not None:
+                loading[1] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            for loading in self._loading.values():
+                loading[1] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+doc_cache = DocumentCache()
+
+# Ingredient lookups for ?expand=ingredients, keyed ("id", ObjectId) and
+# ("name", name). Cleared on every ingredient write.
+ingredient_cache = DocumentCache(maxsize=INGREDIENT_CACHE_SIZE)
+
+# Claims of access tokens whose signature already checked out, keyed
+# ("token", token). Expiry and revocation are still checked on every hit.
+token_cache = DocumentCache(maxsize=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL)
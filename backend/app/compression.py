@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import gzip
+import os
+
+from flask import Flask, Response, request
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+# Bodies smaller than this go out as-is; compressing them costs more
+# than the bytes it saves.
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+COMPRESS_GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+COMPRESS_BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "4"))
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "application/javascript")
+
+
+def choose_encoding(accept_encodings) -> str | None:
+    """
+    Best encoding the client accepts: the higher q-value wins, brotli on
+    a tie. None when neither is acceptable.
+    """
+    candidates = []
+    if brotli is not None and accept_encodings["br"] > 0:
+        candidates.append((accept_encodings["br"], 1, "br"))
+    if accept_encodings["gzip"] > 0:
+        candidates.append((accept_encodings["gzip"], 0, "gzip"))
+    return max(candidates)[2] if candidates else None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=COMPRESS_BROTLI_QUALITY)
+    # mtime=0 keeps the output identical for identical input.
+    return gzip.compress(body, compresslevel=COMPRESS_GZIP_LEVEL, mtime=0)
+
+
+def _compressible(response: Response) -> bool:
+    mimetype = response.mimetype or ""
+    return mimetype.startswith("text/") or mimetype in COMPRESSIBLE_TYPES
+
+
+def compress_response(response: Response) -> Response:
+    """Compress a buffered response body for clients that accept it."""
+    if response.direct_passthrough or response.is_streamed:
+        return response
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return response
+    if "Content-Encoding" in response.headers or not _compressible(response):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_SIZE:
+        return response
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    response.set_data(compress(body, encoding))
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def init_compression(app: Flask):
+    @app.after_request
+    def _compress(response: Response) -> Response:
+        return compress_response(response)
@@ -0,0 +1,66 @@
+# backend/app/features/admin/routes.py
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from bson import ObjectId
+from flask import request
+from flask_restx import Namespace, Resource
+from pymongo import ReturnDocument
+
+from backend.app.db import get_db
+from backend.app.security import ROLES, require_role, revocations
+
+admin_ns = Namespace("admin", description="User administration")
+
+USER_STATUSES = ("active", "suspended")
+
+# Tokens carry the role, so changing a role or suspending a user revokes
+# every token issued to them so far; they log in again to get a new one.
+
+
+def _update_user(user_id: str, field: str, value: str):
+    if not ObjectId.is_valid(user_id):
+        return {"error": "Invalid user id."}, 400
+    user = get_db().users.find_one_and_update(
+        {"_id": ObjectId(user_id)},
+        {"$set": {field: value, "updated_at": datetime.now(timezone.utc)}},
+        projection={"email": 1, "role": 1, "status": 1},
+        return_document=ReturnDocument.AFTER,
+    )
+    if user is None:
+        return {"error": "User not found."}, 404
+    revocations.revoke_user(user_id)
+    return {"id": user_id, "email": user["email"], "role": user["role"], "status": user["status"]}, 200
+
+
+def _field(name: str, allowed: tuple) -> str:
+    data = request.get_json(silent=True)
+    value = data.get(name) if isinstance(data, dict) else None
+    if value not in allowed:
+        raise ValueError(f"Field '{name}' must be one of: {', '.join(allowed)}.")
+    return value
+
+
+@admin_ns.route("/users/<string:user_id>/role")
+class UserRole(Resource):
+    @require_role("admin", always=True)
+    def patch(self, user_id: str):
+        """Change a user's role: {"role": "content_manager"}."""
+        try:
+            role = _field("role", ROLES)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        return _update_user(user_id, "role", role)
+
+
+@admin_ns.route("/users/<string:user_id>/status")
+class UserStatus(Resource):
+    @require_role("admin", always=True)
+    def patch(self, user_id: str):
+        """Suspend or reactivate a user: {"status": "suspended"}."""
+        try:
+            status = _field("status", USER_STATUSES)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        return _update_user(user_id, "status", status)
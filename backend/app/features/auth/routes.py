@@ -0,0 +1,120 @@
+# backend/app/features/auth/routes.py
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from flask import request
+from flask_restx import Namespace, Resource
+from pymongo.errors import DuplicateKeyError
+
+from backend.app.db import get_db
+from backend.app.security import (
+    ACCESS_TOKEN_TTL,
+    check_password,
+    current_user,
+    hash_password,
+    issue_token,
+    require_auth,
+    revocations,
+)
+from backend.app.utils.email_address import EmailAddress
+
+auth_ns = Namespace("auth", description="Accounts and access tokens")
+
+MIN_PASSWORD_LENGTH = 8
+MAX_PASSWORD_LENGTH = 128
+
+# Compared against when the email is unknown, so a miss costs the same
+# scrypt time as a wrong password and does not reveal which emails exist.
+_DUMMY_HASH = hash_password("not-a-real-password")
+
+
+def _parse_credentials(data) -> tuple[str, str]:
+    if not isinstance(data, dict):
+        raise ValueError("Request body must be a JSON object.")
+    email = data.get("email")
+    if not isinstance(email, str):
+        raise ValueError("Field 'email' is required.")
+    email = EmailAddress(email).value
+    password = data.get("password")
+    if not isinstance(password, str) or not MIN_PASSWORD_LENGTH <= len(password) <= MAX_PASSWORD_LENGTH:
+        raise ValueError(f"Field 'password' must be {MIN_PASSWORD_LENGTH}-{MAX_PASSWORD_LENGTH} characters.")
+    return email, password
+
+
+def new_user(email: str, password: str, role: str = "user") -> dict:
+    now = datetime.now(timezone.utc)
+    return {
+        "email": email,
+        "password_hash": hash_password(password),
+        "role": role,
+        "status": "active",
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def _token_response(user: dict) -> dict:
+    return {
+        "access_token": issue_token(str(user["_id"]), user["role"]),
+        "token_type": "bearer",
+        "expires_in": ACCESS_TOKEN_TTL,
+        "user": {"id": str(user["_id"]), "email": user["email"], "role": user["role"]},
+    }
+
+
+@auth_ns.route("/register")
+class Register(Resource):
+    def post(self):
+        """Create a regular user account: {"email": "...", "password": "..."}."""
+        try:
+            email, password = _parse_credentials(request.get_json(silent=True))
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        user = new_user(email, password)
+        try:
+            user["_id"] = get_db().users.insert_one(user).inserted_id
+        except DuplicateKeyError:
+            return {"error": "An account with this email already exists."}, 409
+        return _token_response(user), 201
+
+
+@auth_ns.route("/login")
+class Login(Resource):
+    def post(self):
+        """Exchange email and password for an access token."""
+        try:
+            email, password = _parse_credentials(request.get_json(silent=True))
+        except ValueError:
+            return {"message": "Invalid email or password."}, 401
+
+        user = get_db().users.find_one({"email": email}, {"email": 1, "password_hash": 1, "role": 1, "status": 1})
+        stored = user["password_hash"] if user else _DUMMY_HASH
+        if not check_password(password, stored) or user is None:
+            return {"message": "Invalid email or password."}, 401
+        if user.get("status") != "active":
+            return {"message": "Account is suspended."}, 403
+        return _token_response(user), 200
+
+
+@auth_ns.route("/logout")
+class Logout(Resource):
+    @require_auth
+    def post(self):
+        """Revoke the token this request was made with."""
+        revocations.revoke_token(current_user())
+        return {"message": "Logged out."}, 200
+
+
+@auth_ns.route("/me")
+class Me(Resource):
+    @require_auth
+    def get(self):
+        """Who the token belongs to; answered from the token alone."""
+        claims = current_user()
+        return {
+            "id": claims["sub"],
+            "role": claims["role"],
+            "expires_at": datetime.fromtimestamp(claims["exp"], timezone.utc),
+        }, 200
@@ -0,0 +1,163 @@
+# backend/app/features/carts/routes.py
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from bson import ObjectId
+from flask import request
+from flask_restx import Namespace, Resource
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from backend.app.db import get_db
+from backend.app.security import acts_for, require_auth
+
+carts_ns = Namespace("carts", description="Per-user shopping carts")
+
+MAX_USER_ID_LENGTH = 128
+MAX_QUANTITY = 1000
+
+# Items are stored as {"items": {"<ingredient_id>": {"quantity": n}}} so
+# every mutation is a single $inc/$set/$unset on one path, upserted on
+# user_id: no read-modify-write, no lost updates between concurrent taps.
+# Every route needs a token; users reach only their own cart, admins any.
+
+
+def _serialize_cart(user_id: str, doc: dict | None) -> dict:
+    doc = doc or {}
+    return {
+        "user_id": user_id,
+        "items": [
+            {"ingredient_id": ingredient_id, "quantity": item.get("quantity", 0)}
+            for ingredient_id, item in (doc.get("items") or {}).items()
+        ],
+        "updated_at": doc.get("updated_at"),
+    }
+
+
+def _check_user_id(user_id: str):
+    if not user_id.strip() or len(user_id) > MAX_USER_ID_LENGTH:
+        raise ValueError("Invalid user id.")
+
+
+def _check_ingredient_id(ingredient_id) -> str:
+    # Also guarantees the key is safe as a field name (no '.' or '$').
+    if not isinstance(ingredient_id, str) or not ObjectId.is_valid(ingredient_id):
+        raise ValueError("Field 'ingredient_id' must be a valid ingredient id.")
+    return ingredient_id
+
+
+def _parse_quantity(data: dict, default: int | None, minimum: int) -> int:
+    quantity = data.get("quantity", default)
+    if isinstance(quantity, bool) or not isinstance(quantity, int):
+        raise ValueError("Field 'quantity' must be an integer.")
+    if quantity < minimum or quantity > MAX_QUANTITY:
+        raise ValueError(f"Field 'quantity' must be between {minimum} and {MAX_QUANTITY}.")
+    return quantity
+
+
+def _update_cart(user_id: str, update: dict, upsert: bool) -> dict | None:
+    """
+    Apply one update to the user's cart and return the new document, in
+    a single round trip.
+    """
+    update.setdefault("$set", {})["updated_at"] = datetime.now(timezone.utc)
+    carts = get_db().carts
+    try:
+        return carts.find_one_and_update(
+            {"user_id": user_id}, update, upsert=upsert, return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        # Two first writes for the same user raced on the user_id index;
+        # the cart exists now, so the retry is a plain update.
+        return carts.find_one_and_update(
+            {"user_id": user_id}, update, upsert=upsert, return_document=ReturnDocument.AFTER
+        )
+
+
+@carts_ns.route("/<string:user_id>")
+class Cart(Resource):
+    @require_auth
+    def get(self, user_id: str):
+        try:
+            _check_user_id(user_id)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        if not acts_for(user_id):
+            return {"message": "Forbidden"}, 403
+        doc = get_db().carts.find_one({"user_id": user_id})
+        return _serialize_cart(user_id, doc), 200
+
+    @require_auth
+    def delete(self, user_id: str):
+        """Empty the cart."""
+        try:
+            _check_user_id(user_id)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        if not acts_for(user_id):
+            return {"message": "Forbidden"}, 403
+        doc = _update_cart(user_id, {"$set": {"items": {}}}, upsert=False)
+        return _serialize_cart(user_id, doc), 200
+
+
+@carts_ns.route("/<string:user_id>/items")
+class CartItems(Resource):
+    @require_auth
+    def post(self, user_id: str):
+        """
+        Add an ingredient: {"ingredient_id": "...", "quantity": 2}.
+        Adding one that is already in the cart increases its quantity.
+        """
+        data = request.get_json(silent=True) or {}
+        try:
+            _check_user_id(user_id)
+            if not isinstance(data, dict):
+                raise ValueError("Request body must be a JSON object.")
+            ingredient_id = _check_ingredient_id(data.get("ingredient_id"))
+            quantity = _parse_quantity(data, default=1, minimum=1)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        if not acts_for(user_id):
+            return {"message": "Forbidden"}, 403
+
+        doc = _update_cart(user_id, {"$inc": {f"items.{ingredient_id}.quantity": quantity}}, upsert=True)
+        return _serialize_cart(user_id, doc), 200
+
+
+@carts_ns.route("/<string:user_id>/items/<string:ingredient_id>")
+class CartItem(Resource):
+    @require_auth
+    def put(self, user_id: str, ingredient_id: str):
+        """Set an item's quantity: {"quantity": 3}. 0 removes it."""
+        data = request.get_json(silent=True) or {}
+        try:
+            _check_user_id(user_id)
+            _check_ingredient_id(ingredient_id)
+            if not isinstance(data, dict):
+                raise ValueError("Request body must be a JSON object.")
+            quantity = _parse_quantity(data, default=None, minimum=0)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        if not acts_for(user_id):
+            return {"message": "Forbidden"}, 403
+
+        path = f"items.{ingredient_id}"
+        if quantity == 0:
+            doc = _update_cart(user_id, {"$unset": {path: ""}}, upsert=False)
+        else:
+            doc = _update_cart(user_id, {"$set": {f"{path}.quantity": quantity}}, upsert=True)
+        return _serialize_cart(user_id, doc), 200
+
+    @require_auth
+    def delete(self, user_id: str, ingredient_id: str):
+        try:
+            _check_user_id(user_id)
+            _check_ingredient_id(ingredient_id)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        if not acts_for(user_id):
+            return {"message": "Forbidden"}, 403
+
+        doc = _update_cart(user_id, {"$unset": {f"items.{ingredient_id}": ""}}, upsert=False)
+        return _serialize_cart(user_id, doc), 200
@@ -3,7 +3,13 @@ from flask import request
 from flask_restx import Namespace, Resource
 
 from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from backend.app.cache import doc_cache
 from backend.app.db import get_db
+from backend.app.features.cuisines.snapshot import cuisine_snapshot
+from backend.app.features.search.index import index_cuisine, search_index
+from backend.app.security import CONTENT_ROLES, require_role
 
 cuisines_ns = Namespace("cuisines", description="Cuisine management")
 
@@ -22,53 +28,84 @@ def _slugify(name: str) -> str:
     return s
 
 
-@cuisines_ns.route("")
-class Cuisines(Resource):
-    def get(self):
-        return {
-            "cuisines": [
-                {"id": "1", "name": "Chinese", "slug": "chinese", "region": "East Asia"},
-                {"id": "2", "name": "Japanese", "slug": "japanese", "region": "East Asia"},
-                {"id": "3", "name": "Mexican", "slug": "mexican", "region": "North America"},
-            ]
-        }, 200
+def _build_cuisine(data) -> dict:
+    """Validate a create payload and return the document to insert."""
+    if not isinstance(data, dict):
+        raise ValueError("Request body must be a JSON object.")
 
-    def post(self):
-        data = request.get_json(silent=True) or {}
-        if not isinstance(data, dict):
-            return {"error": "Request body must be a JSON object."}, 400
+    name = data.get("name")
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError("Field 'name' is required and must be a non-empty string.")
+    name = name.strip()
+
+    slug = data.get("slug")
+    if slug is None:
+        slug = _slugify(name)
+    if not isinstance(slug, str) or not slug.strip():
+        raise ValueError("Field 'slug' must be a non-empty string if provided.")
+
+    region = data.get("region", "")
+    if region is not None and not isinstance(region, str):
+        raise ValueError("Field 'region' must be a string.")
+
+    return {"name": name, "slug": slug.strip().lower(), "region": region or ""}
 
-        name = data.get("name")
+
+def _build_cuisine_update(data) -> dict:
+    """Validate a PATCH payload and return the $set document."""
+    if not isinstance(data, dict):
+        raise ValueError("Request body must be a JSON object.")
+
+    for key in data:
+        if key not in ("name", "slug", "region"):
+            raise ValueError(f"Field '{key}' is not updatable.")
+
+    update = {}
+    if "name" in data:
+        name = data["name"]
         if not isinstance(name, str) or not name.strip():
-            return {"error": "Field 'name' is required and must be a non-empty string."}, 400
-        name = name.strip()
+            raise ValueError("Field 'name' must be a non-empty string.")
+        update["name"] = name.strip()
 
-        slug = data.get("slug")
-        if slug is None:
-            slug = _slugify(name)
+    if "slug" in data:
+        slug = data["slug"]
         if not isinstance(slug, str) or not slug.strip():
-            return {"error": "Field 'slug' must be a non-empty string if provided."}, 400
-        slug = slug.strip().lower()
+            raise ValueError("Field 'slug' must be a non-empty string.")
+        update["slug"] = slug.strip().lower()
 
-        region = data.get("region", "")
+    if "region" in data:
+        region = data["region"]
         if region is not None and not isinstance(region, str):
-            return {"error": "Field 'region' must be a string."}, 400
+            raise ValueError("Field 'region' must be a string.")
+        update["region"] = region or ""
 
-        db = get_db()
+    if not update:
+        raise ValueError("No valid fields provided to update.")
+    return update
 
-        # Basic uniqueness check on slug
-        if db.cuisines.find_one({"slug": slug}) is not None:
-            return {"error": f"Cuisine slug '{slug}' already exists."}, 409
 
-        cuisine = {
-            "name": name,
-            "slug": slug,
-            "region": region or "",
-        }
+@cuisines_ns.route("")
+class Cuisines(Resource):
+    def get(self):
+        return cuisine_snapshot.response(get_db())
+
+    @require_role(*CONTENT_ROLES)
+    def post(self):
+        data = request.get_json(silent=True) or {}
+        try:
+            cuisine = _build_cuisine(data)
+        except ValueError as e:
+            return {"error": str(e)}, 400
 
-        result = db.cuisines.insert_one(cuisine)
-        created = db.cuisines.find_one({"_id": result.inserted_id})
-        return _serialize_cuisine(created), 201
+        db = get_db()
+        # Slug uniqueness is enforced by the slug_unique index.
+        try:
+            db.cuisines.insert_one(cuisine)  # sets cuisine["_id"]
+        except DuplicateKeyError:
+            return {"error": f"Cuisine slug '{cuisine['slug']}' already exists."}, 409
+        index_cuisine(cuisine)
+        cuisine_snapshot.invalidate()
+        return _serialize_cuisine(cuisine), 201
 
 
 @cuisines_ns.route("/<string:cuisine_id>")
@@ -80,11 +117,12 @@ class CuisineById(Resource):
             return {"error": "Invalid cuisine id format."}, 400
 
         db = get_db()
-        doc = db.cuisines.find_one({"_id": oid})
+        doc = doc_cache.get_or_load("cuisines", oid, lambda: db.cuisines.find_one({"_id": oid}))
         if doc is None:
             return {"error": "Cuisine not found."}, 404
         return _serialize_cuisine(doc), 200
 
+    @require_role(*CONTENT_ROLES)
     def patch(self, cuisine_id: str):
         try:
             oid = ObjectId(cuisine_id)
@@ -92,52 +130,27 @@ class CuisineById(Resource):
             return {"error": "Invalid cuisine id format."}, 400
 
         data = request.get_json(silent=True) or {}
-        if not isinstance(data, dict):
-            return {"error": "Request body must be a JSON object."}, 400
-
-        allowed_fields = {"name", "slug", "region"}
-        for key in data:
-            if key not in allowed_fields:
-                return {"error": f"Field '{key}' is not updatable."}, 400
-
-        update = {}
-
-        if "name" in data:
-            name = data["name"]
-            if not isinstance(name, str) or not name.strip():
-                return {"error": "Field 'name' must be a non-empty string."}, 400
-            update["name"] = name.strip()
-
-        if "slug" in data:
-            slug = data["slug"]
-            if not isinstance(slug, str) or not slug.strip():
-                return {"error": "Field 'slug' must be a non-empty string."}, 400
-            slug = slug.strip().lower()
-
-            db = get_db()
-            existing = db.cuisines.find_one({"slug": slug, "_id": {"$ne": oid}})
-            if existing is not None:
-                return {"error": f"Cuisine slug '{slug}' already exists."}, 409
-
-            update["slug"] = slug
-
-        if "region" in data:
-            region = data["region"]
-            if region is not None and not isinstance(region, str):
-                return {"error": "Field 'region' must be a string."}, 400
-            update["region"] = region or ""
-
-        if not update:
-            return {"error": "No valid fields provided to update."}, 400
+        try:
+            update = _build_cuisine_update(data)
+        except ValueError as e:
+            return {"error": str(e)}, 400
 
         db = get_db()
-        result = db.cuisines.update_one({"_id": oid}, {"$set": update})
-        if result.matched_count == 0:
+        try:
+            doc = db.cuisines.find_one_and_update(
+                {"_id": oid}, {"$set": update}, return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            return {"error": f"Cuisine slug '{update['slug']}' already exists."}, 409
+        doc_cache.invalidate("cuisines", oid)
+        if doc is None:
             return {"error": "Cuisine not found."}, 404
+        index_cuisine(doc)
+        cuisine_snapshot.invalidate()
 
-        doc = db.cuisines.find_one({"_id": oid})
         return _serialize_cuisine(doc), 200
 
+    @require_role(*CONTENT_ROLES)
     def delete(self, cuisine_id: str):
         try:
             oid = ObjectId(cuisine_id)
@@ -146,7 +159,10 @@ class CuisineById(Resource):
 
         db = get_db()
         result = db.cuisines.delete_one({"_id": oid})
+        doc_cache.invalidate("cuisines", oid)
         if result.deleted_count == 0:
             return {"error": "Cuisine not found."}, 404
+        search_index.remove("cuisine", cuisine_id)
+        cuisine_snapshot.invalidate()
 
         return {"deleted": True, "id": cuisine_id}, 200
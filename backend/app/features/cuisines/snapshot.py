@@ -0,0 +1,23 @@
+# backend/app/features/cuisines/snapshot.py
+from __future__ import annotations
+
+import os
+
+from pymongo.database import Database
+
+from backend.app.snapshot import EncodedSnapshot
+
+# Writes in this process refresh the snapshot immediately; other workers
+# pick changes up when their copy is older than this many seconds.
+CUISINES_SNAPSHOT_TTL = float(os.getenv("CUISINES_SNAPSHOT_TTL", "30"))
+
+
+def load_cuisines(db: Database) -> dict:
+    cuisines = []
+    for doc in db.cuisines.find({}).sort("name", 1):
+        doc["_id"] = str(doc["_id"])
+        cuisines.append(doc)
+    return {"cuisines": cuisines}
+
+
+cuisine_snapshot = EncodedSnapshot(load_cuisines, ttl=CUISINES_SNAPSHOT_TTL)
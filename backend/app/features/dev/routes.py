@@ -1,6 +1,8 @@
 from flask_restx import Namespace, Resource
 import os
 
+from backend.app.security import require_role
+
 dev_ns = Namespace("dev", description="Developer endpoints")
 
 LOG_DIR = "/var/log"  # you can change this if needed
@@ -8,6 +10,7 @@ LOG_DIR = "/var/log"  # you can change this if needed
 
 @dev_ns.route("/logs")
 class Logs(Resource):
+    @require_role("admin", always=True)
     def get(self):
         try:
             files = os.listdir(LOG_DIR)
@@ -1,13 +1,31 @@
 from __future__ import annotations
 
+import os
+
 from bson import ObjectId
 from flask import request
 from flask_restx import Namespace, Resource, fields
+from pymongo import ReturnDocument
 
+from backend.app.cache import doc_cache, ingredient_cache
 from backend.app.db import get_db
+from backend.app.features.search.index import index_ingredient, search_index
+from backend.app.security import CONTENT_ROLES, require_role
+from backend.app.snapshot import EncodedSnapshot
+from backend.app.utils.bulk import (
+    bulk_insert,
+    bulk_upsert,
+    parse_bulk_body,
+    summarize,
+    validate_items,
+)
+from backend.app.utils.export import ndjson_response
 
 ingredients_ns = Namespace("ingredients", description="Ingredients CRUD")
 
+# Local writes refresh the listing at once; other workers within this many seconds.
+INGREDIENTS_SNAPSHOT_TTL = float(os.getenv("INGREDIENTS_SNAPSHOT_TTL", "30"))
+
 ingredient_model = ingredients_ns.model(
     "Ingredient",
     {
@@ -46,6 +64,13 @@ def _to_public(doc: dict) -> dict:
     }
 
 
+def _load_ingredients(db) -> list[dict]:
+    return [_to_public(d) for d in db.ingredients.find({}).sort("name", 1)]
+
+
+ingredient_snapshot = EncodedSnapshot(_load_ingredients, ttl=INGREDIENTS_SNAPSHOT_TTL)
+
+
 def _parse_object_id(id_str: str) -> ObjectId:
     try:
         return ObjectId(id_str)
@@ -53,32 +78,112 @@ def _parse_object_id(id_str: str) -> ObjectId:
         raise ValueError("Invalid id") from e
 
 
+def _build_ingredient(payload: dict) -> dict:
+    """
+    Validate a create payload and return the document to insert.
+    Shared by POST /ingredients and POST /ingredients/bulk.
+    """
+    for key in ("name", "category", "notes"):
+        if payload.get(key) is not None and not isinstance(payload[key], str):
+            raise ValueError(f"{key} must be a string")
+
+    name = (payload.get("name") or "").strip()
+    if not name:
+        raise ValueError("name is required")
+
+    return {
+        "name": name,
+        "category": (payload.get("category") or "").strip() or None,
+        "notes": (payload.get("notes") or "").strip() or None,
+    }
+
+
+def _build_ingredient_update(payload: dict) -> dict:
+    """Validate a PUT payload and return the $set document."""
+    update: dict = {}
+
+    if "name" in payload:
+        name = (payload.get("name") or "").strip()
+        if not name:
+            raise ValueError("name cannot be empty")
+        update["name"] = name
+
+    if "category" in payload:
+        update["category"] = (payload.get("category") or "").strip() or None
+
+    if "notes" in payload:
+        update["notes"] = (payload.get("notes") or "").strip() or None
+
+    if not update:
+        raise ValueError("No fields provided to update")
+    return update
+
+
 @ingredients_ns.route("")
 class IngredientsCollection(Resource):
-    @ingredients_ns.marshal_list_with(ingredient_model)
+    @ingredients_ns.response(200, "Success", [ingredient_model])
     def get(self):
-        db = get_db()
-        docs = list(db.ingredients.find({}).sort("name", 1))
-        return [_to_public(d) for d in docs], 200
+        # _to_public already has the model's shape, so the snapshot stores
+        # encoded bytes instead of marshalling the list on every request.
+        return ingredient_snapshot.response(get_db())
 
+    @require_role(*CONTENT_ROLES)
     @ingredients_ns.expect(ingredient_create_model, validate=True)
     @ingredients_ns.marshal_with(ingredient_model, code=201)
     def post(self):
         payload = request.get_json(force=True) or {}
-        name = (payload.get("name") or "").strip()
-        if not name:
-            ingredients_ns.abort(400, "name is required")
+        try:
+            doc = _build_ingredient(payload)
+        except ValueError as e:
+            ingredients_ns.abort(400, str(e))
+
+        db = get_db()
+        db.ingredients.insert_one(doc)  # sets doc["_id"]
+        index_ingredient(doc)
+        ingredient_snapshot.invalidate()
+        ingredient_cache.clear()
+        return _to_public(doc), 201
 
-        doc = {
-            "name": name,
-            "category": (payload.get("category") or "").strip() or None,
-            "notes": (payload.get("notes") or "").strip() or None,
-        }
 
+@ingredients_ns.route("/bulk")
+class IngredientsBulk(Resource):
+    @require_role(*CONTENT_ROLES)
+    def post(self):
+        """
+        Create many ingredients from a JSON array or NDJSON body.
+        ?upsert=true upserts on 'name' instead of always inserting.
+        """
+        try:
+            items = parse_bulk_body(request.get_data(), request.content_type)
+        except ValueError as e:
+            ingredients_ns.abort(400, str(e))
+
+        valid, results = validate_items(items, _build_ingredient)
         db = get_db()
-        result = db.ingredients.insert_one(doc)
-        saved = db.ingredients.find_one({"_id": result.inserted_id})
-        return _to_public(saved), 201
+        if request.args.get("upsert", "").lower() in ("1", "true", "yes"):
+            results += bulk_upsert(db.ingredients, valid, key="name")
+        else:
+            results += bulk_insert(db.ingredients, valid)
+
+        written = {r["index"] for r in results if r["status"] != "error"}
+        for index, doc in valid:
+            if index in written and doc.get("_id") is not None:
+                doc_cache.invalidate("ingredients", doc["_id"])
+                index_ingredient(doc)
+        if written:
+            ingredient_snapshot.invalidate()
+            ingredient_cache.clear()
+
+        summary = summarize(results)
+        return summary, 200 if summary["failed"] == 0 else 207
+
+
+@ingredients_ns.route("/export")
+class IngredientsExport(Resource):
+    def get(self):
+        """Stream every ingredient as NDJSON in _id order (gzipped if accepted)."""
+        cursor = get_db().ingredients.find({}).sort("_id", 1)
+        return ndjson_response(cursor, _to_public)
 
 
 @ingredients_ns.route("/<string:ingredient_id>")
@@ -91,11 +196,12 @@ class IngredientItem(Resource):
             ingredients_ns.abort(400, "Invalid id")
 
         db = get_db()
-        doc = db.ingredients.find_one({"_id": oid})
+        doc = doc_cache.get_or_load("ingredients", oid, lambda: db.ingredients.find_one({"_id": oid}))
         if not doc:
             ingredients_ns.abort(404, "Ingredient not found")
         return _to_public(doc), 200
 
+    @require_role(*CONTENT_ROLES)
     @ingredients_ns.expect(ingredient_update_model, validate=True)
     @ingredients_ns.marshal_with(ingredient_model)
     def put(self, ingredient_id: str):
@@ -105,31 +211,25 @@ class IngredientItem(Resource):
             ingredients_ns.abort(400, "Invalid id")
 
         payload = request.get_json(force=True) or {}
-        update: dict = {}
-
-        if "name" in payload:
-            name = (payload.get("name") or "").strip()
-            if not name:
-                ingredients_ns.abort(400, "name cannot be empty")
-            update["name"] = name
-
-        if "category" in payload:
-            update["category"] = (payload.get("category") or "").strip() or None
-
-        if "notes" in payload:
-            update["notes"] = (payload.get("notes") or "").strip() or None
-
-        if not update:
-            ingredients_ns.abort(400, "No fields provided to update")
+        try:
+            update = _build_ingredient_update(payload)
+        except ValueError as e:
+            ingredients_ns.abort(400, str(e))
 
         db = get_db()
-        res = db.ingredients.update_one({"_id": oid}, {"$set": update})
-        if res.matched_count == 0:
+        doc = db.ingredients.find_one_and_update(
+            {"_id": oid}, {"$set": update}, return_document=ReturnDocument.AFTER
+        )
+        doc_cache.invalidate("ingredients", oid)
+        if doc is None:
             ingredients_ns.abort(404, "Ingredient not found")
+        index_ingredient(doc)
+        ingredient_snapshot.invalidate()
+        ingredient_cache.clear()
 
-        doc = db.ingredients.find_one({"_id": oid})
         return _to_public(doc), 200
 
+    @require_role(*CONTENT_ROLES)
     def delete(self, ingredient_id: str):
         try:
             oid = _parse_object_id(ingredient_id)
@@ -138,6 +238,10 @@ class IngredientItem(Resource):
 
         db = get_db()
         res = db.ingredients.delete_one({"_id": oid})
+        doc_cache.invalidate("ingredients", oid)
         if res.deleted_count == 0:
             ingredients_ns.abort(404, "Ingredient not found")
+        search_index.remove("ingredient", ingredient_id)
+        ingredient_snapshot.invalidate()
+        ingredient_cache.clear()
         return {"deleted": True, "id": ingredient_id}, 200
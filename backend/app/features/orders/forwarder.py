@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import logging
+import os
+import random
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+from pymongo import ASCENDING, ReturnDocument, UpdateOne
+from pymongo.database import Database
+from pymongo.errors import PyMongoError
+
+from backend.app.utils.http_client import RETRY_STATUSES, HTTPError, PooledHTTPClient
+
+logger = logging.getLogger(__name__)
+
+ORDER_BATCH_SIZE = int(os.getenv("ORDER_BATCH_SIZE", "50"))
+ORDER_LEASE_SECONDS = float(os.getenv("ORDER_LEASE_SECONDS", "60"))
+ORDER_MAX_ATTEMPTS = int(os.getenv("ORDER_MAX_ATTEMPTS", "8"))
+ORDER_RETRY_BASE = float(os.getenv("ORDER_RETRY_BASE", "2"))
+ORDER_RETRY_MAX = float(os.getenv("ORDER_RETRY_MAX", "300"))
+ORDER_VENDOR_TIMEOUT = float(os.getenv("ORDER_VENDOR_TIMEOUT", "30"))
+
+QUEUED, SENDING, FORWARDED, FAILED = "queued", "sending", "forwarded", "failed"
+VENDOR_ORDERS_PATH = "/orders"
+
+# The orders collection is the queue. An order is claimable when it is
+# queued (new, or waiting out a retry) or sending with an expired lease
+# (its worker died), and its available_at has passed. Claiming moves
+# available_at to the lease expiry; a retry moves it to the backoff time.
+CLAIMABLE = [QUEUED, SENDING]
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff for the attempt that just failed, half of it jittered."""
+    delay = min(ORDER_RETRY_MAX, ORDER_RETRY_BASE * 2 ** max(attempts - 1, 0))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def new_order(user_id: str, vendor_id: ObjectId, items: list[dict]) -> dict:
+    now = _now()
+    return {
+        "user_id": user_id,
+        "vendor_id": vendor_id,
+        "items": items,
+        "status": QUEUED,
+        "vendor_order_reference": None,
+        "attempts": 0,
+        "last_error": None,
+        "available_at": now,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def claim_batch(db: Database, batch_size: int = ORDER_BATCH_SIZE,
+                lease: float = ORDER_LEASE_SECONDS) -> list[dict]:
+    """
+    Lease the oldest claimable order plus up to batch_size - 1 more for the
+    same vendor. Every claimed order carries the same lease_token, which
+    later updates filter on, so a worker whose lease expired cannot
+    overwrite the outcome recorded by the worker that took over.
+    """
+    now = _now()
+    token = uuid.uuid4().hex
+    claim = {
+        "$set": {"status": SENDING, "lease_token": token,
+                 "available_at": now + timedelta(seconds=lease), "updated_at": now},
+        "$inc": {"attempts": 1},
+    }
+    orders = db.orders
+    first = orders.find_one_and_update(
+        {"status": {"$in": CLAIMABLE}, "available_at": {"$lte": now}},
+        claim,
+        sort=[("available_at", ASCENDING)],
+        return_document=ReturnDocument.AFTER,
+    )
+    if first is None or batch_size <= 1:
+        return [first] if first is not None else []
+
+    same_vendor = {"vendor_id": first["vendor_id"], "status": {"$in": CLAIMABLE}, "available_at": {"$lte": now}}
+    ids = [
+        doc["_id"]
+        for doc in orders.find({**same_vendor, "_id": {"$ne": first["_id"]}}, {"_id": 1})
+        .sort("available_at", ASCENDING).limit(batch_size - 1)
+    ]
+    if not ids:
+        return [first]
+    # The filter is re-checked, so orders another worker took in between are skipped.
+    orders.update_many({**same_vendor, "_id": {"$in": ids}}, claim)
+    return [first] + list(orders.find({"_id": {"$in": ids}, "lease_token": token}))
+
+
+def _vendor_skus(db: Database, vendor_id, batch: list[dict]) -> dict[str, str]:
+    """ingredient_id -> vendor_sku for every ingredient in the batch, in one query."""
+    oids = {
+        ObjectId(item["ingredient_id"])
+        for order in batch for item in order["items"]
+        if ObjectId.is_valid(item["ingredient_id"])
+    }
+    cursor = db.vendor_products.find(
+        {"vendor_id": vendor_id, "ingredient_id": {"$in": list(oids)}, "available": {"$ne": False}},
+        {"_id": 0, "ingredient_id": 1, "vendor_sku": 1},
+    )
+    return {str(doc["ingredient_id"]): doc["vendor_sku"] for doc in cursor}
+
+
+class OrderForwarder:
+    """
+    Worker pool draining the orders queue.
+
+    Each worker leases a batch of orders for one vendor, maps their
+    ingredients to vendor SKUs and sends the whole batch in one POST.
+    Accepted orders become forwarded with their vendor_order_reference;
+    throttling, 5xx and connection errors put the batch back with
+    exponential backoff until ORDER_MAX_ATTEMPTS, anything else fails it.
+    Vendors are sent order_id with every order so a batch re-sent after a
+    lost response can be deduplicated on their side.
+    """
+
+    def __init__(self, db: Database, workers: int = 4, batch_size: int = ORDER_BATCH_SIZE,
+                 lease: float = ORDER_LEASE_SECONDS, max_attempts: int = ORDER_MAX_ATTEMPTS,
+                 poll_interval: float = 1.0):
+        self.db = db
+        self.workers = workers
+        self.batch_size = batch_size
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self._clients: dict[str, PooledHTTPClient] = {}
+        self._lock = threading.Lock()
+        self.stats = {"batches": 0, "forwarded": 0, "retried": 0, "failed": 0, "errors": 0}
+
+    def _client(self, base_url: str) -> PooledHTTPClient:
+        with self._lock:
+            client = self._clients.get(base_url)
+            if client is None:
+                # No in-request retries: the queue's backoff is the retry
+                # policy, so a worker never sleeps on a struggling vendor.
+                client = PooledHTTPClient(base_url, pool_size=self.workers,
+                                          timeout=ORDER_VENDOR_TIMEOUT, max_retries=0)
+                self._clients[base_url] = client
+            return client
+
+    def _count(self, key: str, n: int = 1):
+        with self._lock:
+            self.stats[key] += n
+
+    def run_once(self) -> int:
+        """Claim and forward one batch. Returns how many orders it handled."""
+        batch = claim_batch(self.db, self.batch_size, self.lease)
+        if not batch:
+            return 0
+        self._count("batches")
+        self.db.orders.bulk_write(self._forward(batch), ordered=False)
+        return len(batch)
+
+    def _forward(self, batch: list[dict]) -> list[UpdateOne]:
+        vendor_id = batch[0]["vendor_id"]
+        token = batch[0]["lease_token"]
+        # attempts is counted at claim time, so an order whose earlier leases
+        # all expired without an outcome (a worker crashing on it) stops here.
+        ops = [
+            self._fail(order, token, f"No outcome after {self.max_attempts} attempts.")
+            for order in batch if order["attempts"] > self.max_attempts
+        ]
+        batch = [order for order in batch if order["attempts"] <= self.max_attempts]
+        if not batch:
+            return ops
+
+        vendor = self.db.vendors.find_one({"_id": vendor_id}, {"catalog_url": 1, "api_enabled": 1})
+        if not vendor or not vendor.get("api_enabled") or not vendor.get("catalog_url"):
+            return ops + [self._fail(order, token, "Vendor does not accept API orders.") for order in batch]
+
+        skus = _vendor_skus(self.db, vendor_id, batch)
+        payload, sendable = [], []
+        for order in batch:
+            missing = [item["ingredient_id"] for item in order["items"] if item["ingredient_id"] not in skus]
+            if missing:
+                ops.append(self._fail(order, token, f"No vendor product for ingredients: {', '.join(missing)}"))
+                continue
+            sendable.append(order)
+            payload.append({
+                "order_id": str(order["_id"]),
+                "items": [{"sku": skus[item["ingredient_id"]], "quantity": item["quantity"]}
+                          for item in order["items"]],
+            })
+        if not sendable:
+            return ops
+
+        try:
+            result = self._client(vendor["catalog_url"]).post(VENDOR_ORDERS_PATH, {"orders": payload}) or {}
+        except HTTPError as e:
+            if e.status in RETRY_STATUSES:
+                return ops + [self._retry(order, token, f"Vendor answered HTTP {e.status}.") for order in sendable]
+            return ops + [self._fail(order, token, f"Vendor answered HTTP {e.status}.") for order in sendable]
+        except (OSError, ValueError) as e:
+            return ops + [self._retry(order, token, f"Vendor unreachable: {e}") for order in sendable]
+
+        if isinstance(result, dict):
+            references, rejected = result.get("references") or {}, result.get("rejected") or {}
+        else:
+            references = rejected = None
+        if not isinstance(references, dict) or not isinstance(rejected, dict):
+            return ops + [self._retry(order, token, "Vendor sent an unexpected response.") for order in sendable]
+        for order in sendable:
+            key = str(order["_id"])
+            if key in references:
+                ops.append(self._forwarded(order, token, references[key]))
+            elif key in rejected:
+                ops.append(self._fail(order, token, f"Rejected by vendor: {rejected[key]}"))
+            else:
+                ops.append(self._retry(order, token, "Vendor did not acknowledge the order."))
+        return ops
+
+    def _update(self, order: dict, token: str, fields: dict) -> UpdateOne:
+        fields["updated_at"] = _now()
+        return UpdateOne({"_id": order["_id"], "lease_token": token},
+                         {"$set": fields, "$unset": {"lease_token": ""}})
+
+    def _forwarded(self, order: dict, token: str, reference) -> UpdateOne:
+        self._count("forwarded")
+        return self._update(order, token, {"status": FORWARDED, "vendor_order_reference": reference,
+                                           "last_error": None})
+
+    def _fail(self, order: dict, token: str, error: str) -> UpdateOne:
+        self._count("failed")
+        return self._update(order, token, {"status": FAILED, "last_error": error})
+
+    def _retry(self, order: dict, token: str, error: str) -> UpdateOne:
+        if order["attempts"] >= self.max_attempts:
+            return self._fail(order, token, f"{error} Gave up after {order['attempts']} attempts.")
+        self._count("retried")
+        available_at = _now() + timedelta(seconds=retry_delay(order["attempts"]))
+        return self._update(order, token, {"status": QUEUED, "last_error": error, "available_at": available_at})
+
+    def drain(self) -> int:
+        """Forward everything claimable now with all workers; returns orders handled."""
+        def work():
+            handled = 0
+            while True:
+                n = self.run_once()
+                if n == 0:
+                    return handled
+                handled += n
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return sum(pool.map(lambda _: work(), range(self.workers)))
+
+    def run(self, stop: threading.Event):
+        """Run the workers until stop is set, polling when the queue is empty."""
+        def work():
+            while not stop.is_set():
+                try:
+                    idle = self.run_once() == 0
+                except PyMongoError as e:
+                    # Mongo hiccup: leased orders come back when the lease expires.
+                    self._count("errors")
+                    logger.warning("Order forwarding paused, Mongo error: %s", e)
+                    idle = True
+                except Exception:
+                    # A bug must not silently stop this worker for good.
+                    self._count("errors")
+                    logger.exception("Order forwarding batch failed")
+                    idle = True
+                if idle:
+                    stop.wait(self.poll_interval)
+
+        threads = [threading.Thread(target=work, daemon=True) for _ in range(self.workers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    def close(self):
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
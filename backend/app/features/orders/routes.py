@@ -0,0 +1,118 @@
+# backend/app/features/orders/routes.py
+from __future__ import annotations
+
+from bson import ObjectId
+from flask import request
+from flask_restx import Namespace, Resource
+from pymongo import DESCENDING
+
+from backend.app.db import get_db
+from backend.app.features.carts.routes import _check_ingredient_id, _check_user_id, _parse_quantity
+from backend.app.features.orders.forwarder import new_order
+from backend.app.security import acts_for, current_user, require_auth
+
+orders_ns = Namespace("orders", description="Orders forwarded to vendors")
+
+MAX_ORDER_ITEMS = 200
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+# Creating an order is one insert into the orders collection, which is
+# also the forwarding queue: vendors are called by OrderForwarder workers
+# (python -m backend.scripts.forward_orders), never on the request thread.
+# Every route needs a token; user_id defaults to the token's user, and
+# only admins may name another one.
+
+
+def _serialize_order(doc: dict) -> dict:
+    return {
+        "id": str(doc["_id"]),
+        "user_id": doc.get("user_id"),
+        "vendor_id": str(doc.get("vendor_id")),
+        "items": doc.get("items") or [],
+        "status": doc.get("status"),
+        "vendor_order_reference": doc.get("vendor_order_reference"),
+        "attempts": doc.get("attempts", 0),
+        "last_error": doc.get("last_error"),
+        "created_at": doc.get("created_at"),
+        "updated_at": doc.get("updated_at"),
+    }
+
+
+def _parse_order(data, user_id: str) -> tuple[str, ObjectId, list[dict]]:
+    if not isinstance(data, dict):
+        raise ValueError("Request body must be a JSON object.")
+    user_id = data.get("user_id", user_id)
+    if not isinstance(user_id, str):
+        raise ValueError("Field 'user_id' is required.")
+    _check_user_id(user_id)
+    vendor_id = data.get("vendor_id")
+    if not isinstance(vendor_id, str) or not ObjectId.is_valid(vendor_id):
+        raise ValueError("Field 'vendor_id' must be a valid vendor id.")
+
+    items = data.get("items")
+    if not isinstance(items, list) or not items:
+        raise ValueError("Field 'items' must be a non-empty list.")
+    if len(items) > MAX_ORDER_ITEMS:
+        raise ValueError(f"An order can have at most {MAX_ORDER_ITEMS} items.")
+    parsed = []
+    for item in items:
+        if not isinstance(item, dict):
+            raise ValueError("Each item must be an object with 'ingredient_id' and 'quantity'.")
+        parsed.append({
+            "ingredient_id": _check_ingredient_id(item.get("ingredient_id")),
+            "quantity": _parse_quantity(item, default=1, minimum=1),
+        })
+    return user_id, ObjectId(vendor_id), parsed
+
+
+@orders_ns.route("")
+class Orders(Resource):
+    @require_auth
+    def get(self):
+        """A user's orders, newest first: ?user_id=...&limit=20"""
+        user_id = request.args.get("user_id", current_user()["sub"])
+        try:
+            _check_user_id(user_id)
+            limit = int(request.args.get("limit", DEFAULT_LIMIT))
+            if limit < 1 or limit > MAX_LIMIT:
+                raise ValueError(f"Query parameter 'limit' must be between 1 and {MAX_LIMIT}.")
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        if not acts_for(user_id):
+            return {"message": "Forbidden"}, 403
+        cursor = get_db().orders.find({"user_id": user_id}).sort("_id", DESCENDING).limit(limit)
+        return [_serialize_order(doc) for doc in cursor], 200
+
+    @require_auth
+    def post(self):
+        """
+        Place an order: {"user_id": "...", "vendor_id": "...",
+        "items": [{"ingredient_id": "...", "quantity": 2}]}.
+        Answers 202 once the order is queued; poll GET /orders/<id> for
+        status (queued, sending, forwarded or failed).
+        """
+        try:
+            user_id, vendor_id, items = _parse_order(request.get_json(silent=True), current_user()["sub"])
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        if not acts_for(user_id):
+            return {"message": "Forbidden"}, 403
+
+        doc = new_order(user_id, vendor_id, items)
+        doc["_id"] = get_db().orders.insert_one(doc).inserted_id
+        return _serialize_order(doc), 202, {"Location": f"/orders/{doc['_id']}"}
+
+
+@orders_ns.route("/<string:order_id>")
+class Order(Resource):
+    @require_auth
+    def get(self, order_id: str):
+        if not ObjectId.is_valid(order_id):
+            return {"error": "Invalid order id."}, 400
+        doc = get_db().orders.find_one({"_id": ObjectId(order_id)})
+        if doc is None:
+            return {"error": "Order not found."}, 404
+        if not acts_for(doc.get("user_id")):
+            return {"message": "Forbidden"}, 403
+        return _serialize_order(doc), 200
@@ -0,0 +1,143 @@
+# backend/app/features/recipes/bitset_scorer.py
+from __future__ import annotations
+
+import numpy as np
+from pymongo.database import Database
+
+from backend.app.features.recipes.ingredient_index import ingredient_term
+
+# Bytes of the (pantries x recipes) uint64 AND buffer per chunk.
+CHUNK_BYTES = 16 * 1024 * 1024
+
+if hasattr(np, "bitwise_count"):
+    def _popcount(words: np.ndarray) -> np.ndarray:
+        return np.bitwise_count(words)
+else:  # numpy < 2.0
+    _POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def _popcount(words: np.ndarray) -> np.ndarray:
+        as_bytes = words.view(np.uint8).reshape(words.shape + (8,))
+        return _POPCOUNT_TABLE[as_bytes].sum(axis=-1, dtype=np.uint8)
+
+
+def _popcount_rows(packed: np.ndarray) -> np.ndarray:
+    return _popcount(packed).sum(axis=-1, dtype=np.int32)
+
+
+class BitsetScorer:
+    """
+    Bulk "what can this pantry cook" scoring.
+
+    Every recipe's ingredient set is one bit-packed uint64 row over a shared
+    ingredient vocabulary. Scoring a pantry is AND + popcount per row, done
+    for many pantries at once with numpy broadcasting.
+    """
+
+    def __init__(self, recipe_ids: list[str], ingredient_lists: list):
+        self.recipe_ids = list(recipe_ids)
+        self.vocabulary: dict[str, int] = {}
+
+        rows = []
+        for ingredients in ingredient_lists:
+            row = set()
+            for item in ingredients if isinstance(ingredients, list) else []:
+                name = ingredient_term(item)
+                if name:
+                    row.add(self.vocabulary.setdefault(name, len(self.vocabulary)))
+            rows.append(row)
+
+        self.matrix = self._pack(rows)
+        self.sizes = _popcount_rows(self.matrix)
+        # Word-major copy: one contiguous uint64 column per 64 ingredients.
+        self._words = np.ascontiguousarray(self.matrix.T)
+
+    @classmethod
+    def from_db(cls, db: Database) -> "BitsetScorer":
+        ids, ingredient_lists = [], []
+        for doc in db.recipes.find({}, {"ingredients": 1}):
+            ids.append(str(doc["_id"]))
+            ingredient_lists.append(doc.get("ingredients"))
+        return cls(ids, ingredient_lists)
+
+    def __len__(self) -> int:
+        return len(self.recipe_ids)
+
+    def _pack(self, rows: list[set[int]]) -> np.ndarray:
+        # Round the row up to whole 64-bit words so AND/popcount run on
+        # uint64 lanes instead of single bytes.
+        width = max(-(-len(self.vocabulary) // 64) * 64, 64)
+        dense = np.zeros((len(rows), width), dtype=bool)
+        for r, cols in enumerate(rows):
+            if cols:
+                dense[r, list(cols)] = True
+        return np.packbits(dense, axis=1).view(np.uint64)
+
+    def encode_pantries(self, pantries: list) -> np.ndarray:
+        """
+        Pack pantries over the recipe vocabulary. Ingredients no recipe uses
+        can't change any score, so they are dropped.
+        """
+        rows = []
+        for pantry in pantries:
+            row = set()
+            for item in pantry:
+                col = self.vocabulary.get(ingredient_term(item))
+                if col is not None:
+                    row.add(col)
+            rows.append(row)
+        return self._pack(rows)
+
+    def _chunks(self, n_pantries: int):
+        row_bytes = max(len(self) * self.matrix.itemsize, 1)
+        step = max(1, CHUNK_BYTES // row_bytes)
+        for start in range(0, n_pantries, step):
+            yield start, min(start + step, n_pantries)
+
+    def matched_counts(self, packed_pantries: np.ndarray) -> np.ndarray:
+        """Return a (pantries x recipes) int32 matrix of covered ingredients."""
+        out = np.zeros((packed_pantries.shape[0], len(self)), dtype=np.int32)
+        for start, stop in self._chunks(packed_pantries.shape[0]):
+            chunk = packed_pantries[start:stop]
+            acc = out[start:stop]
+            # Accumulate one 64-ingredient word at a time; every step is a
+            # flat (chunk x recipes) AND + popcount with no short-axis reduce.
+            for w in range(self._words.shape[0]):
+                lane = chunk[:, w, None] & self._words[w][None, :]
+                acc += _popcount(lane)
+        return out
+
+    def score(self, pantries: list) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Score every pantry against every recipe.
+
+        Returns (match_ratio, missing), both shaped (pantries x recipes):
+        the share of a recipe's ingredients the pantry covers, and how many
+        ingredients it would still need to buy.
+        """
+        matched = self.matched_counts(self.encode_pantries(pantries))
+        sizes = self.sizes[None, :]
+        missing = sizes - matched
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(sizes > 0, matched / sizes, 0.0).astype(np.float32)
+        return ratio, missing
+
+    def top_k(self, pantries: list, k: int = 10) -> list[list[dict]]:
+        """Best k recipes per pantry, ordered by match ratio then fewest missing."""
+        ratio, missing = self.score(pantries)
+        k = min(k, len(self))
+        results = []
+        for p in range(ratio.shape[0]):
+            if k == 0:
+                results.append([])
+                continue
+            candidates = np.argpartition(-ratio[p], k - 1)[:k]
+            order = np.lexsort((missing[p, candidates], -ratio[p, candidates]))
+            results.append([
+                {
+                    "recipe_id": self.recipe_ids[i],
+                    "match_ratio": float(ratio[p, i]),
+                    "missing": int(missing[p, i]),
+                }
+                for i in candidates[order]
+            ])
+        return results
@@ -0,0 +1,93 @@
+# backend/app/features/recipes/expand.py
+from __future__ import annotations
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo.database import Database
+
+from backend.app.cache import ingredient_cache
+from backend.app.features.ingredients.routes import _to_public
+
+EXPANDABLE = ("ingredients",)
+
+# Cached for references with no ingredient document, so they are not
+# looked up again on every page.
+_MISSING: dict = {}
+
+
+def _ref(entry) -> tuple[str, object] | None:
+    """
+    Cache key for one recipes.ingredients entry: ("id", ObjectId) for
+    {"ingredient_id": ...} objects, ("name", str) for bare names.
+    """
+    if isinstance(entry, str):
+        return ("name", entry)
+    if isinstance(entry, dict) and entry.get("ingredient_id") is not None:
+        try:
+            return ("id", ObjectId(entry["ingredient_id"]))
+        except (InvalidId, TypeError):
+            return None
+    return None
+
+
+def _load(db: Database, refs: set) -> dict:
+    """Resolve uncached refs with a single $in query and cache the results."""
+    ids = [value for kind, value in refs if kind == "id"]
+    names = [value for kind, value in refs if kind == "name"]
+    clauses = []
+    if ids:
+        clauses.append({"_id": {"$in": ids}})
+    if names:
+        clauses.append({"name": {"$in": names}})
+    query = clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+    found = {}
+    for doc in db.ingredients.find(query, {"name": 1, "category": 1, "notes": 1}):
+        for ref in (("id", doc["_id"]), ("name", doc.get("name"))):
+            if ref in refs:
+                found[ref] = doc
+                ingredient_cache.put(*ref, doc)
+    for ref in refs - found.keys():
+        ingredient_cache.put(*ref, _MISSING)
+    return found
+
+
+def expand_ingredients(db: Database, recipes: list[dict]):
+    """
+    Replace each recipe's ingredients with resolved entries, in place:
+    "salt" -> {"name": "salt", "ingredient": {...} | None} and
+    {"ingredient_id": ..., ...} -> the same object plus "ingredient".
+    References for the whole page are resolved together, so this costs at
+    most one query however many recipes and ingredients there are.
+    """
+    refs = {
+        ref
+        for recipe in recipes
+        for ref in map(_ref, recipe.get("ingredients") or [])
+        if ref is not None
+    }
+
+    resolved = {}
+    uncached = set()
+    for ref in refs:
+        doc = ingredient_cache.get(*ref)
+        if doc is None:
+            uncached.add(ref)
+        elif doc:
+            resolved[ref] = doc
+    if uncached:
+        resolved.update(_load(db, uncached))
+
+    for recipe in recipes:
+        if "ingredients" not in recipe or not isinstance(recipe["ingredients"], list):
+            continue
+        expanded = []
+        for entry in recipe["ingredients"]:
+            ref = _ref(entry)
+            doc = resolved.get(ref) if ref is not None else None
+            item = dict(entry) if isinstance(entry, dict) else {"name": entry}
+            if ref is not None and ref[0] == "id":
+                item["ingredient_id"] = str(ref[1])
+            item["ingredient"] = _to_public(doc) if doc else None
+            expanded.append(item)
+        recipe["ingredients"] = expanded
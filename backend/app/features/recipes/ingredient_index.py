@@ -0,0 +1,251 @@
+# backend/app/features/recipes/ingredient_index.py
+from __future__ import annotations
+
+import heapq
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left, insort
+from typing import Callable
+
+from pymongo.database import Database
+
+# The index sees this process's own recipe writes at once; writes from
+# other workers or scripts/load_recipes.py show up after the next rebuild.
+RECIPE_INDEX_MAX_AGE = float(os.getenv("RECIPE_INDEX_MAX_AGE", "60"))
+
+
+def normalize_ingredient(value) -> str | None:
+    """
+    "  Tomato " -> "tomato". Anything that is not a usable string is skipped.
+    """
+    if not isinstance(value, str):
+        return None
+    value = " ".join(value.strip().lower().split())
+    return value or None
+
+
+def ingredient_term(entry) -> str | None:
+    """
+    Index term for one recipes.ingredients entry: the normalized name for
+    "tomato" or {"name": "Tomato", ...}, and the id for reference-only
+    {"ingredient_id": ...} objects, so those can be matched by id.
+    """
+    if isinstance(entry, dict):
+        name = normalize_ingredient(entry.get("name"))
+        if name or entry.get("ingredient_id") is None:
+            return name
+        return normalize_ingredient(str(entry["ingredient_id"]))
+    return normalize_ingredient(entry)
+
+
+def _normalized_set(ingredients) -> set[str]:
+    if not isinstance(ingredients, list):
+        return set()
+    names = (ingredient_term(x) for x in ingredients)
+    return {n for n in names if n}
+
+
+def intersect_postings(postings: list[array]) -> array:
+    """
+    Intersect sorted posting lists, smallest first, so the work is bounded
+    by the shortest list instead of the catalog size.
+    """
+    if not postings:
+        return array("I")
+    postings = sorted(postings, key=len)
+    result = postings[0]
+    for other in postings[1:]:
+        if not result:
+            break
+        kept = array("I")
+        lo = 0
+        for doc in result:
+            lo = bisect_left(other, doc, lo)
+            if lo == len(other):
+                break
+            if other[lo] == doc:
+                kept.append(doc)
+        result = kept
+    return array("I", result)
+
+
+class IngredientIndex:
+    """
+    In-process inverted index: ingredient name -> sorted array of compact
+    integer doc ids. Recipe ObjectIds are mapped to those ints on insert;
+    an update keeps its recipe's int and a removed recipe's int is reused,
+    so the index does not grow with churn.
+
+    refresh() rebuilds it from Mongo once it is max_age old. The new index
+    is built aside and swapped in, so matches keep being served meanwhile;
+    writes made during the build are replayed onto it before the swap.
+    """
+
+    def __init__(self, max_age: float = RECIPE_INDEX_MAX_AGE, clock: Callable[[], float] = time.monotonic):
+        self.max_age = max_age
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._built_at: float | None = None
+        # (recipe_id, ingredients or None for a removal) while a rebuild runs.
+        self._pending: list[tuple] | None = None
+        self.rebuilds = 0
+        self._clear()
+
+    def _clear(self):
+        self._postings: dict[str, array] = {}
+        self._recipe_ids: list[str | None] = []
+        self._doc_of: dict[str, int] = {}
+        self._terms: list[set[str]] = []
+        self._free: list[int] = []
+
+    @property
+    def built(self) -> bool:
+        return self._built_at is not None
+
+    def __len__(self) -> int:
+        return len(self._doc_of)
+
+    def rebuild(self, db: Database):
+        with self._build_lock:
+            self._rebuild(db)
+
+    def _rebuild(self, db: Database):
+        with self._lock:
+            self._pending = []
+        try:
+            fresh = IngredientIndex()
+            for doc in db.recipes.find({}, {"ingredients": 1}).sort("_id", 1):
+                fresh._add(str(doc["_id"]), doc.get("ingredients"))
+            with self._lock:
+                for recipe_id, ingredients in self._pending:
+                    if ingredients is None:
+                        fresh._remove(recipe_id)
+                    else:
+                        fresh._add(recipe_id, ingredients)
+                self._postings, self._recipe_ids = fresh._postings, fresh._recipe_ids
+                self._doc_of, self._terms, self._free = fresh._doc_of, fresh._terms, fresh._free
+                self._built_at = self._clock()
+                self.rebuilds += 1
+        finally:
+            self._pending = None
+
+    def refresh(self, db: Database):
+        """
+        Build the index if it never was (callers wait), or rebuild it once
+        it is max_age old (one caller rebuilds, the rest use the current copy).
+        """
+        if self._built_at is None:
+            with self._build_lock:
+                if self._built_at is None:
+                    self._rebuild(db)
+        elif self._clock() - self._built_at >= self.max_age and self._build_lock.acquire(blocking=False):
+            try:
+                self._rebuild(db)
+            except Exception:
+                # Mongo unreachable: keep matching against the current copy.
+                self._built_at = self._clock()
+            finally:
+                self._build_lock.release()
+
+    def add(self, recipe_id: str, ingredients):
+        self.update(recipe_id, ingredients)
+
+    def update(self, recipe_id: str, ingredients):
+        with self._lock:
+            self._add(recipe_id, ingredients)
+            if self._pending is not None:
+                self._pending.append((recipe_id, ingredients))
+
+    def remove(self, recipe_id: str):
+        with self._lock:
+            self._remove(recipe_id)
+            if self._pending is not None:
+                self._pending.append((recipe_id, None))
+
+    def _add(self, recipe_id: str, ingredients):
+        terms = _normalized_set(ingredients)
+        doc = self._doc_of.get(recipe_id)
+        if doc is not None:
+            old = self._terms[doc]
+            self._unpost(doc, old - terms)
+            self._terms[doc] = terms
+            self._post(doc, terms - old)
+            return
+        if self._free:
+            doc = self._free.pop()
+            self._recipe_ids[doc] = recipe_id
+            self._terms[doc] = terms
+        else:
+            doc = len(self._recipe_ids)
+            self._recipe_ids.append(recipe_id)
+            self._terms.append(terms)
+        self._doc_of[recipe_id] = doc
+        self._post(doc, terms)
+
+    def _post(self, doc: int, terms):
+        for term in terms:
+            posting = self._postings.setdefault(term, array("I"))
+            # Fresh ids are the largest yet; reused ones are inserted in place.
+            if not posting or posting[-1] < doc:
+                posting.append(doc)
+            else:
+                insort(posting, doc)
+
+    def _unpost(self, doc: int, terms):
+        for term in terms:
+            posting = self._postings[term]
+            i = bisect_left(posting, doc)
+            if i < len(posting) and posting[i] == doc:
+                del posting[i]
+            if not posting:
+                del self._postings[term]
+
+    def _remove(self, recipe_id: str):
+        doc = self._doc_of.pop(recipe_id, None)
+        if doc is None:
+            return
+        self._unpost(doc, self._terms[doc])
+        self._recipe_ids[doc] = None
+        self._terms[doc] = set()
+        self._free.append(doc)
+
+    def match(self, ingredients, k: int = 10, require_all: bool = False) -> list[dict]:
+        """
+        Rank recipes by coverage = matched / total recipe ingredients.
+        Only posting lists of the queried ingredients are touched.
+        """
+        wanted = _normalized_set(ingredients)
+        counts: dict[int, int] = {}
+        with self._lock:
+            postings = [self._postings[t] for t in wanted if t in self._postings]
+            if require_all:
+                if len(postings) < len(wanted):
+                    return []
+                for doc in intersect_postings(postings):
+                    counts[doc] = len(wanted)
+            else:
+                for posting in postings:
+                    for doc in posting:
+                        counts[doc] = counts.get(doc, 0) + 1
+
+            scored = (
+                (matched / len(self._terms[doc]), matched, doc)
+                for doc, matched in counts.items()
+            )
+            top = heapq.nlargest(k, scored)
+            return [
+                {
+                    "recipe_id": self._recipe_ids[doc],
+                    "coverage": coverage,
+                    "matched": sorted(self._terms[doc] & wanted),
+                    "missing": sorted(self._terms[doc] - wanted),
+                }
+                for coverage, _, doc in top
+            ]
+
+
+# One index per process, like the shared MongoClient in backend.app.db.
+recipe_index = IngredientIndex()
@@ -1,50 +1,387 @@
 # backend/app/features/recipes/routes.py
+from __future__ import annotations
+
+from urllib.parse import urlencode
+
 from flask import request
 from flask_restx import Namespace, Resource
 
 from bson import ObjectId
+from pymongo import ReturnDocument
+from backend.app.cache import doc_cache
 from backend.app.db import get_db
+from backend.app.features.recipes.expand import EXPANDABLE, expand_ingredients
+from backend.app.features.recipes.ingredient_index import recipe_index
+from backend.app.features.search.index import index_recipe, search_index
 
-from backend.app.security import require_api_key
+from backend.app.security import CONTENT_ROLES, require_role
+from backend.app.utils.bulk import (
+    bulk_insert,
+    bulk_upsert,
+    parse_bulk_body,
+    summarize,
+    validate_items,
+)
+from backend.app.utils.export import ndjson_response
 
 recipes_ns = Namespace("recipes", description="Recipe management")
 
+RECIPE_FIELDS = ("name", "cuisine", "ingredients", "steps", "tags")
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+DEFAULT_MATCH_LIMIT = 10
+
+# Every sort ends on _id so keyset pagination has a unique tiebreaker.
+SORTS = {
+    "newest": [("_id", -1)],
+    "oldest": [("_id", 1)],
+    "name": [("name", 1), ("_id", 1)],
+    "-name": [("name", -1), ("_id", -1)],
+}
+
 
 def _serialize_recipe(doc: dict) -> dict:
     doc["_id"] = str(doc["_id"])
     return doc
 
 
+def _parse_limit(raw: str | None) -> int:
+    if raw is None or raw == "":
+        return DEFAULT_PAGE_SIZE
+    try:
+        limit = int(raw)
+    except ValueError:
+        raise ValueError("Query parameter 'limit' must be an integer.")
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise ValueError(f"Query parameter 'limit' must be between 1 and {MAX_PAGE_SIZE}.")
+    return limit
+
+
+def _parse_fields(raw: str | None) -> dict | None:
+    """
+    Turn "?fields=name,tags" into a Mongo projection.
+    None means "return whole documents".
+    """
+    if raw is None or not raw.strip():
+        return None
+    projection = {}
+    for field in raw.split(","):
+        field = field.strip()
+        if not field or field == "_id":
+            continue
+        if field not in RECIPE_FIELDS:
+            raise ValueError(f"Unknown field '{field}' in 'fields'.")
+        projection[field] = 1
+    return projection or {"_id": 1}
+
+
+def _parse_expand(raw: str | None) -> bool:
+    """True for ?expand=ingredients, the only expansion there is."""
+    if raw is None or not raw.strip():
+        return False
+    if raw.strip() not in EXPANDABLE:
+        raise ValueError(f"Query parameter 'expand' must be one of {', '.join(EXPANDABLE)}.")
+    return True
+
+
+def _multi_arg(args, name: str) -> list[str]:
+    """?tag=a&tag=b and ?tag=a,b both give ["a", "b"]."""
+    values = []
+    for raw in args.getlist(name):
+        values += [v.strip() for v in raw.split(",") if v.strip()]
+    return values
+
+
+def _filter_query(args) -> dict:
+    """
+    Build the Mongo filter for GET /recipes. Every condition is an equality
+    or $all/$nin on an indexed field so the filtering happens in Mongo.
+    """
+    query = {}
+    cuisine = args.get("cuisine")
+    if cuisine is not None and cuisine.strip():
+        query["cuisine"] = cuisine.strip()
+
+    tags = _multi_arg(args, "tag")
+    if tags:
+        query["tags"] = {"$all": tags}
+
+    has = _multi_arg(args, "has")
+    without = _multi_arg(args, "without")
+    if set(has) & set(without):
+        raise ValueError("An ingredient cannot be in both 'has' and 'without'.")
+    if has or without:
+        query["ingredients"] = {}
+        if has:
+            query["ingredients"]["$all"] = has
+        if without:
+            query["ingredients"]["$nin"] = without
+    return query
+
+
+def _keyset_condition(db, sort: list, after_oid: ObjectId) -> dict | None:
+    """
+    Condition selecting documents that come after 'after_oid' in 'sort'.
+    For name sorts the anchor's name is read once (an _id point lookup).
+    """
+    field = sort[0][0]
+    if field == "_id":
+        return _after_condition(sort, after_oid, None)
+    anchor = db.recipes.find_one({"_id": after_oid}, {field: 1})
+    if anchor is None:
+        return None
+    return _after_condition(sort, after_oid, anchor)
+
+
+def _after_condition(sort: list, after_oid: ObjectId, anchor: dict | None) -> dict:
+    """The keyset condition given the anchor document (unused for _id sorts)."""
+    field, direction = sort[0]
+    op = "$gt" if direction == 1 else "$lt"
+    if field == "_id":
+        return {"_id": {op: after_oid}}
+    value = anchor.get(field)
+    return {"$or": [
+        {field: {op: value}},
+        {field: value, "_id": {op: after_oid}},
+    ]}
+
+
+def _parse_listing(args) -> tuple[int, dict | None, dict, list]:
+    """(limit, projection, filter, sort) for a listing; raises ValueError."""
+    limit = _parse_limit(args.get("limit"))
+    projection = _parse_fields(args.get("fields"))
+    query = _filter_query(args)
+    sort_key = args.get("sort") or "newest"
+    if sort_key not in SORTS:
+        raise ValueError(f"Query parameter 'sort' must be one of {', '.join(SORTS)}.")
+    return limit, projection, query, SORTS[sort_key]
+
+
+def _page_links(self_url: str, base_url: str, params: dict, limit: int, next_after: str | None) -> dict:
+    """HATEOAS links for a listing page; params is the query as {name: [values]}."""
+    links = {"self": {"href": self_url}}
+    if next_after is not None:
+        params = dict(params, limit=[str(limit)], after=[next_after])
+        links["next"] = {"href": f"{base_url}/recipes?{urlencode(params, doseq=True)}"}
+    return links
+
+
+def _build_recipe(data: dict) -> dict:
+    """
+    Validate a create payload and return the document to insert.
+    Shared by POST /recipes and POST /recipes/bulk.
+    """
+    name = data.get("name")
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError("Field 'name' is required and must be a non-empty string.")
+
+    cuisine = data.get("cuisine", "")
+    if cuisine is not None and not isinstance(cuisine, str):
+        raise ValueError("Field 'cuisine' must be a string.")
+
+    return {
+        "name": name.strip(),
+        "cuisine": cuisine.strip() if isinstance(cuisine, str) else "",
+        "ingredients": data.get("ingredients", []),
+        "steps": data.get("steps", []),
+        "tags": data.get("tags", []),
+    }
+
+
+def _build_recipe_update(data) -> dict:
+    """Validate a PATCH payload and return the $set document."""
+    if not isinstance(data, dict):
+        raise ValueError("Request body must be a JSON object.")
+
+    for key in data:
+        if key not in RECIPE_FIELDS:
+            raise ValueError(f"Field '{key}' is not updatable.")
+
+    update = {}
+    if "name" in data:
+        name = data["name"]
+        if not isinstance(name, str) or not name.strip():
+            raise ValueError("Field 'name' must be a non-empty string.")
+        update["name"] = name.strip()
+
+    if "cuisine" in data:
+        cuisine = data["cuisine"]
+        if not isinstance(cuisine, str):
+            raise ValueError("Field 'cuisine' must be a string.")
+        update["cuisine"] = cuisine.strip()
+
+    for field in ("ingredients", "steps", "tags"):
+        if field in data:
+            val = data[field]
+            if not isinstance(val, list) or not all(isinstance(x, str) for x in val):
+                raise ValueError(f"Field '{field}' must be a list of strings.")
+            update[field] = val
+
+    if not update:
+        raise ValueError("No valid fields provided to update.")
+    return update
+
+
 @recipes_ns.route("")
 class Recipes(Resource):
     def get(self):
+        """
+        Keyset-paginated listing, newest first by default.
+        ?after=<id> continues from the last id of the previous page.
+        Filters: ?cuisine=, ?tag= (repeatable, all must match),
+        ?has= / ?without= ingredients, ?sort=newest|oldest|name|-name.
+        ?expand=ingredients resolves ingredient references (one query per page).
+        """
+        try:
+            limit, projection, query, sort = _parse_listing(request.args)
+            expand = _parse_expand(request.args.get("expand"))
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
         db = get_db()
-        docs = list(db.recipes.find().sort("_id", -1))
-        return {"recipes": [_serialize_recipe(d) for d in docs]}, 200
+        after = request.args.get("after")
+        if after:
+            try:
+                after_oid = ObjectId(after)
+            except Exception:
+                return {"error": "Invalid 'after' id format."}, 400
+            keyset = _keyset_condition(db, sort, after_oid)
+            if keyset is None:
+                return {"error": "Recipe in 'after' not found."}, 400
+            query = {"$and": [query, keyset]} if query else keyset
+
+        # Ask for one extra document to find out whether a next page exists.
+        cursor = (
+            db.recipes.find(query, projection)
+            .sort(sort)
+            .limit(limit + 1)
+            .batch_size(limit + 1)
+        )
+
+        recipes = []
+        has_more = False
+        for doc in cursor:
+            if len(recipes) == limit:
+                has_more = True
+                break
+            recipes.append(_serialize_recipe(doc))
+        if expand:
+            expand_ingredients(db, recipes)
+
+        links = _page_links(
+            request.url, request.host_url.rstrip("/"), request.args.to_dict(flat=False),
+            limit, recipes[-1]["_id"] if has_more else None,
+        )
+        return {"recipes": recipes, "_links": links}, 200
 
+    @require_role(*CONTENT_ROLES)
     def post(self):
         data = request.get_json(silent=True) or {}
 
-        name = data.get("name")
-        if not isinstance(name, str) or not name.strip():
-            return {"error": "Field 'name' is required and must be a non-empty string."}, 400
-
-        cuisine = data.get("cuisine", "")
-        if cuisine is not None and not isinstance(cuisine, str):
-            return {"error": "Field 'cuisine' must be a string."}, 400
-
-        recipe = {
-            "name": name.strip(),
-            "cuisine": cuisine.strip() if isinstance(cuisine, str) else "",
-            "ingredients": data.get("ingredients", []),
-            "steps": data.get("steps", []),
-            "tags": data.get("tags", []),
-        }
+        try:
+            recipe = _build_recipe(data)
+        except ValueError as e:
+            return {"error": str(e)}, 400
 
         db = get_db()
+        # insert_one sets recipe["_id"], so the response needs no second read.
         result = db.recipes.insert_one(recipe)
-        created = db.recipes.find_one({"_id": result.inserted_id})
-        return _serialize_recipe(created), 201
+        recipe_index.add(str(result.inserted_id), recipe["ingredients"])
+        index_recipe(recipe)
+        return _serialize_recipe(recipe), 201
+
+
+@recipes_ns.route("/bulk")
+class RecipesBulk(Resource):
+    @require_role(*CONTENT_ROLES)
+    def post(self):
+        """
+        Create many recipes from a JSON array or NDJSON body.
+        ?upsert=true upserts on 'name' instead of always inserting.
+        """
+        try:
+            items = parse_bulk_body(request.get_data(), request.content_type)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        valid, results = validate_items(items, _build_recipe)
+        db = get_db()
+        if request.args.get("upsert", "").lower() in ("1", "true", "yes"):
+            results += bulk_upsert(db.recipes, valid, key="name")
+        else:
+            results += bulk_insert(db.recipes, valid)
+
+        written = {r["index"] for r in results if r["status"] != "error"}
+        for index, doc in valid:
+            if index in written and doc.get("_id") is not None:
+                doc_cache.invalidate("recipes", doc["_id"])
+                recipe_index.update(str(doc["_id"]), doc["ingredients"])
+                index_recipe(doc)
+
+        summary = summarize(results)
+        return summary, 200 if summary["failed"] == 0 else 207
+
+
+@recipes_ns.route("/export")
+class RecipesExport(Resource):
+    def get(self):
+        """
+        Stream every recipe as NDJSON in _id order, gzipped when the client
+        accepts it. Takes the same ?fields= and filters as GET /recipes.
+        """
+        try:
+            projection = _parse_fields(request.args.get("fields"))
+            query = _filter_query(request.args)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        cursor = get_db().recipes.find(query, projection).sort("_id", 1)
+        return ndjson_response(cursor, _serialize_recipe)
+
+
+@recipes_ns.route("/match")
+class RecipeMatch(Resource):
+    def get(self):
+        """
+        "What can I cook?": ?ingredients=tomato,egg&limit=10[&all=true]
+        Recipes are ranked by the share of their ingredients that are covered.
+        """
+        raw = request.args.get("ingredients", "")
+        wanted = [x for x in raw.split(",") if x.strip()]
+        if not wanted:
+            return {"error": "Query parameter 'ingredients' is required."}, 400
+
+        try:
+            limit = _parse_limit(request.args.get("limit") or str(DEFAULT_MATCH_LIMIT))
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        require_all = request.args.get("all", "").lower() in ("1", "true", "yes")
+
+        db = get_db()
+        recipe_index.refresh(db)
+        ranked = recipe_index.match(wanted, k=limit, require_all=require_all)
+
+        # One round trip for the display fields of the (bounded) top-k.
+        oids = [ObjectId(m["recipe_id"]) for m in ranked]
+        docs = {
+            str(d["_id"]): d
+            for d in db.recipes.find({"_id": {"$in": oids}}, {"name": 1, "cuisine": 1})
+        }
+
+        matches = []
+        for m in ranked:
+            doc = docs.get(m["recipe_id"])
+            if doc is None:
+                continue
+            matches.append({
+                "_id": m["recipe_id"],
+                "name": doc.get("name", ""),
+                "cuisine": doc.get("cuisine", ""),
+                "coverage": round(m["coverage"], 4),
+                "matched": m["matched"],
+                "missing": m["missing"],
+            })
+        return {"matches": matches}, 200
 
 
 @recipes_ns.route("/<string:recipe_id>")
@@ -54,14 +391,22 @@ class RecipeById(Resource):
             oid = ObjectId(recipe_id)
         except Exception:
             return {"error": "Invalid recipe id format."}, 400
+        try:
+            expand = _parse_expand(request.args.get("expand"))
+        except ValueError as e:
+            return {"error": str(e)}, 400
 
         db = get_db()
-        doc = db.recipes.find_one({"_id": oid})
+        doc = doc_cache.get_or_load("recipes", oid, lambda: db.recipes.find_one({"_id": oid}))
         if doc is None:
             return {"error": "Recipe not found."}, 404
 
-        return _serialize_recipe(doc), 200
+        recipe = _serialize_recipe(doc)
+        if expand:
+            expand_ingredients(db, [recipe])
+        return recipe, 200
 
+    @require_role(*CONTENT_ROLES)
     def patch(self, recipe_id: str):
         try:
             oid = ObjectId(recipe_id)
@@ -69,46 +414,26 @@ class RecipeById(Resource):
             return {"error": "Invalid recipe id format."}, 400
 
         data = request.get_json(silent=True) or {}
-        if not isinstance(data, dict):
-            return {"error": "Request body must be a JSON object."}, 400
-
-        allowed_fields = {"name", "cuisine", "ingredients", "steps", "tags"}
-        update = {}
-
-        for key in data:
-            if key not in allowed_fields:
-                return {"error": f"Field '{key}' is not updatable."}, 400
-
-        if "name" in data:
-            name = data["name"]
-            if not isinstance(name, str) or not name.strip():
-                return {"error": "Field 'name' must be a non-empty string."}, 400
-            update["name"] = name.strip()
-        
-        if "cuisine" in data:
-            cuisine = data["cuisine"]
-            if not isinstance(cuisine, str):
-                return {"error": "Field 'cuisine' must be a string."}, 400
-            update["cuisine"] = cuisine.strip()
-        
-        for field in ("ingredients", "steps", "tags"):
-            if field in data:
-                val = data[field]
-                if not isinstance(val, list) or not all(isinstance(x, str) for x in val):
-                    return {"error": f"Field '{field}' must be a list of strings."}, 400
-                update[field] = val
-
-        if not update:
-            return {"error": "No valid fields provided to update."}, 400
+        try:
+            update = _build_recipe_update(data)
+        except ValueError as e:
+            return {"error": str(e)}, 400
 
         db = get_db()
-        result = db.recipes.update_one({"_id": oid}, {"$set": update})
-        if result.matched_count == 0:
+        doc = db.recipes.find_one_and_update(
+            {"_id": oid}, {"$set": update}, return_document=ReturnDocument.AFTER
+        )
+        doc_cache.invalidate("recipes", oid)
+        if doc is None:
             return {"error": "Recipe not found."}, 404
+        if "ingredients" in update:
+            recipe_index.update(recipe_id, update["ingredients"])
+        if "name" in update:
+            index_recipe(doc)
 
-        doc = db.recipes.find_one({"_id": oid})
         return _serialize_recipe(doc), 200
 
+    @require_role(*CONTENT_ROLES)
     def delete(self, recipe_id: str):
         try:
             oid = ObjectId(recipe_id)
@@ -117,7 +442,10 @@ class RecipeById(Resource):
 
         db = get_db()
         result = db.recipes.delete_one({"_id": oid})
+        doc_cache.invalidate("recipes", oid)
         if result.deleted_count == 0:
             return {"error": "Recipe not found."}, 404
+        recipe_index.remove(recipe_id)
+        search_index.remove("recipe", recipe_id)
 
         return {"deleted": True, "id": recipe_id}, 200
@@ -0,0 +1,322 @@
+# backend/app/features/search/index.py
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from itertools import islice
+from typing import Callable
+
+from pymongo.database import Database
+
+# Writes made through this process are indexed at once; writes from other
+# workers or scripts show up after the next rebuild.
+SEARCH_INDEX_MAX_AGE = float(os.getenv("SEARCH_INDEX_MAX_AGE", "60"))
+
+# Bounds that keep a query's work independent of catalog size.
+PREFIX_TERMS_CAP = 64
+FUZZY_TERMS_CAP = 32
+FUZZY_CHECK_CAP = 128
+GRAM_PREFIX_LEN = 8
+# Entries looked at per matched word, however common the word is.
+ENTRY_SCAN_CAP = 1000
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text) -> list[str]:
+    """
+    Words of text, casefolded and without accents, for labels and queries
+    alike: "Crème Brûlée" -> ["creme", "brulee"]. Any script counts, so
+    "麻婆豆腐" is one word.
+    """
+    if not isinstance(text, str):
+        return []
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _TOKEN_RE.findall(unicodedata.normalize("NFC", stripped))
+
+
+def _grams(term: str) -> set[str]:
+    # Trigrams of the marked head of a word; enough for prefix typos.
+    padded = "$" + term[:GRAM_PREFIX_LEN]
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def prefix_distance(query: str, term: str, limit: int) -> int:
+    """
+    Smallest Levenshtein distance between query and any prefix of term.
+    Returns limit + 1 as soon as that bound can no longer be met.
+    """
+    cols = term[:len(query) + limit]
+    prev = list(range(len(cols) + 1))
+    for i, qc in enumerate(query, start=1):
+        cur = [i] + [0] * len(cols)
+        for j, tc in enumerate(cols, start=1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (qc != tc))
+        if min(cur) > limit:
+            return limit + 1
+        prev = cur
+    return min(prev)
+
+
+class SearchIndex:
+    """
+    In-process autocomplete over recipes, ingredients and cuisines.
+
+    Words live in a sorted list, so a prefix is one bisect plus a slice;
+    a trigram index over word heads supplies candidates for typos. Each
+    word's entries are kept in result order (shortest label first), so a
+    query reads only the head of a common word's postings.
+
+    refresh() rebuilds it from Mongo once it is max_age old, aside and
+    swapped in like IngredientIndex, replaying writes made meanwhile.
+    """
+
+    def __init__(self, max_age: float = SEARCH_INDEX_MAX_AGE, clock: Callable[[], float] = time.monotonic):
+        self.max_age = max_age
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._built_at: float | None = None
+        # (kind, entry_id, label, extra), label None for a removal, while a rebuild runs.
+        self._pending: list[tuple] | None = None
+        self.rebuilds = 0
+        self._clear()
+
+    def _clear(self):
+        self._entries: dict[tuple, dict] = {}
+        self._sorted_terms: list[str] = []
+        # word -> sorted [(len(label), label, key)]
+        self._term_entries: dict[str, list] = {}
+        self._gram_terms: dict[str, set] = {}
+
+    @property
+    def built(self) -> bool:
+        return self._built_at is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # -- maintenance -----------------------------------------------------
+
+    def rebuild(self, db: Database):
+        with self._build_lock:
+            self._rebuild(db)
+
+    def _rebuild(self, db: Database):
+        with self._lock:
+            self._pending = []
+        try:
+            fresh = SearchIndex()
+            for doc in db.recipes.find({}, {"name": 1}):
+                fresh._put("recipe", str(doc["_id"]), doc.get("name"), [], bulk=True)
+            for doc in db.ingredients.find({}, {"name": 1, "aliases": 1}):
+                fresh._put("ingredient", str(doc["_id"]), doc.get("name"), doc.get("aliases") or [], bulk=True)
+            for doc in db.cuisines.find({}, {"name": 1, "slug": 1}):
+                fresh._put("cuisine", str(doc["_id"]), doc.get("name"), [doc.get("slug") or ""], bulk=True)
+            for postings in fresh._term_entries.values():
+                postings.sort()
+            with self._lock:
+                for kind, entry_id, label, extra in self._pending:
+                    if label is None:
+                        fresh._remove((kind, entry_id))
+                    else:
+                        fresh._put(kind, entry_id, label, extra)
+                self._entries, self._sorted_terms = fresh._entries, fresh._sorted_terms
+                self._term_entries, self._gram_terms = fresh._term_entries, fresh._gram_terms
+                self._built_at = self._clock()
+                self.rebuilds += 1
+        finally:
+            self._pending = None
+
+    def refresh(self, db: Database):
+        """
+        Build the index if it never was (callers wait), or rebuild it once
+        it is max_age old (one caller rebuilds, the rest use the current copy).
+        """
+        if self._built_at is None:
+            with self._build_lock:
+                if self._built_at is None:
+                    self._rebuild(db)
+        elif self._clock() - self._built_at >= self.max_age and self._build_lock.acquire(blocking=False):
+            try:
+                self._rebuild(db)
+            except Exception:
+                # Mongo unreachable: keep searching the current copy.
+                self._built_at = self._clock()
+            finally:
+                self._build_lock.release()
+
+    def put(self, kind: str, entry_id: str, label, extra: list | None = None):
+        with self._lock:
+            self._put(kind, entry_id, label, extra or [])
+            if self._pending is not None:
+                self._pending.append((kind, entry_id, label if isinstance(label, str) else "", extra or []))
+
+    def remove(self, kind: str, entry_id: str):
+        with self._lock:
+            self._remove((kind, entry_id))
+            if self._pending is not None:
+                self._pending.append((kind, entry_id, None, None))
+
+    def _put(self, kind: str, entry_id: str, label, extra: list, bulk: bool = False):
+        # bulk: append unsorted; rebuild() sorts every posting list once at the end.
+        key = (kind, entry_id)
+        self._remove(key)
+        label = label if isinstance(label, str) else ""
+        terms = set(tokenize(label))
+        for text in extra:
+            terms.update(tokenize(text))
+        if not terms:
+            return
+        self._entries[key] = {"type": kind, "id": entry_id, "label": label, "terms": terms}
+        posting = (len(label), label, key)
+        for term in terms:
+            entries = self._term_entries.get(term)
+            if entries is None:
+                entries = self._term_entries[term] = []
+                insort(self._sorted_terms, term)
+                for gram in _grams(term):
+                    self._gram_terms.setdefault(gram, set()).add(term)
+            if bulk:
+                entries.append(posting)
+            else:
+                insort(entries, posting)
+
+    def _remove(self, key: tuple):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        posting = (len(entry["label"]), entry["label"], key)
+        for term in entry["terms"]:
+            entries = self._term_entries[term]
+            del entries[bisect_left(entries, posting)]
+            if entries:
+                continue
+            del self._term_entries[term]
+            del self._sorted_terms[bisect_left(self._sorted_terms, term)]
+            for gram in _grams(term):
+                grams = self._gram_terms[gram]
+                grams.discard(term)
+                if not grams:
+                    del self._gram_terms[gram]
+
+    # -- querying --------------------------------------------------------
+
+    def _expand(self, token: str, fuzzy: bool) -> list[tuple[int, str]]:
+        """
+        (rank, term) pairs for one query token, best first:
+        0 = exact word, 1 = prefix, 2 + distance = typo-tolerant prefix.
+        Typo candidates are only looked up when nothing matches as typed.
+        """
+        ranked = []
+        if token in self._term_entries:
+            ranked.append((0, token))
+
+        lo = bisect_left(self._sorted_terms, token)
+        prefixed = []
+        for term in self._sorted_terms[lo:lo + PREFIX_TERMS_CAP]:
+            if not term.startswith(token):
+                break
+            if term != token:
+                prefixed.append(term)
+        ranked += [(1, t) for t in sorted(prefixed, key=len)]
+
+        if fuzzy and len(token) >= 3 and not ranked:
+            limit = 1 if len(token) <= 7 else 2
+            query_grams = _grams(token)
+            needed = max(1, len(query_grams) - 3 * limit)
+            shared: dict[str, int] = {}
+            for gram in query_grams:
+                for term in self._gram_terms.get(gram, ()):
+                    shared[term] = shared.get(term, 0) + 1
+            candidates = sorted(
+                (t for t, n in shared.items() if n >= needed),
+                key=shared.__getitem__, reverse=True,
+            )[:FUZZY_CHECK_CAP]
+            fuzzy_hits = []
+            for term in candidates:
+                dist = prefix_distance(token, term, limit)
+                if dist <= limit:
+                    fuzzy_hits.append((2 + dist, term))
+            fuzzy_hits.sort(key=lambda x: (x[0], len(x[1])))
+            ranked += fuzzy_hits[:FUZZY_TERMS_CAP]
+        return ranked
+
+    def search(self, query: str, limit: int = 10, kinds: set | None = None,
+               fuzzy: bool = True) -> list[dict]:
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        with self._lock:
+            expanded = [self._expand(tok, fuzzy) for tok in tokens]
+            if not all(expanded):
+                return []
+
+            # Drive from the most selective token; check the others per entry.
+            sizes = [sum(len(self._term_entries[t]) for _, t in terms) for terms in expanded]
+            driver = sizes.index(min(sizes))
+            others = [
+                {t: rank for rank, t in terms}
+                for i, terms in enumerate(expanded) if i != driver
+            ]
+
+            # Postings are in (label length, label) order, so for a
+            # one-word query the first `limit` hits of a word are its best
+            # and the rest is never read. ENTRY_SCAN_CAP bounds the entries
+            # skipped by type or by the other words.
+            scored = []
+            seen = set()
+            for rank, term in expanded[driver]:
+                if len(scored) >= limit:
+                    break
+                hits = 0
+                for _, _, key in islice(self._term_entries[term], ENTRY_SCAN_CAP):
+                    if hits >= limit:
+                        break
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    entry = self._entries[key]
+                    if kinds and entry["type"] not in kinds:
+                        continue
+                    total = rank
+                    for other in others:
+                        best = min((other[t] for t in entry["terms"] if t in other), default=None)
+                        if best is None:
+                            break
+                        total += best
+                    else:
+                        scored.append((total, len(entry["label"]), entry["label"], key))
+                        hits += 1
+
+            scored.sort()
+            return [
+                {
+                    "type": self._entries[key]["type"],
+                    "id": self._entries[key]["id"],
+                    "label": label,
+                    "score": total,
+                }
+                for total, _, label, key in scored[:limit]
+            ]
+
+
+search_index = SearchIndex()
+
+
+def index_recipe(doc: dict):
+    search_index.put("recipe", str(doc["_id"]), doc.get("name"))
+
+
+def index_ingredient(doc: dict):
+    search_index.put("ingredient", str(doc["_id"]), doc.get("name"), doc.get("aliases") or [])
+
+
+def index_cuisine(doc: dict):
+    search_index.put("cuisine", str(doc["_id"]), doc.get("name"), [doc.get("slug") or ""])
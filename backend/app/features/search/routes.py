@@ -0,0 +1,46 @@
+# backend/app/features/search/routes.py
+from flask import request
+from flask_restx import Namespace, Resource
+
+from backend.app.db import get_db
+from backend.app.features.search.index import search_index
+
+search_ns = Namespace("search", description="Autocomplete across recipes, ingredients and cuisines")
+
+SEARCH_TYPES = {"recipe", "ingredient", "cuisine"}
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+
+@search_ns.route("")
+class Search(Resource):
+    def get(self):
+        """
+        ?q=tom eg&limit=10&type=recipe,ingredient&fuzzy=false
+        Every word must match the start of a word in the entry (with a
+        small edit distance allowed unless fuzzy=false).
+        """
+        q = request.args.get("q", "")
+        if not q.strip():
+            return {"error": "Query parameter 'q' is required."}, 400
+
+        try:
+            limit = int(request.args.get("limit", DEFAULT_LIMIT))
+        except ValueError:
+            return {"error": "Query parameter 'limit' must be an integer."}, 400
+        if limit < 1 or limit > MAX_LIMIT:
+            return {"error": f"Query parameter 'limit' must be between 1 and {MAX_LIMIT}."}, 400
+
+        kinds = None
+        raw_types = request.args.get("type")
+        if raw_types:
+            kinds = {t.strip() for t in raw_types.split(",") if t.strip()}
+            unknown = kinds - SEARCH_TYPES
+            if unknown:
+                return {"error": f"Unknown type '{sorted(unknown)[0]}'."}, 400
+
+        fuzzy = request.args.get("fuzzy", "true").lower() not in ("0", "false", "no")
+
+        search_index.refresh(get_db())
+        results = search_index.search(q, limit=limit, kinds=kinds, fuzzy=fuzzy)
+        return {"q": q, "results": results}, 200
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import hashlib
+import importlib
+from functools import lru_cache
+from typing import Protocol
+
+# Kept free of Flask/Mongo imports: this module is what the detection
+# worker processes import.
+
+STUB_LABELS = ["tomato", "egg", "garlic", "onion", "rice", "basil", "butter", "milk", "potato", "carrot"]
+
+
+class Detector(Protocol):
+    """
+    An ingredient detector. VISION_DETECTOR names the class to use as
+    "module:Class"; it is instantiated once per worker process.
+    """
+
+    model_version: str
+
+    def detect(self, data: bytes) -> list[dict]:
+        """Return [{"name": "tomato", "confidence": 0.93}, ...] for one image."""
+        ...
+
+
+class StubDetector:
+    """Deterministic stand-in: labels and confidences are derived from the image hash."""
+
+    model_version = "stub-1"
+
+    def detect(self, data: bytes) -> list[dict]:
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        labels: dict[str, float] = {}
+        for i in range(1 + digest[0] % 3):
+            name = STUB_LABELS[digest[1 + i] % len(STUB_LABELS)]
+            labels.setdefault(name, round(0.5 + digest[8 + i] / 510, 3))
+        return [{"name": name, "confidence": confidence} for name, confidence in labels.items()]
+
+
+@lru_cache(maxsize=None)
+def load_detector(spec: str) -> Detector:
+    module, _, name = spec.partition(":")
+    return getattr(importlib.import_module(module), name)()
+
+
+def run_detection(spec: str, source) -> tuple[str, list[dict]]:
+    """Worker-process entry point. source is a file path or has a read() for the bytes."""
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            data = f.read()
+    else:
+        data = source.read()
+    detector = load_detector(spec)
+    return detector.model_version, detector.detect(data)
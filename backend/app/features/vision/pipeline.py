@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+
+from pymongo import UpdateOne
+from pymongo.database import Database
+
+from backend.app.features.vision.detector import run_detection
+from backend.app.features.vision.sources import GridFSSource
+
+VISION_WORKERS = int(os.getenv("VISION_WORKERS", "2"))
+VISION_DETECTOR = os.getenv("VISION_DETECTOR", "backend.app.features.vision.detector:StubDetector")
+# A queued upload whose run was submitted longer ago than this is assumed
+# lost (the process died, or storing the result failed) and is resubmitted.
+VISION_QUEUE_TIMEOUT = float(os.getenv("VISION_QUEUE_TIMEOUT", "300"))
+
+QUEUED, DONE, FAILED = "queued", "done", "failed"
+
+
+def store_detections(db: Database, content_hash: str, image_id, model_version: str, labels: list[dict]):
+    """Save one detection run and mark every pending upload of these bytes done."""
+    now = datetime.now(timezone.utc)
+    names = [label["name"] for label in labels]
+    ingredient_ids = {
+        doc["name"]: doc["_id"] for doc in db.ingredients.find({"name": {"$in": names}}, {"name": 1})
+    }
+    # Upserts keyed on (content_hash, model_version, name), so a run that
+    # raced with an identical one leaves a single set of rows.
+    ops = [
+        UpdateOne(
+            {"content_hash": content_hash, "model_version": model_version, "name": label["name"]},
+            {"$set": {"ingredient_id": ingredient_ids.get(label["name"]), "confidence": label["confidence"]},
+             "$setOnInsert": {"image_id": image_id, "created_at": now}},
+            upsert=True,
+        )
+        for label in labels
+    ]
+    if ops:
+        db.detections.bulk_write(ops, ordered=False)
+    db.image_uploads.update_many(
+        {"content_hash": content_hash, "status": QUEUED},
+        {"$set": {"status": DONE, "model_version": model_version, "detected_at": now}},
+    )
+
+
+class DetectionPipeline:
+    """
+    Runs the detector in a process pool, so request threads only stream
+    the upload and enqueue. Results are written from the pool's callback
+    thread, once per content hash, and every upload of those bytes that is
+    still queued is marked done with them.
+    """
+
+    def __init__(self, workers: int = VISION_WORKERS, detector: str = VISION_DETECTOR):
+        self.workers = workers
+        self.detector = detector
+        self._pool: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self.submitted = 0
+
+    def _executor(self, replace: bool = False) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None or replace:
+                # spawn: forking a process that holds Mongo sockets and
+                # threads is unsafe, and the workers need neither.
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def submit(self, db: Database, image_id, content_hash: str, source: str | GridFSSource) -> Future:
+        try:
+            future = self._executor().submit(run_detection, self.detector, source)
+        except BrokenProcessPool:
+            # A worker died (e.g. the detector crashed the interpreter); start over.
+            future = self._executor(replace=True).submit(run_detection, self.detector, source)
+        self.submitted += 1
+        future.add_done_callback(lambda f: self._store(db, image_id, content_hash, f))
+        return future
+
+    def _store(self, db: Database, image_id, content_hash: str, future: Future):
+        try:
+            model_version, labels = future.result()
+        except Exception as e:
+            db.image_uploads.update_many(
+                {"content_hash": content_hash, "status": QUEUED},
+                {"$set": {"status": FAILED, "error": f"Detection failed: {e!r}"}},
+            )
+            return
+        store_detections(db, content_hash, image_id, model_version, labels)
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait)
+                self._pool = None
+
+
+pipeline = DetectionPipeline()
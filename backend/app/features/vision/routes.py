@@ -0,0 +1,178 @@
+# backend/app/features/vision/routes.py
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+from flask import request
+from flask_restx import Namespace, Resource
+from pymongo import ASCENDING, DESCENDING
+
+from backend.app.db import get_db
+from backend.app.features.carts.routes import _check_user_id
+from backend.app.features.vision import pipeline as pipeline_module
+from backend.app.features.vision.pipeline import DONE, FAILED, QUEUED, pipeline
+from backend.app.features.vision.storage import VISION_MAX_UPLOAD_BYTES, UploadTooLarge, make_storage, read_chunks
+from backend.app.security import acts_for, current_user, require_auth
+
+vision_ns = Namespace("vision", description="Image uploads and ingredient detection")
+
+storage = make_storage()
+
+
+def _serialize_upload(doc: dict) -> dict:
+    return {
+        "id": str(doc["_id"]),
+        "user_id": doc.get("user_id"),
+        "status": doc.get("status"),
+        "content_hash": doc.get("content_hash"),
+        "content_type": doc.get("content_type"),
+        "size": doc.get("size"),
+        "model_version": doc.get("model_version"),
+        "error": doc.get("error"),
+        "created_at": doc.get("created_at"),
+    }
+
+
+def _claim_stale(db, doc: dict, now: datetime) -> bool:
+    """
+    True if doc is queued on a run submitted over VISION_QUEUE_TIMEOUT ago,
+    in which case its queued_at is moved to now so that only one request
+    resubmits it. Rows from before queued_at existed count as stale.
+    """
+    queued_at = doc.get("queued_at")
+    cutoff = now - timedelta(seconds=pipeline_module.VISION_QUEUE_TIMEOUT)
+    if doc.get("status") != QUEUED or (queued_at is not None and queued_at.replace(tzinfo=timezone.utc) > cutoff):
+        return False
+    return db.image_uploads.find_one_and_update(
+        {"_id": doc["_id"], "status": QUEUED, "queued_at": queued_at},
+        {"$set": {"queued_at": now}},
+    ) is not None
+
+
+def _submit(db, image_id, content_hash: str):
+    pipeline.submit(db, image_id, content_hash, storage.source(content_hash))
+
+
+def _find_upload(image_id: str):
+    if not ObjectId.is_valid(image_id):
+        return None, ({"error": "Invalid image id."}, 400)
+    doc = get_db().image_uploads.find_one({"_id": ObjectId(image_id)})
+    if doc is None:
+        return None, ({"error": "Image not found."}, 404)
+    if not acts_for(doc.get("user_id")):
+        return None, ({"message": "Forbidden"}, 403)
+    return doc, None
+
+
+@vision_ns.route("/upload")
+class Upload(Resource):
+    @require_auth
+    def post(self):
+        """
+        Upload one image for ingredient detection, for the token's user
+        (admins may pass ?user_id=...).
+        Send the image as the raw body (Content-Type: image/*) or as the
+        "image" field of a multipart form. The body is streamed to storage
+        and hashed on the way; detection runs in the background, so poll
+        GET /vision/<id>/status or /results. Bytes seen before reuse the
+        earlier detections and answer 200 with status done.
+        """
+        user_id = request.args.get("user_id", current_user()["sub"])
+        try:
+            _check_user_id(user_id)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        if not acts_for(user_id):
+            return {"message": "Forbidden"}, 403
+        if request.content_length is not None and request.content_length > VISION_MAX_UPLOAD_BYTES:
+            return {"error": f"Image is larger than {VISION_MAX_UPLOAD_BYTES} bytes."}, 413
+
+        if request.mimetype == "multipart/form-data":
+            # Werkzeug spools form files to disk past a small size, so this
+            # is still not held in memory.
+            upload = request.files.get("image")
+            if upload is None:
+                return {"error": "Multipart uploads need an 'image' file field."}, 400
+            stream, content_type = upload.stream, upload.mimetype
+        else:
+            stream, content_type = request.stream, request.mimetype
+        if not content_type.startswith("image/"):
+            return {"error": "Upload must be an image (Content-Type: image/*)."}, 415
+
+        try:
+            content_hash, size = storage.save(read_chunks(stream), VISION_MAX_UPLOAD_BYTES)
+        except UploadTooLarge as e:
+            return {"error": str(e)}, 413
+        if size == 0:
+            return {"error": "Upload is empty."}, 400
+
+        db = get_db()
+        now = datetime.now(timezone.utc)
+        # "done" sorts before "queued": prefer an upload whose results exist,
+        # then the most recently submitted run.
+        prior = db.image_uploads.find_one(
+            {"content_hash": content_hash, "status": {"$in": [DONE, QUEUED]}},
+            {"status": 1, "model_version": 1, "queued_at": 1},
+            sort=[("status", ASCENDING), ("queued_at", DESCENDING)],
+        )
+        # A queued prior whose run was lost is submitted again for this upload.
+        submit = prior is None or _claim_stale(db, prior, now)
+        doc = {
+            "user_id": user_id,
+            "storage_key": content_hash,
+            "content_hash": content_hash,
+            "content_type": content_type,
+            "size": size,
+            "status": prior["status"] if prior else QUEUED,
+            "model_version": prior.get("model_version") if prior else None,
+            "queued_at": now if submit else prior.get("queued_at"),
+            "created_at": now,
+        }
+        doc["_id"] = db.image_uploads.insert_one(doc).inserted_id
+        if submit:
+            _submit(db, doc["_id"], content_hash)
+        status = 200 if doc["status"] == DONE else 202
+        return _serialize_upload(doc), status, {"Location": f"/vision/{doc['_id']}/results"}
+
+
+@vision_ns.route("/<string:image_id>/status")
+class UploadStatus(Resource):
+    @require_auth
+    def get(self, image_id: str):
+        doc, error = _find_upload(image_id)
+        if error:
+            return error
+        return _serialize_upload(doc), 200
+
+
+@vision_ns.route("/<string:image_id>/results")
+class UploadResults(Resource):
+    @require_auth
+    def get(self, image_id: str):
+        """Detected ingredients; 202 with Retry-After while detection is still queued."""
+        doc, error = _find_upload(image_id)
+        if error:
+            return error
+        body = _serialize_upload(doc)
+        if doc["status"] == QUEUED:
+            db = get_db()
+            if _claim_stale(db, doc, datetime.now(timezone.utc)):
+                _submit(db, doc["_id"], doc["content_hash"])
+            return body, 202, {"Retry-After": "1"}
+        if doc["status"] == FAILED:
+            return body, 200
+
+        cursor = get_db().detections.find(
+            {"content_hash": doc["content_hash"], "model_version": doc["model_version"]},
+            {"_id": 0, "name": 1, "ingredient_id": 1, "confidence": 1},
+        ).sort("confidence", -1)
+        body["detections"] = [
+            {
+                "name": d["name"],
+                "ingredient_id": str(d["ingredient_id"]) if d.get("ingredient_id") else None,
+                "confidence": d["confidence"],
+            }
+            for d in cursor
+        ]
+        return body, 200
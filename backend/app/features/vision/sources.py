@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from gridfs import GridFSBucket
+from pymongo import MongoClient
+
+# Imported by the detection worker processes when they unpickle a source,
+# so it stays free of Flask and of backend.app.db.
+
+
+@lru_cache(maxsize=None)
+def _client(uri: str, options: tuple) -> MongoClient:
+    # One client per worker process, reused across runs.
+    return MongoClient(uri, **dict(options))
+
+
+@dataclass(frozen=True)
+class GridFSSource:
+    """
+    An image stored in GridFS, as handed to a detection worker: just where
+    to find it. The worker downloads the bytes itself, so the request
+    thread never holds the image and nothing large is pickled.
+    """
+
+    uri: str
+    db_name: str
+    bucket: str
+    key: str
+    options: tuple = field(default=())
+
+    def read(self) -> bytes:
+        db = _client(self.uri, self.options)[self.db_name]
+        return GridFSBucket(db, bucket_name=self.bucket).open_download_stream_by_name(self.key).read()
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import uuid
+from typing import Callable, Iterable
+
+from gridfs import GridFSBucket
+from pymongo.database import Database
+
+from backend.app.db import MONGO_URI, client_options, get_db
+from backend.app.features.vision.sources import GridFSSource
+
+VISION_STORAGE = os.getenv("VISION_STORAGE", "disk")  # disk | gridfs
+VISION_STORAGE_DIR = os.getenv("VISION_STORAGE_DIR", os.path.join(tempfile.gettempdir(), "kitchen-images"))
+VISION_MAX_UPLOAD_BYTES = int(os.getenv("VISION_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = 64 * 1024
+
+# Images are stored content-addressed: the key is the sha256 of the bytes,
+# computed while the upload streams through, so identical uploads share
+# one stored copy and one set of detections.
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+def read_chunks(stream, chunk_bytes: int = UPLOAD_CHUNK_BYTES):
+    while True:
+        chunk = stream.read(chunk_bytes)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _checked(chunks: Iterable[bytes], digest, max_bytes: int):
+    size = 0
+    for chunk in chunks:
+        size += len(chunk)
+        if size > max_bytes:
+            raise UploadTooLarge(f"Image is larger than {max_bytes} bytes.")
+        digest.update(chunk)
+        yield chunk
+
+
+class DiskStorage:
+    def __init__(self, root: str = VISION_STORAGE_DIR):
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key)
+
+    def save(self, chunks: Iterable[bytes], max_bytes: int = VISION_MAX_UPLOAD_BYTES) -> tuple[str, int]:
+        """Write chunks to a temp file, then move it to its hash. Returns (key, size)."""
+        os.makedirs(self.root, exist_ok=True)
+        digest = hashlib.sha256()
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".part")
+        try:
+            size = 0
+            with os.fdopen(fd, "wb") as f:
+                for chunk in _checked(chunks, digest, max_bytes):
+                    f.write(chunk)
+                    size += len(chunk)
+            key = digest.hexdigest()
+            path = self._path(key)
+            if os.path.exists(path):
+                os.remove(tmp)  # same bytes stored already
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return key, size
+
+    def source(self, key: str) -> str:
+        """What the detector worker reads: the file path."""
+        return self._path(key)
+
+
+class GridFSStorage:
+    def __init__(self, db: Callable[[], Database] = get_db, bucket: str = "images"):
+        self._db = db
+        self.bucket = bucket
+
+    def _bucket(self) -> GridFSBucket:
+        return GridFSBucket(self._db(), bucket_name=self.bucket)
+
+    def save(self, chunks: Iterable[bytes], max_bytes: int = VISION_MAX_UPLOAD_BYTES) -> tuple[str, int]:
+        """Stream chunks into GridFS, then name the file by its hash. Returns (key, size)."""
+        bucket = self._bucket()
+        digest = hashlib.sha256()
+        grid_in = bucket.open_upload_stream(f"partial-{uuid.uuid4().hex}")
+        size = 0
+        try:
+            for chunk in _checked(chunks, digest, max_bytes):
+                grid_in.write(chunk)
+                size += len(chunk)
+        except BaseException:
+            grid_in.abort()
+            raise
+        grid_in.close()
+
+        key = digest.hexdigest()
+        if next(iter(bucket.find({"filename": key}).limit(1)), None) is not None:
+            bucket.delete(grid_in._id)
+        else:
+            bucket.rename(grid_in._id, key)
+        return key, size
+
+    def source(self, key: str) -> GridFSSource:
+        """What the detector worker reads: where the file is; the worker downloads it."""
+        return GridFSSource(MONGO_URI, self._db().name, self.bucket, key,
+                            tuple(sorted(client_options().items())))
+
+
+def make_storage():
+    if VISION_STORAGE == "gridfs":
+        return GridFSStorage()
+    return DiskStorage()
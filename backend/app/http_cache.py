@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import os
+
+from flask import Flask, Response, request
+
+# Seconds a client may reuse a response without asking again, per first
+# path segment. 0 means "always revalidate" (the ETag still saves the body).
+DEFAULT_MAX_AGE = {
+    "cuisines": 300,
+    "ingredients": 60,
+    "form": 3600,
+    "recipes": 0,
+}
+
+
+def max_age_config() -> dict:
+    """DEFAULT_MAX_AGE with CACHE_MAX_AGE_<NAMESPACE> env overrides."""
+    config = dict(DEFAULT_MAX_AGE)
+    for namespace in config:
+        value = os.getenv(f"CACHE_MAX_AGE_{namespace.upper()}")
+        if value not in (None, ""):
+            config[namespace] = int(value)
+    return config
+
+
+def _namespace(path: str) -> str:
+    return path.strip("/").split("/", 1)[0]
+
+
+def apply_http_cache(response: Response, max_age: dict) -> Response:
+    """
+    Give cacheable GET responses a weak ETag and Cache-Control, and turn
+    them into an empty 304 when If-None-Match already has that ETag.
+    """
+    if request.method not in ("GET", "HEAD") or response.status_code != 200:
+        return response
+    if response.is_streamed or response.direct_passthrough:
+        return response
+
+    seconds = max_age.get(_namespace(request.path))
+    if seconds is None:
+        return response
+
+    # Handlers that know a cheaper version (e.g. a snapshot counter) can
+    # set the ETag themselves; otherwise hash the encoded body.
+    response.add_etag(overwrite=False, weak=True)
+    if seconds > 0:
+        response.cache_control.public = True
+        response.cache_control.max_age = seconds
+    else:
+        response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+def init_http_cache(app: Flask):
+    app.config.setdefault("CACHE_MAX_AGE", max_age_config())
+
+    @app.after_request
+    def _http_cache(response: Response) -> Response:
+        return apply_http_cache(response, app.config["CACHE_MAX_AGE"])
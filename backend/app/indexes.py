@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Callable
+
+from flask import Flask
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.database import Database
+from pymongo.errors import OperationFailure, PyMongoError
+
+from backend.app.db import get_db
+
+INDEX_RETRY_SECONDS = float(os.getenv("MONGO_INDEX_RETRY_SECONDS", "30"))
+
+# Every index the routes rely on. create_indexes is a no-op for indexes
+# that already exist with the same spec, so applying this is idempotent.
+INDEX_MANIFEST: dict[str, list[IndexModel]] = {
+    "carts": [
+        # One cart per user; cart updates upsert on user_id.
+        IndexModel([("user_id", ASCENDING)], name="user_id_unique", unique=True),
+    ],
+    "cuisines": [
+        IndexModel([("slug", ASCENDING)], name="slug_unique", unique=True),
+        IndexModel([("name", ASCENDING)], name="name"),
+    ],
+    "detections": [
+        # One row per label per (image bytes, model); detection runs upsert on it.
+        IndexModel([("content_hash", ASCENDING), ("model_version", ASCENDING), ("name", ASCENDING)],
+                   name="content_hash_model_version_name_unique", unique=True),
+    ],
+    "image_uploads": [
+        # Duplicate-upload lookup and "mark every pending copy done".
+        IndexModel([("content_hash", ASCENDING), ("status", ASCENDING)], name="content_hash_status"),
+    ],
+    "ingredients": [
+        IndexModel([("name", ASCENDING)], name="name"),
+    ],
+    "orders": [
+        # The forwarding queue: oldest claimable first, overall and per vendor.
+        IndexModel([("status", ASCENDING), ("available_at", ASCENDING)], name="status_available_at"),
+        IndexModel([("vendor_id", ASCENDING), ("status", ASCENDING), ("available_at", ASCENDING)],
+                   name="vendor_id_status_available_at"),
+        IndexModel([("user_id", ASCENDING), ("_id", DESCENDING)], name="user_id__id"),
+    ],
+    "recipes": [
+        # Compound with _id so filtered listings come back already in
+        # keyset order (no in-memory SORT); the prefixes serve lookups.
+        IndexModel([("name", ASCENDING), ("_id", ASCENDING)], name="name__id"),
+        IndexModel([("cuisine", ASCENDING), ("_id", DESCENDING)], name="cuisine__id"),
+        IndexModel([("ingredients", ASCENDING), ("_id", DESCENDING)], name="ingredients__id"),
+        IndexModel([("tags", ASCENDING), ("_id", DESCENDING)], name="tags__id"),
+    ],
+    "revoked_tokens": [
+        # Entries only matter until the tokens they cover would have expired.
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ],
+    "vendor_products": [
+        # The sync job's upsert key; also serves per-vendor hash reads.
+        IndexModel([("vendor_id", ASCENDING), ("vendor_sku", ASCENDING)],
+                   name="vendor_id_vendor_sku_unique", unique=True),
+        IndexModel([("ingredient_id", ASCENDING)], name="ingredient_id"),
+    ],
+}
+
+
+def ensure_indexes(db: Database) -> dict:
+    """
+    Apply INDEX_MANIFEST. Returns {"created": [...], "failed": {...}}.
+    A failing index (e.g. duplicates blocking a unique one) is reported
+    instead of stopping the rest.
+    """
+    created, failed = [], {}
+    for collection, models in INDEX_MANIFEST.items():
+        for model in models:
+            name = model.document["name"]
+            try:
+                db[collection].create_indexes([model])
+                created.append(f"{collection}.{name}")
+            except OperationFailure as e:
+                failed[f"{collection}.{name}"] = str(e)
+    return {"created": created, "failed": failed}
+
+
+def init_indexes(app: Flask, db: Callable[[], Database] = get_db):
+    """
+    Apply INDEX_MANIFEST at startup. An index that cannot be built is
+    logged as an error: unique ones (cuisines.slug_unique,
+    users.email_unique) are the only duplicate check their routes have.
+    If Mongo is unreachable, the build is retried before requests, at most
+    every INDEX_RETRY_SECONDS, until it goes through once.
+    """
+    lock = threading.Lock()
+    state = {"done": False, "next_try": 0.0}
+
+    def attempt():
+        try:
+            result = ensure_indexes(db())
+        except PyMongoError as e:
+            state["next_try"] = time.monotonic() + INDEX_RETRY_SECONDS
+            app.logger.warning("Index build deferred, Mongo not reachable: %s", e)
+            return
+        state["done"] = True
+        for name, error in result["failed"].items():
+            app.logger.error("Index %s could not be built: %s", name, error)
+
+    attempt()
+
+    @app.before_request
+    def retry_indexes():
+        if state["done"] or time.monotonic() < state["next_try"] or not lock.acquire(blocking=False):
+            return
+        try:
+            if not state["done"]:
+                attempt()
+        finally:
+            lock.release()
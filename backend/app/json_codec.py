@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import json
+import os
+from datetime import date, datetime
+
+from bson import ObjectId
+from flask import Flask, make_response
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is the fallback
+    orjson = None
+
+# "auto" picks orjson when installed; "stdlib" forces the json module.
+JSON_ENCODER = os.getenv("JSON_ENCODER", "auto")
+
+
+def _default(obj):
+    """Types Mongo documents carry that neither encoder knows natively."""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def stdlib_dumps(obj) -> bytes:
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def orjson_dumps(obj) -> bytes:
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+if orjson is not None and JSON_ENCODER != "stdlib":
+    ENCODER = "orjson"
+    dumps = orjson_dumps
+else:
+    ENCODER = "stdlib"
+    dumps = stdlib_dumps
+
+
+def output_json(data, code, headers=None):
+    """flask-restx representation for application/json using dumps()."""
+    resp = make_response(dumps(data), code)
+    resp.headers.extend(headers or {})
+    resp.mimetype = "application/json"
+    return resp
+
+
+class CodecJSONProvider(DefaultJSONProvider):
+    """Routes plain Flask views (dict returns, jsonify) through dumps()."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return dumps(obj).decode("utf-8")
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype=self.mimetype)
+
+
+def init_json(app: Flask, api):
+    """Use the selected encoder for both Flask and flask-restx responses."""
+    app.json = CodecJSONProvider(app)
+    api.representations["application/json"] = output_json
@@ -1,18 +1,47 @@
+import os
+
 from flask import Flask, request
 from flask_restx import Api, Namespace, Resource
 from flask_cors import CORS
 
-from backend.app.db import ping_mongo
+from backend.app.cache import doc_cache, ingredient_cache, token_cache
+from backend.app.compression import init_compression
+from backend.app.db import get_db, ping_mongo, pool_info, warm_up
+from backend.app.http_cache import init_http_cache
+from backend.app.indexes import init_indexes
+from backend.app.json_codec import init_json
+from backend.app.metrics import init_metrics
+from backend.app.security import require_secret, revocations
+from backend.app.features.admin.routes import admin_ns
+from backend.app.features.auth.routes import auth_ns
 from backend.app.features.recipes.routes import recipes_ns
+from backend.app.features.recipes.ingredient_index import recipe_index
+from backend.app.features.carts.routes import carts_ns
 from backend.app.features.cuisines.routes import cuisines_ns
-from backend.app.features.ingredients.routes import ingredients_ns
+from backend.app.features.cuisines.snapshot import cuisine_snapshot
+from backend.app.features.ingredients.routes import ingredient_snapshot, ingredients_ns
 from backend.app.features.dev.routes import dev_ns
+from backend.app.features.orders.routes import orders_ns
+from backend.app.features.search.routes import search_ns
+from backend.app.features.search.index import search_index
+from backend.app.features.vision.routes import vision_ns
 
 
 def create_app() -> Flask:
+    require_secret()
+    if os.getenv("MONGO_WARMUP", "0") == "1":
+        # Connect before the first request instead of during it.
+        warm_up()
+
     app = Flask(__name__)
-    CORS(app)
+    CORS(app, expose_headers=["ETag", "Server-Timing"])
+    # Registered first so its after_request runs last and sees final statuses.
+    init_metrics(app)
+    # Runs after the http cache hook, so ETags and 304s see the plain body.
+    init_compression(app)
+    init_http_cache(app)
     api = Api(app, title="Kitchen API", version="0.1")
+    init_json(app, api)
 
     # -----------------------------
     # Demo endpoints (for React HW)
@@ -50,6 +79,16 @@ def create_app() -> Flask:
             ok = ping_mongo()
             return {"mongo": "ok" if ok else "down"}, 200 if ok else 500
 
+    @db_ns.route("/pool")
+    class DbPool(Resource):
+        def get(self):
+            return pool_info(), 200
+
+    @db_ns.route("/cache")
+    class DbCache(Resource):
+        def get(self):
+            return doc_cache.stats(), 200
+
     # -----------------------
     # Register namespaces
     # -----------------------
@@ -59,6 +98,30 @@ def create_app() -> Flask:
     api.add_namespace(cuisines_ns, path="/cuisines")
     api.add_namespace(ingredients_ns, path="/ingredients")
     api.add_namespace(dev_ns, path="/dev")  # ✅ correct place
+    api.add_namespace(search_ns, path="/search")
+    api.add_namespace(carts_ns, path="/carts")
+    api.add_namespace(orders_ns, path="/orders")
+    api.add_namespace(vision_ns, path="/vision")
+    api.add_namespace(auth_ns, path="/auth")
+    api.add_namespace(admin_ns, path="/admin")
+
+    # -----------------------
+    # In-process caches and indexes
+    # -----------------------
+    doc_cache.clear()
+    ingredient_cache.clear()
+    token_cache.clear()
+    revocations.clear()
+    cuisine_snapshot.invalidate()
+    ingredient_snapshot.invalidate()
+    if os.getenv("MONGO_ENSURE_INDEXES", "1") == "1":
+        init_indexes(app)
+    try:
+        recipe_index.rebuild(get_db())
+        search_index.rebuild(get_db())
+    except Exception:
+        # Mongo not reachable yet: /recipes/match and /search build these on first use.
+        pass
 
     # -----------------------
     # HATEOAS form endpoint
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from flask import Flask, Response, request
+from pymongo import monitoring
+
+# Prometheus-style upper bounds in seconds.
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class RequestStats:
+    """What one request spent, filled in by the middleware and listener."""
+
+    __slots__ = ("started", "db_commands", "db_seconds")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_commands = 0
+        self.db_seconds = 0.0
+
+
+_current: ContextVar[RequestStats | None] = ContextVar("kitchen_request_stats", default=None)
+
+
+class CommandTimer(monitoring.CommandListener):
+    """
+    Attribute Mongo command time to the request running on this thread.
+    pymongo fires these events on the thread that issued the command.
+    """
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._record(event)
+
+    def failed(self, event):
+        self._record(event)
+
+    def _record(self, event):
+        stats = _current.get()
+        if stats is not None:
+            stats.db_commands += 1
+            stats.db_seconds += event.duration_micros / 1_000_000
+
+
+command_timer = CommandTimer()
+
+
+class Histogram:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    """Per-process metrics, keyed by (method, route rule)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.durations: dict[tuple, Histogram] = {}
+        self.db_durations: dict[tuple, Histogram] = {}
+        self.db_commands: dict[tuple, int] = {}
+        self.responses: dict[tuple, int] = {}
+
+    def observe(self, method: str, route: str, status: int, stats: RequestStats, elapsed: float):
+        key = (method, route)
+        with self._lock:
+            self.durations.setdefault(key, Histogram()).observe(elapsed)
+            self.db_durations.setdefault(key, Histogram()).observe(stats.db_seconds)
+            self.db_commands[key] = self.db_commands.get(key, 0) + stats.db_commands
+            status_key = (method, route, str(status))
+            self.responses[status_key] = self.responses.get(status_key, 0) + 1
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            self._render_histograms(
+                lines, "kitchen_request_duration_seconds",
+                "Wall time per request.", self.durations,
+            )
+            self._render_histograms(
+                lines, "kitchen_request_db_duration_seconds",
+                "Mongo command time per request.", self.db_durations,
+            )
+            lines.append("# HELP kitchen_db_commands_total Mongo commands issued by requests.")
+            lines.append("# TYPE kitchen_db_commands_total counter")
+            for (method, route), n in sorted(self.db_commands.items()):
+                lines.append(f'kitchen_db_commands_total{{method="{method}",route="{route}"}} {n}')
+            lines.append("# HELP kitchen_responses_total Responses by status code.")
+            lines.append("# TYPE kitchen_responses_total counter")
+            for (method, route, status), n in sorted(self.responses.items()):
+                lines.append(
+                    f'kitchen_responses_total{{method="{method}",route="{route}",status="{status}"}} {n}'
+                )
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _render_histograms(lines: list, name: str, help_text: str, histograms: dict):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for (method, route), h in sorted(histograms.items()):
+            labels = f'method="{method}",route="{route}"'
+            cumulative = 0
+            for bound, n in zip(h.buckets, h.counts):
+                cumulative += n
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {h.count}')
+            lines.append(f"{name}_sum{{{labels}}} {h.sum:.6f}")
+            lines.append(f"{name}_count{{{labels}}} {h.count}")
+
+
+registry = Registry()
+
+
+def _server_timing(stats: RequestStats, elapsed: float) -> str:
+    app_ms = elapsed * 1000
+    db_ms = stats.db_seconds * 1000
+    return (
+        f'app;dur={app_ms:.2f}, '
+        f'db;dur={db_ms:.2f};desc="{stats.db_commands} cmds", '
+        f'py;dur={max(app_ms - db_ms, 0.0):.2f}'
+    )
+
+
+def init_metrics(app: Flask):
+    """
+    Time every request, attribute Mongo commands to it, add a Server-Timing
+    header and serve the aggregate at /metrics.
+    """
+
+    @app.before_request
+    def _start_timer():
+        _current.set(RequestStats())
+
+    @app.after_request
+    def _record(response: Response) -> Response:
+        stats = _current.get()
+        if stats is None:
+            return response
+        elapsed = time.perf_counter() - stats.started
+        route = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+        registry.observe(request.method, route, response.status_code, stats, elapsed)
+        response.headers["Server-Timing"] = _server_timing(stats, elapsed)
+        return response
+
+    @app.teardown_request
+    def _clear(exc=None):
+        _current.set(None)
+
+    @app.get("/metrics")
+    def metrics():
+        return Response(registry.render(), mimetype="text/plain; version=0.0.4")
@@ -1,16 +1,296 @@
-from flask import request
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from functools import wraps
+from typing import Callable
+
+from flask import g, request
+
+from backend.app.cache import token_cache
+from backend.app.db import get_db
+
+# Every process that verifies tokens must share AUTH_SECRET; create_app()
+# refuses to start without it. AUTH_DEV_MODE=1 (a single local dev server)
+# signs with a random one instead.
+AUTH_DEV_MODE = os.getenv("AUTH_DEV_MODE", "0") == "1"
+AUTH_SECRET = os.getenv("AUTH_SECRET") or (secrets.token_hex(32) if AUTH_DEV_MODE else "")
+ACCESS_TOKEN_TTL = int(os.getenv("ACCESS_TOKEN_TTL", "900"))
+# AUTH_REQUIRED=0 lets requests without a token pass role checks, for local
+# development against a frontend that does not log in; a token that is sent
+# is always verified.
+AUTH_REQUIRED = os.getenv("AUTH_REQUIRED", "1") == "1"
+REVOCATION_SYNC_SECONDS = float(os.getenv("REVOCATION_SYNC_SECONDS", "30"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+PASSWORD_SCRYPT_N = int(os.getenv("PASSWORD_SCRYPT_N", str(2 ** 15)))
+
+ROLES = ("user", "content_manager", "admin")
+CONTENT_ROLES = ("content_manager", "admin")
+
+
+class AuthError(ValueError):
+    pass
+
+
+# -----------------------
+# Access tokens (JWT, HS256)
+# -----------------------
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+# Only HS256 tokens are issued, so the header is a constant and anything
+# else (alg "none", RS256 key confusion) is rejected by comparing it.
+_HEADER = _b64encode(json.dumps({"alg": "HS256", "typ": "JWT"}, separators=(",", ":")).encode())
+
+
+def require_secret():
+    if not AUTH_SECRET:
+        raise RuntimeError("AUTH_SECRET is not set; set it, or AUTH_DEV_MODE=1 for a local dev server.")
+
+
+def _signature(signing_input: str) -> str:
+    require_secret()
+    return _b64encode(hmac.new(AUTH_SECRET.encode(), signing_input.encode("ascii"), hashlib.sha256).digest())
+
+
+def issue_token(user_id: str, role: str, ttl: int | None = None) -> str:
+    if role not in ROLES:
+        raise ValueError(f"Unknown role: {role}")
+    now = time.time()
+    claims = {
+        "sub": str(user_id),
+        "role": role,
+        # Not truncated to seconds, so a token issued right after
+        # revoke_user() is not caught by its cutoff.
+        "iat": now,
+        "exp": int(now + (ACCESS_TOKEN_TTL if ttl is None else ttl)),
+        "jti": secrets.token_urlsafe(12),
+    }
+    signing_input = f"{_HEADER}.{_b64encode(json.dumps(claims, separators=(',', ':')).encode())}"
+    return f"{signing_input}.{_signature(signing_input)}"
+
+
+def decode_token(token: str) -> dict:
+    """Check the signature and shape of a token and return its claims."""
+    header, _, rest = token.partition(".")
+    payload, _, signature = rest.partition(".")
+    if header != _HEADER or not payload or not signature:
+        raise AuthError("Malformed token.")
+    if not hmac.compare_digest(signature, _signature(f"{header}.{payload}")):
+        raise AuthError("Bad signature.")
+    try:
+        claims = json.loads(_b64decode(payload))
+    except ValueError:
+        raise AuthError("Malformed token.")
+    if not isinstance(claims, dict) or claims.get("role") not in ROLES or not isinstance(claims.get("sub"), str) \
+            or not isinstance(claims.get("exp"), (int, float)) or not isinstance(claims.get("jti"), str):
+        raise AuthError("Malformed token.")
+    return claims
+
+
+class RevocationList:
+    """
+    Revoked token ids and per-user "not before" cutoffs, mirrored from
+    the revoked_tokens collection. Checks are in-memory; the mirror is
+    refreshed at most every sync_interval seconds, by whichever request
+    notices first, while the others keep using the current copy.
+    """
+
+    def __init__(self, sync_interval: float = REVOCATION_SYNC_SECONDS,
+                 db: Callable = get_db, clock: Callable[[], float] = time.monotonic):
+        self.sync_interval = sync_interval
+        self._db = db
+        self._clock = clock
+        self._lock = threading.Lock()
+        # (jtis, {user_id: not_before}) swapped as one reference.
+        self._state: tuple[frozenset, dict] = (frozenset(), {})
+        self._synced_at: float | None = None
+        self.syncs = 0
+
+    def sync(self):
+        jtis, users = set(), {}
+        cursor = self._db().revoked_tokens.find(
+            {"expires_at": {"$gt": datetime.now(timezone.utc)}},
+            {"_id": 0, "jti": 1, "user_id": 1, "not_before": 1},
+        )
+        for doc in cursor:
+            if doc.get("jti"):
+                jtis.add(doc["jti"])
+            elif doc.get("user_id"):
+                users[doc["user_id"]] = max(users.get(doc["user_id"], 0), doc["not_before"])
+        self._state = (frozenset(jtis), users)
+        self._synced_at = self._clock()
+        self.syncs += 1
+
+    def _refresh(self):
+        if self._synced_at is None:
+            with self._lock:  # nothing loaded yet: everyone waits for the first sync
+                if self._synced_at is None:
+                    self.sync()
+        elif self._clock() - self._synced_at >= self.sync_interval and self._lock.acquire(blocking=False):
+            try:
+                self.sync()
+            except Exception:
+                # Mongo unreachable: keep checking against the last copy.
+                self._synced_at = self._clock()
+            finally:
+                self._lock.release()
+
+    def is_revoked(self, claims: dict) -> bool:
+        self._refresh()
+        jtis, users = self._state
+        return claims["jti"] in jtis or claims.get("iat", 0) < users.get(claims["sub"], 0)
+
+    def _add(self, jti: str | None = None, user_id: str | None = None, not_before: float = 0):
+        with self._lock:
+            jtis, users = self._state
+            if jti:
+                jtis = jtis | {jti}
+            if user_id:
+                users = {**users, user_id: max(users.get(user_id, 0), not_before)}
+            self._state = (jtis, users)
+
+    def revoke_token(self, claims: dict):
+        """Revoke one token (logout). Other processes see it after their next sync."""
+        self._db().revoked_tokens.insert_one({
+            "jti": claims["jti"],
+            "expires_at": datetime.fromtimestamp(claims["exp"], timezone.utc),
+        })
+        self._add(jti=claims["jti"])
+
+    def revoke_user(self, user_id: str):
+        """Revoke every token issued to a user so far (role change, suspension)."""
+        now = time.time()
+        self._db().revoked_tokens.insert_one({
+            "user_id": user_id,
+            "not_before": now,
+            "expires_at": datetime.now(timezone.utc) + timedelta(seconds=ACCESS_TOKEN_TTL),
+        })
+        self._add(user_id=user_id, not_before=now)
+
+    def clear(self):
+        self._state = (frozenset(), {})
+        self._synced_at = None
+
+
+revocations = RevocationList()
+
+
+def verify_token(token: str) -> dict:
+    """
+    Return the claims of a valid token. The signature is checked once per
+    token and cached; expiry and revocation are checked every time.
+    """
+    claims = token_cache.get("token", token)
+    if claims is None:
+        claims = decode_token(token)
+        token_cache.put("token", token, claims)
+    if claims["exp"] <= time.time():
+        raise AuthError("Token expired.")
+    if revocations.is_revoked(claims):
+        raise AuthError("Token revoked.")
+    return claims
+
+
+# -----------------------
+# Request guards
+# -----------------------
+
+def _bearer_token() -> str | None:
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    token = token.strip()
+    return token if scheme.lower() == "bearer" and token else None
+
+
+def current_user() -> dict | None:
+    """Claims of the request's verified token, if it sent one."""
+    return g.get("user")
+
+
+def acts_for(user_id) -> bool:
+    """Whether the request's user may read or change user_id's data: their own, or any as admin."""
+    user = current_user()
+    return user is not None and (user["sub"] == user_id or user["role"] == "admin")
+
+
+def _guard(roles: tuple, always: bool):
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            token = _bearer_token()
+            if token is None:
+                if not always and not AUTH_REQUIRED:
+                    return func(*args, **kwargs)
+                return {"message": "Unauthorized"}, 401, {"WWW-Authenticate": "Bearer"}
+            try:
+                g.user = verify_token(token)
+            except AuthError as e:
+                return {"message": f"Unauthorized: {e}"}, 401, {"WWW-Authenticate": 'Bearer error="invalid_token"'}
+            if g.user["role"] not in roles:
+                return {"message": "Forbidden"}, 403
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def require_auth(func):
+    """Any signed-in user; always needs a token."""
+    return _guard(ROLES, always=True)(func)
+
+
+def require_role(*roles: str, always: bool = False):
+    """
+    Only these roles. Anonymous requests pass if AUTH_REQUIRED is turned
+    off, unless always is set (endpoints that must never be open).
+    """
+    return _guard(roles, always=always)
+
+
+# -----------------------
+# Passwords
+# -----------------------
+
+# scrypt is deliberately slow (~100ms). Hashing runs on this bounded pool
+# so a burst of logins queues here instead of occupying every request
+# thread and core at once.
+_password_pool = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+
 
-API_KEY = "123456"
+def _scrypt(password: str, salt: bytes, n: int) -> bytes:
+    return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=8, p=1,
+                          maxmem=256 * 8 * n, dklen=32)
 
-def require_api_key(func):
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        key = request.headers.get("x-api-key")
 
-        if key != API_KEY:
-            return {"message": "Unauthorized"}, 401
+def hash_password(password: str) -> str:
+    salt = os.urandom(16)
+    n = PASSWORD_SCRYPT_N
+    digest = _password_pool.submit(_scrypt, password, salt, n).result()
+    return f"scrypt${n}${_b64encode(salt)}${_b64encode(digest)}"
 
-        return func(*args, **kwargs)
 
-    return wrapper
+def check_password(password: str, stored: str) -> bool:
+    try:
+        scheme, n, salt, digest = stored.split("$")
+        if scheme != "scrypt":
+            return False
+        expected = _b64decode(digest)
+        actual = _password_pool.submit(_scrypt, password, _b64decode(salt), int(n)).result()
+    except (ValueError, AttributeError):
+        return False
+    return hmac.compare_digest(actual, expected)
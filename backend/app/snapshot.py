@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from typing import Callable
+
+from flask import Response, request
+from pymongo.database import Database
+
+from backend.app.compression import COMPRESS_MIN_SIZE, choose_encoding, compress
+from backend.app.json_codec import dumps
+
+
+class EncodedSnapshot:
+    """
+    Process-wide, pre-encoded copy of a small, rarely-changing listing.
+
+    The payload is loaded and encoded once per refresh; requests get the
+    same bytes and an ETag hashed from them, so a hit does no DB work and
+    no serialization. Compressed variants are made once per load too.
+    """
+
+    def __init__(self, load: Callable[[Database], object], ttl: float,
+                 clock: Callable[[], float] = time.monotonic):
+        self._load_payload = load
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        # (body, etag, loaded_at, {encoding: bytes}) swapped as one
+        # reference so readers never see a half-updated snapshot.
+        self._state: tuple[bytes, str, float, dict] | None = None
+        self._generation = 0
+        self.loads = 0
+
+    def _fresh(self, state) -> bool:
+        return state is not None and self._clock() - state[2] < self.ttl
+
+    def get(self, db: Database) -> tuple[bytes, str]:
+        """Return (encoded body, etag value), reloading only when stale."""
+        state = self._current(db)
+        return state[0], state[1]
+
+    def _current(self, db: Database) -> tuple:
+        state = self._state
+        if not self._fresh(state):
+            with self._lock:
+                state = self._state
+                if not self._fresh(state):
+                    generation = self._generation
+                    state = self._load(db)
+                    # A write that landed mid-load may be missing from it.
+                    if generation == self._generation:
+                        self._state = state
+        return state
+
+    def _load(self, db: Database) -> tuple[bytes, str, float, dict]:
+        body = dumps(self._load_payload(db))
+        etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        self.loads += 1
+        return body, etag, self._clock(), {}
+
+    def invalidate(self):
+        self._generation += 1
+        self._state = None
+
+    def response(self, db: Database) -> Response:
+        """The snapshot as a JSON response, or 304 if the client has it."""
+        body, etag, _, variants = self._current(db)
+        headers = {"ETag": f'W/"{etag}"', "Vary": "Accept-Encoding"}
+        # Revalidations are answered before any bytes are copied.
+        if request.if_none_match.contains_weak(etag):
+            return Response(status=304, headers=headers)
+
+        encoding = choose_encoding(request.accept_encodings) if len(body) >= COMPRESS_MIN_SIZE else None
+        if encoding is not None:
+            if encoding not in variants:
+                variants[encoding] = compress(body, encoding)
+            body = variants[encoding]
+            headers["Content-Encoding"] = encoding
+        return Response(body, mimetype="application/json", headers=headers)
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import json
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError
+
+BULK_BATCH_SIZE = 500
+BULK_MAX_ITEMS = 10000
+
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+def parse_bulk_body(raw: bytes, content_type: str | None) -> list:
+    """
+    Accept either a JSON array or NDJSON (one JSON value per line).
+    Raises ValueError with a client-facing message.
+    """
+    mimetype = (content_type or "").split(";")[0].strip().lower()
+    text = raw.decode("utf-8") if raw else ""
+
+    if mimetype in NDJSON_TYPES:
+        items = []
+        for lineno, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except json.JSONDecodeError:
+                raise ValueError(f"Line {lineno} is not valid JSON.")
+    else:
+        try:
+            items = json.loads(text) if text.strip() else None
+        except json.JSONDecodeError:
+            raise ValueError("Request body must be a JSON array or NDJSON.")
+        if not isinstance(items, list):
+            raise ValueError("Request body must be a JSON array or NDJSON.")
+
+    if not items:
+        raise ValueError("No items provided.")
+    if len(items) > BULK_MAX_ITEMS:
+        raise ValueError(f"At most {BULK_MAX_ITEMS} items per request.")
+    return items
+
+
+def chunked(items: Iterable, size: int) -> Iterator[list]:
+    it = iter(items)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def validate_items(items: list, build: Callable[[object], dict]) -> tuple[list, list]:
+    """
+    Run the single-item validator over every item.
+    Returns ([(index, doc)], [error result]).
+    """
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            if not isinstance(item, dict):
+                raise ValueError("Item must be a JSON object.")
+            valid.append((index, build(item)))
+        except ValueError as e:
+            errors.append({"index": index, "status": "error", "error": str(e)})
+    return valid, errors
+
+
+def _write_error_results(exc: BulkWriteError, batch: list) -> dict[int, str]:
+    failed = {}
+    for err in exc.details.get("writeErrors", []):
+        index, _ = batch[err["index"]]
+        failed[index] = err.get("errmsg", "Write failed.")
+    return failed
+
+
+def bulk_insert(collection: Collection, valid: list,
+                batch_size: int = BULK_BATCH_SIZE) -> list[dict]:
+    """
+    insert_many(ordered=False) in batches. _ids are assigned client-side so
+    every item gets an id in the summary even when part of a batch fails.
+    """
+    results = []
+    for batch in chunked(valid, batch_size):
+        for _, doc in batch:
+            doc.setdefault("_id", ObjectId())
+        failed = {}
+        try:
+            collection.insert_many([doc for _, doc in batch], ordered=False)
+        except BulkWriteError as e:
+            failed = _write_error_results(e, batch)
+
+        for index, doc in batch:
+            if index in failed:
+                results.append({"index": index, "status": "error", "error": failed[index]})
+            else:
+                results.append({"index": index, "status": "created", "_id": str(doc["_id"])})
+    return results
+
+
+def bulk_upsert(collection: Collection, valid: list, key: str,
+                batch_size: int = BULK_BATCH_SIZE) -> list[dict]:
+    """
+    Upsert on a natural key with bulk_write(ordered=False).
+    Existing documents are read back in one $in query per batch so callers
+    learn their ids too.
+    """
+    results = []
+    for batch in chunked(valid, batch_size):
+        ops = [
+            UpdateOne({key: doc[key]}, {"$set": doc}, upsert=True)
+            for _, doc in batch
+        ]
+        failed = {}
+        upserted_ids = {}
+        try:
+            res = collection.bulk_write(ops, ordered=False)
+            upserted_ids = res.upserted_ids
+        except BulkWriteError as e:
+            failed = _write_error_results(e, batch)
+            upserted_ids = {u["index"]: u["_id"] for u in e.details.get("upserted", [])}
+
+        updated_keys = [
+            doc[key] for i, (index, doc) in enumerate(batch)
+            if index not in failed and i not in upserted_ids
+        ]
+        existing = {}
+        if updated_keys:
+            for d in collection.find({key: {"$in": updated_keys}}, {key: 1}):
+                existing[d[key]] = d["_id"]
+
+        for i, (index, doc) in enumerate(batch):
+            if index in failed:
+                results.append({"index": index, "status": "error", "error": failed[index]})
+            elif i in upserted_ids:
+                doc["_id"] = upserted_ids[i]
+                results.append({"index": index, "status": "created", "_id": str(doc["_id"])})
+            else:
+                doc["_id"] = existing.get(doc[key])
+                results.append({
+                    "index": index,
+                    "status": "updated",
+                    "_id": str(doc["_id"]) if doc["_id"] is not None else None,
+                })
+    return results
+
+
+def summarize(results: list[dict]) -> dict:
+    results = sorted(results, key=lambda r: r["index"])
+    counts = {"created": 0, "updated": 0, "error": 0}
+    for r in results:
+        counts[r["status"]] += 1
+    return {
+        "received": len(results),
+        "created": counts["created"],
+        "updated": counts["updated"],
+        "failed": counts["error"],
+        "results": results,
+    }
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import os
+import zlib
+from typing import Callable, Iterable, Iterator
+
+from flask import Response, request
+
+from backend.app.json_codec import dumps
+
+# Documents fetched per getMore; bounds server memory per export.
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+# Lines are written to the socket in chunks of about this many bytes.
+EXPORT_CHUNK_BYTES = 64 * 1024
+EXPORT_GZIP_LEVEL = int(os.getenv("EXPORT_GZIP_LEVEL", "6"))
+
+
+def ndjson_chunks(docs: Iterable[dict], serialize: Callable[[dict], dict],
+                  chunk_bytes: int = EXPORT_CHUNK_BYTES) -> Iterator[bytes]:
+    """
+    Encode documents as NDJSON, yielding byte chunks of about chunk_bytes.
+    The first document is yielded on its own so the client sees a byte
+    as soon as the cursor returns one.
+    """
+    buffer: list[bytes] = []
+    size = 0
+    first = True
+    for doc in docs:
+        line = dumps(serialize(doc)) + b"\n"
+        if first:
+            first = False
+            yield line
+            continue
+        buffer.append(line)
+        size += len(line)
+        if size >= chunk_bytes:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = EXPORT_GZIP_LEVEL) -> Iterator[bytes]:
+    """Gzip a chunk stream, sync-flushing each chunk so nothing is held back."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31 = gzip container
+    for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+def _accepts_gzip() -> bool:
+    return request.accept_encodings["gzip"] > 0
+
+
+def ndjson_response(cursor, serialize: Callable[[dict], dict]) -> Response:
+    """
+    Stream a cursor as application/x-ndjson, gzipped when the client sends
+    Accept-Encoding: gzip. Only one batch is in memory at a time.
+    """
+    body = ndjson_chunks(cursor.batch_size(EXPORT_BATCH_SIZE), serialize)
+    headers = {"Vary": "Accept-Encoding"}
+    if _accepts_gzip():
+        body = gzip_chunks(body)
+        headers["Content-Encoding"] = "gzip"
+    return Response(body, mimetype="application/x-ndjson", headers=headers)
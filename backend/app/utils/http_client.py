@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import http.client
+import json
+import queue
+import random
+import time
+from urllib.parse import urlencode, urlsplit
+
+# Responses worth retrying: throttling and transient server errors.
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, body: bytes = b""):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.body = body
+
+
+class PooledHTTPClient:
+    """
+    Thread-safe JSON client for one base URL.
+
+    Keeps up to pool_size keep-alive connections and hands one to each
+    request, so a thread pool of the same size never opens more sockets
+    than it needs. Connection errors and RETRY_STATUSES are retried with
+    capped exponential backoff and full jitter; Retry-After is honoured.
+    """
+
+    def __init__(self, base_url: str, pool_size: int = 8, timeout: float = 10.0,
+                 max_retries: int = 5, backoff: float = 0.2, max_backoff: float = 10.0,
+                 sleep=time.sleep):
+        parts = urlsplit(base_url)
+        self._conn_class = (
+            http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        )
+        self._host = parts.netloc
+        self._prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._sleep = sleep
+        self._pool: queue.LifoQueue = queue.LifoQueue(maxsize=pool_size)
+        self.requests = 0
+        self.retries = 0
+
+    def _checkout(self) -> http.client.HTTPConnection:
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return self._conn_class(self._host, timeout=self.timeout)
+
+    def _checkin(self, conn: http.client.HTTPConnection):
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _delay(self, attempt: int, retry_after: str | None) -> float:
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def request(self, method: str, path: str, params: dict | None = None, body=None,
+                headers: dict | None = None):
+        """Send a request and return the decoded JSON body (None if empty)."""
+        url = self._prefix + path
+        if params:
+            url += "?" + urlencode(params)
+        payload = json.dumps(body).encode("utf-8") if body is not None else None
+        headers = dict(headers or {})
+        headers.setdefault("Accept", "application/json")
+        if payload is not None:
+            headers.setdefault("Content-Type", "application/json")
+
+        attempt = 0
+        while True:
+            self.requests += 1
+            conn = self._checkout()
+            retry_after = None
+            try:
+                conn.request(method, url, body=payload, headers=headers)
+                resp = conn.getresponse()
+                data = resp.read()
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                status = None
+            else:
+                status = resp.status
+                retry_after = resp.getheader("Retry-After")
+                if resp.will_close:
+                    conn.close()
+                else:
+                    self._checkin(conn)
+                if status < 400:
+                    return json.loads(data) if data else None
+                if status not in RETRY_STATUSES:
+                    raise HTTPError(status, data)
+
+            if attempt >= self.max_retries:
+                if status is None:
+                    raise ConnectionError(f"{method} {url} failed after {attempt + 1} attempts")
+                raise HTTPError(status, data)
+            self.retries += 1
+            self._sleep(self._delay(attempt, retry_after))
+            attempt += 1
+
+    def get(self, path: str, params: dict | None = None):
+        return self.request("GET", path, params=params)
+
+    def post(self, path: str, body, headers: dict | None = None):
+        return self.request("POST", path, body=body, headers=headers)
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
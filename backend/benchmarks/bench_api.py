@@ -0,0 +1,287 @@
+"""
+Latency / throughput benchmark for the Flask API.
+
+    python -m backend.benchmarks.bench_api --recipes 5000 --concurrency 8
+    python -m backend.benchmarks.bench_api --write-baseline
+
+Boots create_app() on a local HTTP server against a seeded stand-in
+database (mongomock by default, or a throwaway mongod with --backend
+mongod), drives every namespace from a thread pool and prints p50/p95/p99
+and req/s per endpoint as JSON. Exits 1 when an endpoint's p95 or req/s
+regresses past --tolerance relative to the stored baseline.
+
+Absolute numbers depend on the machine and backend, so the baseline
+stores and compares each endpoint as a multiple of GET /health (no
+database work) from the same run; regenerate it with --write-baseline
+whenever an endpoint's expected cost changes.
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BASELINE_PATH = Path(__file__).with_name("baseline_api.json")
+REFERENCE = "GET /health"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_mongod() -> tuple[subprocess.Popen, str, str]:
+    """Start mongod on a temp dbpath. Returns (process, uri, dbpath)."""
+    binary = shutil.which("mongod")
+    if binary is None:
+        sys.exit("mongod not found on PATH; use --backend mongomock")
+    dbpath = tempfile.mkdtemp(prefix="kitchen-bench-")
+    port = _free_port()
+    proc = subprocess.Popen(
+        [binary, "--dbpath", dbpath, "--port", str(port), "--bind_ip", "127.0.0.1", "--quiet"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return proc, f"mongodb://127.0.0.1:{port}/", dbpath
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    sys.exit("mongod did not start within 30s")
+
+
+def seed(db, n_recipes: int, n_ingredients: int, n_cuisines: int, rng: random.Random) -> dict:
+    for name in ("recipes", "ingredients", "cuisines"):
+        db[name].delete_many({})
+
+    ingredient_names = [f"ingredient {i}" for i in range(n_ingredients)]
+    ingredients = db.ingredients.insert_many(
+        [{"name": name, "category": "bench", "notes": None} for name in ingredient_names]
+    ).inserted_ids
+    cuisines = db.cuisines.insert_many(
+        [{"name": f"Cuisine {i}", "slug": f"cuisine-{i}", "region": "Bench"} for i in range(n_cuisines)]
+    ).inserted_ids
+
+    recipe_ids = []
+    for start in range(0, n_recipes, 1000):
+        batch = [
+            {
+                "name": f"Recipe {i}",
+                "cuisine": f"Cuisine {rng.randrange(n_cuisines)}",
+                "ingredients": rng.sample(ingredient_names, rng.randint(3, 10)),
+                "steps": [f"step {s}" for s in range(rng.randint(3, 8))],
+                "tags": rng.sample(["quick", "vegan", "spicy", "breakfast", "dinner"], 2),
+            }
+            for i in range(start, min(start + 1000, n_recipes))
+        ]
+        recipe_ids += db.recipes.insert_many(batch).inserted_ids
+
+    return {
+        "recipes": [str(x) for x in recipe_ids],
+        "ingredients": [str(x) for x in ingredients],
+        "cuisines": [str(x) for x in cuisines],
+        "ingredient_names": ingredient_names,
+    }
+
+
+def endpoints(ids: dict, rng: random.Random) -> dict:
+    """Endpoint name -> callable returning a request path."""
+    return {
+        "GET /recipes": lambda: "/recipes?limit=50",
+        "GET /recipes?fields": lambda: "/recipes?limit=50&fields=name,cuisine",
+        "GET /recipes/<id>": lambda: f"/recipes/{rng.choice(ids['recipes'])}",
+        "GET /recipes/match": lambda: "/recipes/match?ingredients=" + ",".join(
+            rng.sample(ids["ingredient_names"], 4)).replace(" ", "%20"),
+        "GET /ingredients": lambda: "/ingredients",
+        "GET /ingredients/<id>": lambda: f"/ingredients/{rng.choice(ids['ingredients'])}",
+        "GET /cuisines": lambda: "/cuisines",
+        "GET /cuisines/<id>": lambda: f"/cuisines/{rng.choice(ids['cuisines'])}",
+        "GET /form": lambda: "/form",
+        "GET /health": lambda: "/health",
+        "GET /db/health": lambda: "/db/health",
+    }
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def drive(port: int, path_for, requests: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    lock = threading.Lock()
+    local = threading.local()
+
+    def one(_):
+        nonlocal errors
+        conn = getattr(local, "conn", None)
+        if conn is None:
+            conn = local.conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        path = path_for()
+        t0 = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            resp = conn.getresponse()
+            resp.read()
+            ok = resp.status < 400
+        except (OSError, http.client.HTTPException):
+            local.conn = None
+            ok = False
+        elapsed = (time.perf_counter() - t0) * 1000
+        with lock:
+            latencies.append(elapsed)
+            if not ok:
+                errors += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(requests)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "rps": round(requests / wall, 1),
+    }
+
+
+def relative(results: dict) -> dict:
+    """Each endpoint's p95 and req/s as a multiple of the REFERENCE endpoint's."""
+    ref = results[REFERENCE]
+    return {
+        name: {
+            "p95": round(r["p95_ms"] / ref["p95_ms"], 2) if ref["p95_ms"] else 0.0,
+            "rps": round(r["rps"] / ref["rps"], 4) if ref["rps"] else 0.0,
+        }
+        for name, r in results.items()
+        if name != REFERENCE
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Compare this run's relative numbers against a stored relative baseline."""
+    regressions = []
+    for name, current in relative(results).items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if current["p95"] > base["p95"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {current['p95']}x {REFERENCE} > baseline {base['p95']}x")
+        if current["rps"] < base["rps"] / (1 + tolerance):
+            regressions.append(f"{name}: req/s {current['rps']}x {REFERENCE} < baseline {base['rps']}x")
+    for name, current in results.items():
+        if current["errors"]:
+            regressions.append(f"{name}: {current['errors']} errors")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Kitchen API.")
+    parser.add_argument("--backend", choices=("mongomock", "mongod"), default="mongomock")
+    parser.add_argument("--recipes", type=int, default=2000)
+    parser.add_argument("--ingredients", type=int, default=300)
+    parser.add_argument("--cuisines", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=300, help="Requests per endpoint.")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--only", nargs="*",
+                        help="Endpoint names to run (default: all; GET /health always runs as the reference).")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Allowed slowdown as a fraction (0.5 = 50%%).")
+    parser.add_argument("--write-baseline", action="store_true")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    mongod = None
+    if args.backend == "mongod":
+        mongod, uri, dbpath = start_mongod()
+        os.environ["MONGO_URI"] = uri
+    os.environ.setdefault("MONGO_DB_NAME", "kitchen_bench")
+    os.environ.setdefault("AUTH_DEV_MODE", "1")  # no AUTH_SECRET needed for a local run
+    if args.backend == "mongomock":
+        from backend.benchmarks import mongomock_backend
+        mongomock_backend.install()
+
+    # Imported late: backend.app.db reads MONGO_URI at import time.
+    from werkzeug.serving import make_server
+
+    from backend.app.db import get_db
+    from backend.app.main import create_app
+
+    try:
+        rng = random.Random(args.seed)
+        ids = seed(get_db(), args.recipes, args.ingredients, args.cuisines, rng)
+        app = create_app()
+
+        port = _free_port()
+        server = make_server("127.0.0.1", port, app, threaded=True)
+        server.RequestHandlerClass.protocol_version = "HTTP/1.1"
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        results = {}
+        for name, path_for in endpoints(ids, rng).items():
+            if args.only and name not in args.only and name != REFERENCE:
+                continue
+            drive(port, path_for, min(20, args.requests), args.concurrency)  # warm-up
+            results[name] = drive(port, path_for, args.requests, args.concurrency)
+        server.shutdown()
+    finally:
+        if mongod is not None:
+            mongod.terminate()
+            mongod.wait()
+            shutil.rmtree(dbpath, ignore_errors=True)
+
+    report = {
+        "config": {
+            "backend": args.backend,
+            "recipes": args.recipes,
+            "ingredients": args.ingredients,
+            "cuisines": args.cuisines,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+        },
+        "results": results,
+        "relative": relative(results),
+    }
+
+    if args.write_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        report["baseline"] = f"written to {args.baseline}"
+        print(json.dumps(report, indent=2))
+        return
+
+    regressions = []
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline.get("config") != report["config"]:
+            report["baseline"] = "skipped: baseline was recorded with a different config"
+        else:
+            regressions = compare(results, baseline["relative"], args.tolerance)
+            report["regressions"] = regressions
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
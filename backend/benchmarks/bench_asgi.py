@@ -0,0 +1,271 @@
+"""
+Concurrency benchmark: Flask (fixed thread pool) vs the ASGI app.
+
+    python -m backend.benchmarks.bench_asgi --backend mongod --levels 8 64 256
+    python -m backend.benchmarks.bench_asgi --flask-threads 16 --mongo-latency-ms 5
+
+Each server runs in its own process with one worker: the Flask app on a
+WSGI server with --flask-threads handler threads (like a gthread worker),
+the ASGI app under uvicorn. An asyncio client opens --levels concurrent
+connections in turn and reports p50/p95/p99, req/s and errors per
+endpoint as JSON.
+
+The interesting case is a slow database: a thread-per-request worker tops
+out at threads / round-trip-time, an event loop does not. Use a remote
+mongod, or --mongo-latency-ms to add a delay in front of every command
+(applied to both servers through a TCP proxy).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from backend.benchmarks.bench_api import _free_port, percentile, seed, start_mongod
+
+ENDPOINTS = {
+    "GET /recipes": lambda ids, i: "/recipes?limit=20",
+    "GET /recipes/<id>": lambda ids, i: f"/recipes/{ids[i % len(ids)]}",
+    "GET /health": lambda ids, i: "/health",
+}
+
+
+# -----------------------
+# Server side (subprocesses)
+# -----------------------
+def serve(kind: str, port: int, threads: int):
+    if kind == "asgi":
+        import uvicorn
+        uvicorn.run("backend.app.asgi:app", host="127.0.0.1", port=port, log_level="warning")
+        return
+
+    import logging
+
+    from werkzeug.serving import BaseWSGIServer
+
+    from backend.app.main import create_app
+
+    class PooledWSGIServer(BaseWSGIServer):
+        """One connection per pool thread, like a gthread worker."""
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.pool = ThreadPoolExecutor(max_workers=threads)
+
+        def process_request(self, request, client_address):
+            self.pool.submit(self._handle, request, client_address)
+
+        def _handle(self, request, client_address):
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)  # no per-request lines
+    server = PooledWSGIServer("127.0.0.1", port, create_app())
+    server.request_queue_size = 1024
+    server.serve_forever()
+
+
+async def _pipe(reader, writer, delay: float):
+    try:
+        while data := await reader.read(65536):
+            if delay:
+                await asyncio.sleep(delay)
+            writer.write(data)
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+def proxy(listen_port: int, target: str, delay_ms: float):
+    """Forward TCP to mongod, delaying each server reply by delay_ms."""
+    host, port = target.rsplit(":", 1)
+
+    async def handle(client_reader, client_writer):
+        server_reader, server_writer = await asyncio.open_connection(host, int(port))
+        await asyncio.gather(
+            _pipe(client_reader, server_writer, 0),
+            _pipe(server_reader, client_writer, delay_ms / 1000),
+        )
+
+    async def main():
+        server = await asyncio.start_server(handle, "127.0.0.1", listen_port)
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(main())
+
+
+def _spawn(args: list[str], env: dict) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, "-m", "backend.benchmarks.bench_asgi", *args], env=env)
+
+
+def _wait_ready(port: int, path: str = "/health", timeout: float = 30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            status, _ = asyncio.run(_get(port, path, 2))
+            if status == 200:
+                return
+        except (OSError, asyncio.TimeoutError, ValueError):
+            pass
+        time.sleep(0.2)
+    sys.exit(f"server on port {port} did not become ready")
+
+
+# -----------------------
+# Client side
+# -----------------------
+async def _get(port: int, path: str, timeout: float) -> tuple[int, bytes]:
+    async def go():
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: bench\r\nConnection: close\r\n\r\n".encode())
+        await writer.drain()
+        raw = await reader.read()
+        writer.close()
+        head, _, body = raw.partition(b"\r\n\r\n")
+        return int(head.split(b" ", 2)[1]), body
+
+    return await asyncio.wait_for(go(), timeout)
+
+
+async def _drive(port: int, path_for, requests: int, concurrency: int, timeout: float) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            t0 = time.perf_counter()
+            try:
+                status, _ = await _get(port, path_for(i), timeout)
+                ok = status < 400
+            except (OSError, asyncio.TimeoutError, ValueError, IndexError):
+                ok = False
+            latencies.append((time.perf_counter() - t0) * 1000)
+            if not ok:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "rps": round(requests / wall, 1),
+    }
+
+
+def _recipe_ids(port: int) -> list[str]:
+    _, body = asyncio.run(_get(port, "/recipes?limit=200&fields=name", 30))
+    return [r["_id"] for r in json.loads(body)["recipes"]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Flask and ASGI under concurrency.")
+    parser.add_argument("--backend", choices=("mongomock", "mongod"), default="mongod")
+    parser.add_argument("--levels", type=int, nargs="+", default=[8, 32, 128, 256])
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per endpoint and level.")
+    parser.add_argument("--flask-threads", type=int, default=8)
+    parser.add_argument("--mongo-latency-ms", type=float, default=0.0)
+    parser.add_argument("--recipes", type=int, default=2000)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--serve", choices=("flask", "asgi"), help=argparse.SUPPRESS)
+    parser.add_argument("--proxy", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    os.environ.setdefault("AUTH_DEV_MODE", "1")  # no AUTH_SECRET needed for a local run
+    if args.serve:
+        if args.backend == "mongomock":
+            # Each process has its own in-memory store; seed it the same way.
+            from backend.benchmarks import mongomock_backend
+            mongomock_backend.install()
+            from backend.app.db import get_db
+            seed(get_db(), args.recipes, 300, 20, random.Random(args.seed))
+        return serve(args.serve, args.port, args.flask_threads)
+    if args.proxy:
+        return proxy(args.port, args.proxy, args.mongo_latency_ms)
+
+    env = dict(os.environ, MONGO_DB_NAME=os.environ.get("MONGO_DB_NAME", "kitchen_bench"))
+    children: list[subprocess.Popen] = []
+    mongod = None
+    try:
+        if args.backend == "mongod":
+            mongod, uri, dbpath = start_mongod()
+            env["MONGO_URI"] = uri
+            if args.mongo_latency_ms:
+                proxy_port = _free_port()
+                children.append(_spawn(
+                    ["--proxy", urlsplit(uri).netloc, "--port", str(proxy_port),
+                     "--mongo-latency-ms", str(args.mongo_latency_ms)], env,
+                ))
+                time.sleep(1)
+                env["MONGO_URI"] = f"mongodb://127.0.0.1:{proxy_port}/?directConnection=true"
+            os.environ.update(MONGO_URI=uri, MONGO_DB_NAME=env["MONGO_DB_NAME"])
+            from backend.app.db import get_db
+            seed(get_db(), args.recipes, 300, 20, random.Random(args.seed))
+
+        common = ["--backend", args.backend, "--recipes", str(args.recipes), "--seed", str(args.seed),
+                  "--flask-threads", str(args.flask_threads)]
+        ports = {}
+        for kind in ("flask", "asgi"):
+            ports[kind] = _free_port()
+            children.append(_spawn(["--serve", kind, "--port", str(ports[kind]), *common], env))
+        for port in ports.values():
+            _wait_ready(port)
+
+        results: dict = {}
+        for kind, port in ports.items():
+            ids = _recipe_ids(port)
+            results[kind] = {}
+            for level in args.levels:
+                results[kind][level] = {}
+                for name, endpoint in ENDPOINTS.items():
+                    path_for = lambda i, endpoint=endpoint: endpoint(ids, i)  # noqa: E731
+                    asyncio.run(_drive(port, path_for, min(50, args.requests), level, args.timeout))
+                    results[kind][level][name] = asyncio.run(
+                        _drive(port, path_for, args.requests, level, args.timeout)
+                    )
+    finally:
+        for child in children:
+            child.terminate()
+            child.wait()
+        if mongod is not None:
+            mongod.terminate()
+            mongod.wait()
+            shutil.rmtree(dbpath, ignore_errors=True)
+
+    print(json.dumps({
+        "config": {
+            "backend": args.backend,
+            "flask_threads": args.flask_threads,
+            "mongo_latency_ms": args.mongo_latency_ms,
+            "requests": args.requests,
+        },
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Compare BitsetScorer with a naive per-recipe Python set loop.
+
+    python -m backend.benchmarks.bench_bitset_scorer --recipes 10000 100000
+"""
+import argparse
+import random
+import time
+
+from backend.app.features.recipes.bitset_scorer import BitsetScorer
+
+
+def _synthetic_catalog(n_recipes: int, vocab_size: int, rng: random.Random):
+    vocab = [f"ingredient-{i}" for i in range(vocab_size)]
+    recipes = [rng.sample(vocab, rng.randint(4, 14)) for _ in range(n_recipes)]
+    return vocab, recipes
+
+
+def _naive_scores(recipe_sets: list[set], pantries: list[set]):
+    out = []
+    for pantry in pantries:
+        row = []
+        for recipe in recipe_sets:
+            matched = len(recipe & pantry)
+            row.append((matched / len(recipe), len(recipe) - matched))
+        out.append(row)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bit-packed pantry scoring.")
+    parser.add_argument("--recipes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--pantries", type=int, default=200)
+    parser.add_argument("--naive-pantries", type=int, default=20,
+                        help="Pantries to time the naive loop on (it is extrapolated).")
+    parser.add_argument("--vocab", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    for n_recipes in args.recipes:
+        vocab, recipes = _synthetic_catalog(n_recipes, args.vocab, rng)
+        pantries = [rng.sample(vocab, rng.randint(10, 40)) for _ in range(args.pantries)]
+
+        t0 = time.perf_counter()
+        scorer = BitsetScorer([str(i) for i in range(n_recipes)], recipes)
+        build_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        ratio, missing = scorer.score(pantries)
+        bitset_s = time.perf_counter() - t0
+
+        naive_n = min(args.naive_pantries, len(pantries))
+        recipe_sets = [set(r) for r in recipes]
+        pantry_sets = [set(p) for p in pantries[:naive_n]]
+        t0 = time.perf_counter()
+        naive = _naive_scores(recipe_sets, pantry_sets)
+        naive_s = (time.perf_counter() - t0) * len(pantries) / naive_n
+
+        # Spot check that both engines agree.
+        for p in range(naive_n):
+            for r in (0, n_recipes // 2, n_recipes - 1):
+                assert abs(naive[p][r][0] - ratio[p, r]) < 1e-6
+                assert naive[p][r][1] == missing[p, r]
+
+        print(
+            f"recipes={n_recipes:>7} pantries={len(pantries)} vocab={len(scorer.vocabulary)} "
+            f"build={build_s:.2f}s bitset={bitset_s:.2f}s naive~={naive_s:.2f}s "
+            f"speedup={naive_s / bitset_s:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Response encoding benchmark on large lists.
+
+    python -m backend.benchmarks.bench_json --items 10000
+
+Compares, per 10k-item list:
+  * the old ingredients path: flask-restx marshal() + stdlib json
+  * json_codec with the stdlib encoder and with orjson (if installed)
+  * GET /ingredients end to end, with the snapshot cold (load + encode on
+    every request) and warm (pre-encoded bytes)
+and prints median milliseconds per operation as JSON.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+
+def timed(fn, repeat: int) -> float:
+    fn()  # warm-up
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def make_ingredients(n: int) -> list[dict]:
+    return [
+        {"id": str(ObjectId()), "name": f"ingredient {i}", "category": "bench", "notes": None}
+        for i in range(n)
+    ]
+
+
+def make_recipes(n: int, rng: random.Random) -> list[dict]:
+    start = datetime(2024, 1, 1)
+    return [
+        {
+            "_id": ObjectId(),
+            "name": f"Recipe {i}",
+            "cuisine": f"Cuisine {rng.randrange(20)}",
+            "ingredients": [f"ingredient {rng.randrange(300)}" for _ in range(8)],
+            "steps": [f"step {s}" for s in range(5)],
+            "tags": ["quick", "dinner"],
+            "created_at": start + timedelta(minutes=i),
+        }
+        for i in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON response encoding.")
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    os.environ.setdefault("MONGO_DB_NAME", "kitchen_bench")
+    os.environ.setdefault("AUTH_DEV_MODE", "1")  # no AUTH_SECRET needed for a local run
+    from backend.benchmarks import mongomock_backend
+    mongomock_backend.install()
+
+    # Imported late: backend.app.db reads MONGO_DB_NAME at import time.
+    from flask_restx import marshal
+
+    from backend.app import json_codec
+    from backend.app.db import get_db
+    from backend.app.features.ingredients.routes import ingredient_model, ingredient_snapshot
+    from backend.app.main import create_app
+
+    rng = random.Random(args.seed)
+    ingredients = make_ingredients(args.items)
+    recipes = make_recipes(args.items, rng)
+
+    encoders = {"stdlib": json_codec.stdlib_dumps}
+    if json_codec.orjson is not None:
+        encoders["orjson"] = json_codec.orjson_dumps
+
+    results = {
+        "ingredients: restx marshal + json": timed(
+            lambda: json.dumps(marshal(ingredients, ingredient_model)).encode("utf-8"), args.repeat
+        ),
+    }
+    for name, dumps in encoders.items():
+        results[f"ingredients: {name}"] = timed(lambda: dumps(ingredients), args.repeat)
+    for name, dumps in encoders.items():
+        # Recipes carry ObjectId and datetime values, resolved by _default.
+        results[f"recipes: {name}"] = timed(lambda: dumps(recipes), args.repeat)
+
+    db = get_db()
+    db.ingredients.delete_many({})
+    db.ingredients.insert_many(
+        [{"name": i["name"], "category": i["category"], "notes": None} for i in ingredients]
+    )
+    client = create_app().test_client()
+
+    def cold():
+        ingredient_snapshot.invalidate()
+        client.get("/ingredients")
+
+    results["GET /ingredients: snapshot cold"] = timed(cold, args.repeat)
+    results["GET /ingredients: snapshot warm"] = timed(lambda: client.get("/ingredients"), args.repeat)
+
+    print(json.dumps({
+        "items": args.items,
+        "encoder": json_codec.ENCODER,
+        "median_ms": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Autocomplete latency of the in-process SearchIndex.
+
+    python -m backend.benchmarks.bench_search --entries 100000
+
+Two corpora: "uniform" labels draw every word evenly from a random
+vocabulary; "skewed" labels draw one or two words from a Zipf-weighted
+list of real cooking words, so "chicken" or "garlic" sit in thousands of
+entries, like a real catalog, plus some random filler.
+"""
+import argparse
+import random
+import string
+import time
+
+from backend.app.features.search.index import SearchIndex
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10)))
+
+
+def _typo(word: str, rng: random.Random) -> str:
+    i = rng.randrange(len(word))
+    return word[:i] + rng.choice(string.ascii_lowercase) + word[i + 1:]
+
+
+COMMON_WORDS = (
+    "chicken garlic tomato salad soup rice beef onion pasta cheese egg butter lemon pork "
+    "potato curry spicy roasted fried grilled sauce bread mushroom pepper ginger honey "
+    "spinach beans chocolate cake noodles shrimp salmon coconut lime basil"
+).split()
+
+
+def _corpus(kind: str, entries: int, vocab: list[str], rng: random.Random):
+    weights = [1 / (rank + 1) for rank in range(len(COMMON_WORDS))]
+    for _ in range(entries):
+        if kind == "uniform":
+            yield " ".join(rng.sample(vocab, rng.randint(1, 4)))
+        else:
+            words = rng.choices(COMMON_WORDS, weights, k=rng.randint(1, 2))
+            yield " ".join(words + rng.sample(vocab, rng.randint(0, 2)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark search autocomplete.")
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--vocab", type=int, default=30_000)
+    parser.add_argument("--queries", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocab = [_word(rng) for _ in range(args.vocab)]
+    kinds = ("recipe", "ingredient", "cuisine")
+    workloads = {
+        "uniform": {
+            "prefix": lambda: rng.choice(vocab)[:rng.randint(2, 5)],
+            "two-word": lambda: f"{rng.choice(vocab)} {rng.choice(vocab)[:3]}",
+            "typo": lambda: _typo(rng.choice(vocab)[:6], rng),
+        },
+        "skewed": {
+            "common": lambda: rng.choice(COMMON_WORDS[:5]),
+            "prefix": lambda: rng.choice(COMMON_WORDS)[:rng.randint(2, 4)],
+            "two-word": lambda: f"{rng.choice(COMMON_WORDS[:5])} {rng.choice(COMMON_WORDS)[:3]}",
+            "typo": lambda: _typo(rng.choice(COMMON_WORDS[:10]), rng),
+        },
+    }
+
+    for corpus, queries_for in workloads.items():
+        index = SearchIndex()
+        t0 = time.perf_counter()
+        for i, label in enumerate(_corpus(corpus, args.entries, vocab, rng)):
+            index.put(kinds[i % 3], str(i), label)
+        build_s = time.perf_counter() - t0
+        print(f"[{corpus}] entries={len(index)} build={build_s:.2f}s")
+
+        for name, make in queries_for.items():
+            queries = [make() for _ in range(args.queries)]
+            timings = []
+            for q in queries:
+                t0 = time.perf_counter()
+                index.search(q, limit=10)
+                timings.append((time.perf_counter() - t0) * 1000)
+            timings.sort()
+            print(
+                f"{name:>9}: mean={sum(timings) / len(timings):.3f}ms "
+                f"p50={timings[len(timings) // 2]:.3f}ms p99={timings[int(len(timings) * 0.99)]:.3f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
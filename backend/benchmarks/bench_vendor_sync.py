@@ -0,0 +1,123 @@
+"""
+Vendor catalog sync throughput.
+
+    python -m backend.benchmarks.bench_vendor_sync --skus 100000 --backend mongod
+    python -m backend.benchmarks.bench_vendor_sync --skus 2000 --backend mongomock
+
+Starts the fake vendor (backend.scripts.fake_vendor) in its own process and
+runs three syncs of the same vendor:
+  initial    empty vendor_products, every SKU is written
+  unchanged  same catalog again, nothing should be written
+  changed    a new catalog version re-prices ~--change-rate of the SKUs
+and prints seconds, items/s, HTTP requests and DB writes per phase as JSON.
+mongomock scans the whole collection per upsert, so keep --skus small there.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+from bson import ObjectId
+
+from backend.benchmarks.bench_api import _free_port, start_mongod
+
+
+def start_vendor(skus: int, version: int, change_rate: float, fail_rate: float) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "backend.scripts.fake_vendor", "--skus", str(skus), "--version", str(version),
+         "--change-rate", str(change_rate), "--fail-rate", str(fail_rate), "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+
+    from backend.app.utils.http_client import PooledHTTPClient
+    client = PooledHTTPClient(url, max_retries=50, backoff=0.05, max_backoff=0.2)
+    client.get("/catalog", {"page_size": 1})  # retried until the server is up
+    client.close()
+    return proc, url
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the vendor catalog sync.")
+    parser.add_argument("--backend", choices=("mongomock", "mongod"), default="mongod")
+    parser.add_argument("--skus", type=int, default=100_000)
+    parser.add_argument("--change-rate", type=float, default=0.01)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    mongod = None
+    if args.backend == "mongod":
+        mongod, uri, dbpath = start_mongod()
+        os.environ["MONGO_URI"] = uri
+    os.environ.setdefault("MONGO_DB_NAME", "kitchen_bench")
+    if args.backend == "mongomock":
+        from backend.benchmarks import mongomock_backend
+        mongomock_backend.install()
+
+    # Imported late: backend.app.db reads MONGO_URI at import time.
+    from backend.app.db import get_db
+    from backend.app.indexes import ensure_indexes
+    from backend.app.utils.http_client import PooledHTTPClient
+    from backend.scripts.sync_vendor_products import sync_vendor
+
+    results = {}
+    vendor = None
+    try:
+        db = get_db()
+        db.vendor_products.delete_many({})
+        ensure_indexes(db)
+        vendor_id = ObjectId()
+
+        for phase, version in (("initial", 0), ("unchanged", 0), ("changed", 1)):
+            if vendor is None or phase == "changed":
+                if vendor is not None:
+                    vendor.terminate()
+                    vendor.wait()
+                vendor, url = start_vendor(args.skus, version, args.change_rate, args.fail_rate)
+            client = PooledHTTPClient(url, pool_size=args.concurrency)
+            started = time.perf_counter()
+            totals = sync_vendor(db, vendor_id, client, page_size=args.page_size,
+                                 concurrency=args.concurrency, batch_size=args.batch_size)
+            client.close()
+            results[phase] = {
+                "seconds": round(time.perf_counter() - started, 3),
+                "items_per_second": totals["items_per_second"],
+                "http_requests": totals["http_requests"],
+                "http_retries": totals["http_retries"],
+                "writes": totals["upserted"] + totals["modified"] + totals["removed"],
+                "unchanged": totals["unchanged"],
+                "failed": totals["failed"] + totals["failed_pages"],
+            }
+    finally:
+        if vendor is not None:
+            vendor.terminate()
+            vendor.wait()
+        if mongod is not None:
+            mongod.terminate()
+            mongod.wait()
+            shutil.rmtree(dbpath, ignore_errors=True)
+
+    print(json.dumps({
+        "config": {
+            "backend": args.backend,
+            "skus": args.skus,
+            "change_rate": args.change_rate,
+            "fail_rate": args.fail_rate,
+            "page_size": args.page_size,
+            "concurrency": args.concurrency,
+        },
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+"""
+In-memory stand-in database for benchmark runs without mongod.
+
+mongomock and mongomock-motor are dev-only requirements, so the app's
+client factories know nothing about them; a benchmark calls install()
+before create_app() or importing backend.app.asgi.
+"""
+from __future__ import annotations
+
+
+def install():
+    """Point backend.app.db's sync and async client factories at mongomock."""
+    import mongomock
+    from mongomock_motor import AsyncMongoMockClient
+
+    from backend.app import db
+
+    db._make_client = mongomock.MongoClient
+    # Wrap the sync client so both see the same in-memory data.
+    db.make_async_client = lambda: AsyncMongoMockClient(mock_mongo_client=db.get_client())
@@ -0,0 +1,74 @@
+"""
+Create the first admin (or promote an existing account).
+
+    python -m backend.scripts.create_admin admin@example.com
+    python -m backend.scripts.create_admin editor@example.com --role content_manager
+
+/auth/register only creates regular users and role changes need an admin
+token, so a fresh deployment starts here. The password is prompted for,
+or read from ADMIN_PASSWORD when set (for provisioning scripts). An
+existing account keeps its password, is reactivated and gets the role;
+its earlier tokens are revoked.
+"""
+from __future__ import annotations
+
+import argparse
+import getpass
+import os
+import sys
+from datetime import datetime, timezone
+
+from pymongo.database import Database
+from pymongo.errors import DuplicateKeyError
+
+from backend.app.db import get_db
+from backend.app.features.auth.routes import MAX_PASSWORD_LENGTH, MIN_PASSWORD_LENGTH, new_user
+from backend.app.security import ROLES, revocations
+from backend.app.utils.email_address import EmailAddress
+
+
+def create_admin(db: Database, email: str, password: str | None, role: str = "admin") -> tuple[dict, bool]:
+    """Give email's account the role, creating it if needed. Returns (user, created)."""
+    if role not in ROLES:
+        raise ValueError(f"Unknown role: {role}")
+    email = EmailAddress(email).value
+    existing = db.users.find_one({"email": email}, {"_id": 1})
+    if existing is None:
+        if password is None or not MIN_PASSWORD_LENGTH <= len(password) <= MAX_PASSWORD_LENGTH:
+            raise ValueError(f"Password must be {MIN_PASSWORD_LENGTH}-{MAX_PASSWORD_LENGTH} characters.")
+        user = new_user(email, password, role)
+        try:
+            user["_id"] = db.users.insert_one(user).inserted_id
+            return user, True
+        except DuplicateKeyError:
+            pass  # registered in between; promote it below
+
+    db.users.update_one(
+        {"email": email},
+        {"$set": {"role": role, "status": "active", "updated_at": datetime.now(timezone.utc)}},
+    )
+    user = db.users.find_one({"email": email}, {"password_hash": 0})
+    revocations.revoke_user(str(user["_id"]))
+    return user, False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create or promote an admin account.")
+    parser.add_argument("email")
+    parser.add_argument("--role", choices=ROLES, default="admin")
+    args = parser.parse_args()
+
+    db = get_db()
+    try:
+        email = EmailAddress(args.email).value
+        password = os.getenv("ADMIN_PASSWORD")
+        if password is None and db.users.find_one({"email": email}, {"_id": 1}) is None:
+            password = getpass.getpass("Password: ")
+        user, created = create_admin(db, email, password, args.role)
+    except ValueError as e:
+        sys.exit(str(e))
+    print(f"{'created' if created else 'updated'} {user['email']} ({user['role']})")
+
+
+if __name__ == "__main__":
+    main()
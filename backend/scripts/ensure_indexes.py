@@ -0,0 +1,23 @@
+"""
+Apply the index manifest to the configured database.
+
+    python -m backend.scripts.ensure_indexes
+"""
+import sys
+
+from backend.app.db import get_db
+from backend.app.indexes import ensure_indexes
+
+
+def main():
+    db = get_db()
+    result = ensure_indexes(db)
+    for name in result["created"]:
+        print(f"ok      {db.name}.{name}")
+    for name, error in result["failed"].items():
+        print(f"FAILED  {db.name}.{name}: {error}")
+    sys.exit(1 if result["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Local stand-in for a vendor catalog API, for tests and benchmarks.
+
+    python -m backend.scripts.fake_vendor --skus 100000 --port 8081
+
+Serves a deterministic catalog of --skus items:
+
+    GET /catalog?page=1&page_size=1000
+    -> {"items": [...], "page": 1, "pages": 100, "total": 100000}
+
+    POST /orders {"orders": [{"order_id": "...", "items": [{"sku": ..., "quantity": n}]}]}
+    -> {"references": {"<order_id>": "FV-..."}, "rejected": {"<order_id>": "reason"}}
+
+Each --version changes the price of about --change-rate of the items,
+--fail-rate makes that share of requests answer 503 (to exercise retries)
+and --latency delays every response. Orders are idempotent on order_id.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+NAMES = ["tomato", "egg", "garlic", "onion", "rice", "flour", "butter", "milk", "salt", "basil"]
+MAX_PAGE_SIZE = 5000
+
+
+class FakeVendor:
+    def __init__(self, skus: int = 1000, version: int = 0, change_rate: float = 0.01,
+                 fail_rate: float = 0.0, seed: int = 7, latency: float = 0.0):
+        self.skus = skus
+        self.version = version
+        self.change_rate = change_rate
+        self.fail_rate = fail_rate
+        self.seed = seed
+        self.latency = latency
+        self.removed: set[int] = set()
+        self.requests = 0
+        self.orders: dict[str, dict] = {}
+        self.order_batches = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+
+    def item(self, i: int) -> dict:
+        # Stable per SKU; a version bump moves the price of ~change_rate of them.
+        changed = zlib.crc32(f"{self.seed}:{i}".encode()) % 10_000 < self.change_rate * 10_000
+        bump = self.version if changed else 0
+        return {
+            "sku": f"SKU-{i:07d}",
+            "name": NAMES[i % len(NAMES)],
+            "display_name": f"{NAMES[i % len(NAMES)].title()} #{i}",
+            "price": round(1 + (i % 500) / 100 + bump * 0.25, 2),
+            "currency": "USD",
+            "unit": "each",
+        }
+
+    def page(self, page: int, page_size: int) -> dict:
+        ids = [i for i in range(self.skus) if i not in self.removed] if self.removed else range(self.skus)
+        pages = max(1, -(-len(ids) // page_size))
+        start = (page - 1) * page_size
+        return {
+            "items": [self.item(i) for i in ids[start:start + page_size]],
+            "page": page,
+            "pages": pages,
+            "total": len(ids),
+        }
+
+    def place_orders(self, orders: list) -> dict:
+        references, rejected = {}, {}
+        with self._lock:
+            self.order_batches += 1
+            for order in orders:
+                order_id = order.get("order_id") if isinstance(order, dict) else None
+                items = order.get("items") if isinstance(order, dict) else None
+                if not isinstance(order_id, str) or not items:
+                    rejected[str(order_id)] = "order needs an order_id and items"
+                    continue
+                # Re-sent orders (a retried batch) keep their first reference.
+                if order_id not in self.orders:
+                    ref = "FV-" + hashlib.blake2b(order_id.encode(), digest_size=6).hexdigest()
+                    self.orders[order_id] = {"reference": ref, "items": items}
+                references[order_id] = self.orders[order_id]["reference"]
+        return {"references": references, "rejected": rejected}
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            return self.fail_rate > 0 and self._rng.random() < self.fail_rate
+
+    def handler(self):
+        vendor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, headers: dict | None = None):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                if url.path != "/catalog":
+                    return self._send(404, b'{"error": "not found"}')
+                time.sleep(vendor.latency)
+                if vendor._should_fail():
+                    return self._send(503, b'{"error": "try again"}', {"Retry-After": "0"})
+                query = parse_qs(url.query)
+                try:
+                    page = int(query.get("page", ["1"])[0])
+                    page_size = min(int(query.get("page_size", ["1000"])[0]), MAX_PAGE_SIZE)
+                except ValueError:
+                    return self._send(400, b'{"error": "bad paging"}')
+                self._send(200, json.dumps(vendor.page(page, page_size)).encode("utf-8"))
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if urlsplit(self.path).path != "/orders":
+                    return self._send(404, b'{"error": "not found"}')
+                time.sleep(vendor.latency)
+                if vendor._should_fail():
+                    return self._send(503, b'{"error": "try again"}', {"Retry-After": "0"})
+                try:
+                    orders = json.loads(body)["orders"]
+                    if not isinstance(orders, list):
+                        raise TypeError
+                except (ValueError, KeyError, TypeError):
+                    return self._send(400, b'{"error": "bad order batch"}')
+                self._send(200, json.dumps(vendor.place_orders(orders)).encode("utf-8"))
+
+        return Handler
+
+    def start(self, port: int = 0) -> str:
+        """Serve in a background thread; returns the base URL."""
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self.handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a fake vendor catalog.")
+    parser.add_argument("--skus", type=int, default=100_000)
+    parser.add_argument("--version", type=int, default=0)
+    parser.add_argument("--change-rate", type=float, default=0.01)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response.")
+    parser.add_argument("--port", type=int, default=8081)
+    args = parser.parse_args()
+
+    vendor = FakeVendor(args.skus, args.version, args.change_rate, args.fail_rate, latency=args.latency)
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), vendor.handler())
+    print(f"Fake vendor with {args.skus} SKUs on http://127.0.0.1:{args.port}/catalog", flush=True)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Forward queued orders to vendor APIs.
+
+    python -m backend.scripts.forward_orders              # run until interrupted
+    python -m backend.scripts.forward_orders --once       # drain what is due, then exit
+
+Orders are created by POST /orders with status queued; this worker pool
+leases them in per-vendor batches, POSTs each batch to the vendor's
+/orders endpoint and records forwarded/failed, retrying with backoff.
+Any number of these processes can run against the same database.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import signal
+import threading
+
+from backend.app.db import get_db
+from backend.app.features.orders.forwarder import ORDER_BATCH_SIZE, ORDER_LEASE_SECONDS, OrderForwarder
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Forward queued orders to vendors.")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=ORDER_BATCH_SIZE)
+    parser.add_argument("--lease", type=float, default=ORDER_LEASE_SECONDS,
+                        help="Seconds before an unfinished batch can be claimed again.")
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--once", action="store_true", help="Drain due orders and exit.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    forwarder = OrderForwarder(get_db(), workers=args.workers, batch_size=args.batch_size,
+                               lease=args.lease, poll_interval=args.poll_interval)
+    try:
+        if args.once:
+            forwarder.drain()
+        else:
+            stop = threading.Event()
+            signal.signal(signal.SIGTERM, lambda *_: stop.set())
+            signal.signal(signal.SIGINT, lambda *_: stop.set())
+            forwarder.run(stop)
+    finally:
+        forwarder.close()
+    print(" ".join(f"{k}={v}" for k, v in forwarder.stats.items()))
+
+
+if __name__ == "__main__":
+    main()
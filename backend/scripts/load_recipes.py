@@ -1,5 +1,37 @@
+"""
+Stream a recipe dump (JSONL or CSV) into MongoDB.
+
+    python -m backend.scripts.load_recipes dump.jsonl --batch-size 1000 --workers 4
+
+Records are read lazily, written in upsert batches on a natural key (so a
+re-run is idempotent) and progress is checkpointed next to the input file
+so an interrupted load resumes where it stopped. Without a path the three
+sample recipes are loaded.
+
+The natural key is the recipe name, or name plus cuisine (--key
+name+cuisine) for dumps where one name appears under several cuisines.
+Recipe names are not unique in the collection (the API allows repeats),
+so no index backs the key; instead a key repeated within one dump keeps
+its first record and the rest are counted as duplicates. Otherwise two
+batches upserting the same new key at once could both insert it.
+"""
+from __future__ import annotations
+
 import argparse
+import csv
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterable, Iterator
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
 from backend.app.db import get_db
+from backend.app.features.recipes.routes import _build_recipe
+from backend.app.utils.bulk import chunked
 
 SAMPLE_RECIPES = [
     {
@@ -22,8 +54,172 @@ SAMPLE_RECIPES = [
     },
 ]
 
+# CSV cells holding lists use this separator: "tomato|egg|salt".
+CSV_LIST_FIELDS = ("ingredients", "steps", "tags")
+CSV_LIST_SEP = "|"
+
+# Natural key -> the fields it matches on. They must survive
+# _build_recipe, which drops every other field.
+KEYS = {"name": ("name",), "name+cuisine": ("name", "cuisine")}
+DUPLICATE = "duplicate"
+
+
+def read_jsonl(path: str) -> Iterator[dict | None]:
+    """Yield one record per line; a malformed line yields None (counted as invalid)."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    yield None
+
+
+def read_csv(path: str) -> Iterator[dict]:
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            for field in CSV_LIST_FIELDS:
+                cell = row.get(field)
+                if cell is not None:
+                    row[field] = [x.strip() for x in cell.split(CSV_LIST_SEP) if x.strip()]
+            yield row
+
+
+def read_records(path: str, fmt: str | None = None) -> Iterator[dict]:
+    fmt = fmt or ("csv" if path.lower().endswith(".csv") else "jsonl")
+    return read_csv(path) if fmt == "csv" else read_jsonl(path)
+
+
+class Checkpoint:
+    """
+    Number of input records that are safely written.
+    Batches finish out of order, so only the contiguous prefix counts.
+    """
+
+    def __init__(self, path: str | None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._done: dict[int, int] = {}
+        self.position = self._read()
+
+    def _read(self) -> int:
+        if not self.path or not os.path.exists(self.path):
+            return 0
+        with open(self.path, encoding="utf-8") as f:
+            return int(json.load(f).get("records", 0))
+
+    def mark(self, start: int, stop: int):
+        with self._lock:
+            self._done[start] = stop
+            advanced = False
+            while self.position in self._done:
+                self.position = self._done.pop(self.position)
+                advanced = True
+            if advanced:
+                self._write()
+
+    def _write(self):
+        if not self.path:
+            return
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"records": self.position}, f)
+        os.replace(tmp, self.path)
+
+    def clear(self):
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def write_batch(collection, docs: list[dict], fields: tuple) -> dict:
+    ops = [UpdateOne({f: d.get(f) for f in fields}, {"$set": d}, upsert=True) for d in docs]
+    try:
+        res = collection.bulk_write(ops, ordered=False)
+        return {"upserted": res.upserted_count, "modified": res.modified_count, "failed": 0}
+    except BulkWriteError as e:
+        details = e.details
+        return {
+            "upserted": details.get("nUpserted", 0),
+            "modified": details.get("nModified", 0),
+            "failed": len(details.get("writeErrors", [])),
+        }
+
+
+def load(records: Iterable[dict], collection, key: str = "name", batch_size: int = 1000,
+         workers: int = 4, checkpoint: Checkpoint | None = None) -> dict:
+    """
+    Upsert records in batches through a small thread pool. At most
+    2 * workers batches are in memory at any time. A batch with write
+    errors is not checkpointed, so a resume starts again at or before it.
+    """
+    if key not in KEYS:
+        raise ValueError(f"key must be one of: {', '.join(KEYS)}")
+    fields = KEYS[key]
+    checkpoint = checkpoint or Checkpoint(None)
+    skip = checkpoint.position
+    totals = {"read": 0, "skipped": skip, "invalid": 0, "duplicates": 0,
+              "upserted": 0, "modified": 0, "failed": 0}
+    seen: set[tuple] = set()
+
+    def build(record) -> dict | str | None:
+        # Runs on the reading thread, so claiming keys needs no lock.
+        try:
+            doc = _build_recipe(record) if isinstance(record, dict) else None
+        except ValueError:
+            return None
+        if doc is None or not doc.get("name"):
+            return None
+        natural = tuple(doc.get(f) for f in fields)
+        if natural in seen:
+            return DUPLICATE
+        seen.add(natural)
+        return doc
+
+    def numbered():
+        for position, record in enumerate(records):
+            if position < skip:
+                continue
+            totals["read"] += 1
+            yield position, build(record)
+
+    def run(batch):
+        docs = [doc for _, doc in batch if isinstance(doc, dict)]
+        counts = write_batch(collection, docs, fields) if docs else {"upserted": 0, "modified": 0, "failed": 0}
+        counts["duplicates"] = sum(doc == DUPLICATE for _, doc in batch)
+        counts["invalid"] = len(batch) - len(docs) - counts["duplicates"]
+        if not counts["failed"]:
+            checkpoint.mark(batch[0][0], batch[-1][0] + 1)
+        return counts
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for batch in chunked(numbered(), batch_size):
+            pending.add(pool.submit(run, batch))
+            if len(pending) >= 2 * workers:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for f in finished:
+                    for k, v in f.result().items():
+                        totals[k] += v
+        for f in pending:
+            for k, v in f.result().items():
+                totals[k] += v
+
+    elapsed = time.perf_counter() - started
+    totals["seconds"] = round(elapsed, 3)
+    totals["docs_per_second"] = round(totals["read"] / elapsed, 1) if elapsed > 0 else 0.0
+    return totals
+
+
 def main():
-    parser = argparse.ArgumentParser(description="Load sample recipes into MongoDB.")
+    parser = argparse.ArgumentParser(description="Load recipes into MongoDB.")
+    parser.add_argument("path", nargs="?", help="JSONL or CSV dump. Omit to load the sample recipes.")
+    parser.add_argument("--format", choices=("jsonl", "csv"), help="Override format detection.")
+    parser.add_argument("--key", default="name", choices=tuple(KEYS), help="Natural key to upsert on.")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <path>.checkpoint).")
+    parser.add_argument("--restart", action="store_true", help="Ignore any existing checkpoint.")
     parser.add_argument("--wipe", action="store_true", help="Delete all existing recipes before loading.")
     args = parser.parse_args()
 
@@ -33,8 +229,30 @@ def main():
         deleted = db.recipes.delete_many({}).deleted_count
         print(f"Wiped recipes collection: deleted {deleted} docs")
 
-    result = db.recipes.insert_many(SAMPLE_RECIPES)
-    print(f"Inserted {len(result.inserted_ids)} recipes into db '{db.name}', collection 'recipes'")
+    if args.path:
+        records = read_records(args.path, args.format)
+        checkpoint = Checkpoint(args.checkpoint or f"{args.path}.checkpoint")
+    else:
+        records = iter(SAMPLE_RECIPES)
+        checkpoint = Checkpoint(args.checkpoint)
+    if args.restart or args.wipe:
+        checkpoint.clear()
+        checkpoint.position = 0
+
+    if checkpoint.position:
+        print(f"Resuming after {checkpoint.position} records")
+
+    totals = load(records, db.recipes, key=args.key, batch_size=args.batch_size,
+                  workers=args.workers, checkpoint=checkpoint)
+    print(
+        f"Loaded into db '{db.name}', collection 'recipes': "
+        f"read={totals['read']} upserted={totals['upserted']} modified={totals['modified']} "
+        f"invalid={totals['invalid']} duplicates={totals['duplicates']} failed={totals['failed']} "
+        f"in {totals['seconds']}s ({totals['docs_per_second']} docs/s)"
+    )
+    if totals["failed"] == 0:
+        checkpoint.clear()
+
 
 if __name__ == "__main__":
     main()
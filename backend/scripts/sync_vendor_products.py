@@ -0,0 +1,199 @@
+"""
+Sync vendor catalogs into vendor_products.
+
+    python -m backend.scripts.sync_vendor_products                 # every api_enabled vendor
+    python -m backend.scripts.sync_vendor_products --vendor Weee --url http://127.0.0.1:8081
+
+Catalog pages are fetched concurrently through a pooled HTTP client with
+retries. Each item is hashed and compared with the hash stored on its
+vendor_products row, so only new or changed SKUs are written (bulk_write
+upserts); SKUs that disappeared from the catalog are marked unavailable.
+An unchanged catalog costs one read of the stored hashes and no writes.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from backend.app.db import get_db
+from backend.app.features.recipes.ingredient_index import normalize_ingredient
+from backend.app.utils.bulk import chunked
+from backend.app.utils.http_client import PooledHTTPClient
+
+CATALOG_PATH = "/catalog"
+
+
+def content_hash(product: dict) -> str:
+    body = json.dumps(product, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(body.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def to_product(vendor_id, item: dict, ingredient_ids: dict) -> dict:
+    """Map one catalog item to the vendor_products fields we hash and store."""
+    sku = item.get("sku")
+    if not isinstance(sku, str) or not sku:
+        raise ValueError("item has no sku")
+    return {
+        "vendor_id": vendor_id,
+        "vendor_sku": sku,
+        "ingredient_id": ingredient_ids.get(normalize_ingredient(item.get("name"))),
+        "display_name": item.get("display_name") or item.get("name") or sku,
+        "price_snapshot": {
+            "amount": item.get("price"),
+            "currency": item.get("currency"),
+            "unit": item.get("unit"),
+        },
+    }
+
+
+def write_changes(collection, ops: list) -> dict:
+    if not ops:
+        return {"upserted": 0, "modified": 0, "failed": 0}
+    try:
+        res = collection.bulk_write(ops, ordered=False)
+        return {"upserted": res.upserted_count, "modified": res.modified_count, "failed": 0}
+    except BulkWriteError as e:
+        details = e.details
+        return {
+            "upserted": details.get("nUpserted", 0),
+            "modified": details.get("nModified", 0),
+            "failed": len(details.get("writeErrors", [])),
+        }
+
+
+def sync_vendor(db, vendor_id, client: PooledHTTPClient, page_size: int = 1000,
+                concurrency: int = 8, batch_size: int = 1000) -> dict:
+    """
+    Pull one vendor's catalog and apply the differences. Returns counters.
+    Removals are only applied when every page was fetched.
+    """
+    started = time.perf_counter()
+    now = datetime.now(timezone.utc)
+    products = db.vendor_products
+    totals = {"pages": 0, "items": 0, "unchanged": 0, "invalid": 0, "upserted": 0,
+              "modified": 0, "failed": 0, "removed": 0, "failed_pages": 0}
+
+    stored = {
+        doc["vendor_sku"]: (doc.get("content_hash"), doc.get("available", True))
+        for doc in products.find({"vendor_id": vendor_id},
+                                 {"_id": 0, "vendor_sku": 1, "content_hash": 1, "available": 1})
+    }
+    ingredient_ids = {
+        normalize_ingredient(doc.get("name")): doc["_id"]
+        for doc in db.ingredients.find({}, {"name": 1})
+    }
+    seen: set[str] = set()
+    ops: list = []
+
+    def flush():
+        for k, v in write_changes(products, ops).items():
+            totals[k] += v
+        ops.clear()
+
+    def apply_page(page: dict):
+        totals["pages"] += 1
+        for item in page.get("items") or []:
+            totals["items"] += 1
+            try:
+                product = to_product(vendor_id, item, ingredient_ids)
+            except ValueError:
+                totals["invalid"] += 1
+                continue
+            sku = product["vendor_sku"]
+            seen.add(sku)
+            digest = content_hash(product)
+            if stored.get(sku) == (digest, True):
+                totals["unchanged"] += 1
+                continue
+            ops.append(UpdateOne(
+                {"vendor_id": vendor_id, "vendor_sku": sku},
+                {"$set": {**product, "content_hash": digest, "available": True, "last_synced_at": now}},
+                upsert=True,
+            ))
+            if len(ops) >= batch_size:
+                flush()
+
+    def fetch(number: int) -> dict:
+        return client.get(CATALOG_PATH, {"page": number, "page_size": page_size})
+
+    first = fetch(1)
+    apply_page(first)
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        pending = set()
+        for number in range(2, int(first.get("pages") or 1) + 1):
+            pending.add(pool.submit(fetch, number))
+            if len(pending) >= 2 * concurrency:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for f in finished:
+                    _apply_result(f, apply_page, totals)
+        for f in pending:
+            _apply_result(f, apply_page, totals)
+    flush()
+
+    if totals["failed_pages"] == 0:
+        gone = [sku for sku, (_, available) in stored.items() if available and sku not in seen]
+        for batch in chunked(gone, batch_size):
+            res = products.update_many(
+                {"vendor_id": vendor_id, "vendor_sku": {"$in": batch}},
+                {"$set": {"available": False, "last_synced_at": now}},
+            )
+            totals["removed"] += res.modified_count
+
+    elapsed = time.perf_counter() - started
+    totals["http_requests"] = client.requests
+    totals["http_retries"] = client.retries
+    totals["seconds"] = round(elapsed, 3)
+    totals["items_per_second"] = round(totals["items"] / elapsed, 1) if elapsed > 0 else 0.0
+    db.vendors.update_one({"_id": vendor_id}, {"$set": {"last_synced_at": now, "last_sync": totals}})
+    return totals
+
+
+def _apply_result(future, apply_page, totals: dict):
+    try:
+        page = future.result()
+    except Exception:
+        totals["failed_pages"] += 1
+        return
+    apply_page(page)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync vendor catalogs into vendor_products.")
+    parser.add_argument("--vendor", help="Vendor name (created if --url is given and it does not exist).")
+    parser.add_argument("--url", help="Catalog base URL; stored on the vendor as catalog_url.")
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    db = get_db()
+    if args.vendor and args.url:
+        db.vendors.update_one(
+            {"name": args.vendor},
+            {"$set": {"catalog_url": args.url, "api_enabled": True},
+             "$setOnInsert": {"type": "api", "created_at": datetime.now(timezone.utc)}},
+            upsert=True,
+        )
+    query = {"api_enabled": True, "catalog_url": {"$exists": True}}
+    if args.vendor:
+        query["name"] = args.vendor
+
+    for vendor in db.vendors.find(query):
+        client = PooledHTTPClient(vendor["catalog_url"], pool_size=args.concurrency)
+        try:
+            totals = sync_vendor(db, vendor["_id"], client, page_size=args.page_size,
+                                 concurrency=args.concurrency, batch_size=args.batch_size)
+        finally:
+            client.close()
+        print(f"{vendor['name']}: " + " ".join(f"{k}={v}" for k, v in totals.items()))
+
+
+if __name__ == "__main__":
+    main()
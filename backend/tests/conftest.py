@@ -1,3 +1,4 @@
+import os
 import sys
 from pathlib import Path
 import pytest
@@ -5,7 +6,13 @@ import pytest
 ROOT = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(ROOT))
 
-from backend.app.main import create_app
+# Read at import time by backend.app.security. Content routes are tested
+# without tokens; test_auth turns AUTH_REQUIRED back on for the role checks.
+os.environ.setdefault("AUTH_SECRET", "test-secret")
+os.environ.setdefault("AUTH_REQUIRED", "0")
+
+from backend.app.main import create_app  # noqa: E402
+from backend.app.security import issue_token  # noqa: E402
 
 
 @pytest.fixture
@@ -18,3 +25,116 @@ def app():
 @pytest.fixture
 def client(app):
     return app.test_client()
+
+
+@pytest.fixture
+def login_as():
+    """Make a test client send a token for user_id with every request."""
+    def login(client, user_id: str, role: str = "user"):
+        client.environ_base["HTTP_AUTHORIZATION"] = f"Bearer {issue_token(user_id, role)}"
+        return client
+
+    return login
+
+
+# Collection methods that cost one server round trip each.
+ROUND_TRIP_METHODS = {
+    "find", "find_one", "find_one_and_update", "find_one_and_delete",
+    "insert_one", "insert_many", "update_one", "update_many",
+    "delete_one", "delete_many", "replace_one", "bulk_write",
+    "aggregate", "count_documents", "distinct",
+}
+
+
+class CountingCollection:
+    def __init__(self, collection, calls: list):
+        self._collection = collection
+        self._calls = calls
+
+    def __getattr__(self, name):
+        attr = getattr(self._collection, name)
+        if name not in ROUND_TRIP_METHODS:
+            return attr
+
+        def counted(*args, **kwargs):
+            self._calls.append(f"{self._collection.name}.{name}")
+            return attr(*args, **kwargs)
+
+        return counted
+
+
+class CountingDatabase:
+    """Wraps the real Database and records every round-trip collection call."""
+
+    def __init__(self, db):
+        self._db = db
+        self.calls: list[str] = []
+
+    def __getattr__(self, name):
+        attr = getattr(self._db, name)
+        if hasattr(attr, "insert_one"):  # a Collection
+            return CountingCollection(attr, self.calls)
+        return attr
+
+    def __getitem__(self, name):
+        return CountingCollection(self._db[name], self.calls)
+
+    def reset(self):
+        self.calls.clear()
+
+
+@pytest.fixture
+def db_calls(monkeypatch):
+    """
+    Route every feature module's get_db() through a CountingDatabase so a
+    test can assert how many DB round trips a request made.
+    """
+    import backend.app.features.carts.routes as carts_routes
+    import backend.app.features.cuisines.routes as cuisines_routes
+    import backend.app.features.ingredients.routes as ingredients_routes
+    import backend.app.features.orders.routes as orders_routes
+    import backend.app.features.recipes.routes as recipes_routes
+    from backend.app.db import get_db
+
+    counting = CountingDatabase(get_db())
+    for module in (carts_routes, cuisines_routes, ingredients_routes, orders_routes, recipes_routes):
+        monkeypatch.setattr(module, "get_db", lambda: counting)
+    return counting
+
+
+BAD_PLAN_STAGES = {"COLLSCAN", "SORT"}
+
+
+def _plan_stages(plan) -> list[str]:
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages += _plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            stages += _plan_stages(item)
+    return stages
+
+
+@pytest.fixture
+def assert_indexed():
+    """
+    Return a checker that runs explain() on a cursor and fails if the
+    winning plan scans the collection or sorts in memory.
+    """
+    def check(cursor):
+        try:
+            explain = cursor.explain()
+        except (AttributeError, NotImplementedError):
+            pytest.skip("explain() needs a real mongod")
+        winning = explain.get("queryPlanner", {}).get("winningPlan")
+        if winning is None:
+            pytest.skip("explain() output has no query plan")
+        stages = _plan_stages(winning)
+        bad = BAD_PLAN_STAGES.intersection(stages)
+        assert not bad, f"query plan uses {sorted(bad)}: {stages}"
+        return stages
+
+    return check
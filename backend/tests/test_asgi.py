@@ -0,0 +1,79 @@
+import pytest
+
+pytest.importorskip("starlette")
+pytest.importorskip("httpx")
+
+from starlette.testclient import TestClient  # noqa: E402
+
+from backend.app.asgi import create_asgi_app  # noqa: E402
+
+
+@pytest.fixture
+def aclient():
+    with TestClient(create_asgi_app()) as c:
+        yield c
+
+
+def test_health(aclient):
+    assert aclient.get("/health").json() == {"status": "ok"}
+
+
+def test_recipe_reads_match_flask_shapes(aclient, client):
+    payload = {"name": "Async Soup", "cuisine": "ASGI", "ingredients": ["leek"], "steps": [], "tags": []}
+    created = client.post("/recipes", json=payload).get_json()
+
+    recipe_id = created["_id"]
+    body = aclient.get(f"/recipes/{recipe_id}").json()
+    assert body == client.get(f"/recipes/{recipe_id}").get_json()
+    assert aclient.get(f"/recipes/{'0' * 24}").status_code == 404
+    assert aclient.get("/recipes/nope").json() == client.get("/recipes/nope").get_json()
+
+
+def test_writes_are_not_served(aclient):
+    # Writes go through the Flask app, which keeps its caches and indexes in step.
+    recipe_id = "0" * 24
+    for method, path in [
+        ("post", "/recipes"),
+        ("patch", f"/recipes/{recipe_id}"),
+        ("delete", f"/recipes/{recipe_id}"),
+        ("post", "/ingredients"),
+        ("put", f"/ingredients/{recipe_id}"),
+        ("delete", f"/ingredients/{recipe_id}"),
+        ("post", "/cuisines"),
+        ("patch", f"/cuisines/{recipe_id}"),
+        ("delete", f"/cuisines/{recipe_id}"),
+    ]:
+        assert aclient.request(method.upper(), path, json={"name": "Nope"}).status_code == 405, (method, path)
+
+
+def test_shared_validation_messages(aclient, client):
+    for path in ["/recipes?limit=0", "/recipes?sort=bogus", "/recipes?after=nope"]:
+        async_res = aclient.get(path)
+        flask_res = client.get(path)
+        assert async_res.status_code == flask_res.status_code == 400
+        assert async_res.json() == flask_res.get_json()
+
+
+def test_recipe_listing_paginates(aclient, client):
+    for i in range(3):
+        client.post("/recipes", json={"name": f"Page {i}", "cuisine": "Paged"})
+
+    first = aclient.get("/recipes?cuisine=Paged&limit=2&sort=name").json()
+    assert [r["name"] for r in first["recipes"]] == ["Page 0", "Page 1"]
+
+    second = aclient.get(first["_links"]["next"]["href"]).json()
+    assert [r["name"] for r in second["recipes"]] == ["Page 2"]
+    assert "next" not in second["_links"]
+
+
+def test_ingredients_and_cuisines(aclient, client):
+    ingredient = client.post("/ingredients", json={"name": "Async Basil"}).get_json()
+    assert ingredient in aclient.get("/ingredients").json()
+    assert aclient.get(f"/ingredients/{ingredient['id']}").json() == ingredient
+    assert aclient.get("/ingredients/not-an-id").json() == {"message": "Invalid id"}
+
+    cuisine = client.post("/cuisines", json={"name": "Async Thai"}).get_json()
+    assert cuisine["slug"] == "async-thai"
+    names = [c["name"] for c in aclient.get("/cuisines").json()["cuisines"]]
+    assert "Async Thai" in names
+    assert aclient.get(f"/cuisines/{cuisine['_id']}").json()["name"] == "Async Thai"
@@ -0,0 +1,191 @@
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+import backend.app.security as security
+from backend.app.cache import token_cache
+from backend.app.security import (
+    RevocationList,
+    check_password,
+    hash_password,
+    issue_token,
+    revocations,
+    verify_token,
+)
+
+
+@pytest.fixture(autouse=True)
+def fast_hashing(monkeypatch):
+    monkeypatch.setattr(security, "PASSWORD_SCRYPT_N", 2 ** 10)
+
+
+@pytest.fixture
+def enforced(monkeypatch):
+    monkeypatch.setattr(security, "AUTH_REQUIRED", True)
+
+
+def _bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _register(client, password="correct horse"):
+    email = f"{uuid4().hex}@example.com"
+    resp = client.post("/auth/register", json={"email": email, "password": password})
+    assert resp.status_code == 201
+    return email, resp.get_json()
+
+
+def test_register_login_and_me(client):
+    email, registered = _register(client)
+    assert registered["user"]["role"] == "user"
+    assert client.post("/auth/register", json={"email": email, "password": "other password"}).status_code == 409
+
+    assert client.post("/auth/login", json={"email": email, "password": "wrong password"}).status_code == 401
+    assert client.post("/auth/login", json={"email": f"x{email}", "password": "correct horse"}).status_code == 401
+    login = client.post("/auth/login", json={"email": email.upper(), "password": "correct horse"})
+    assert login.status_code == 200
+    token = login.get_json()["access_token"]
+
+    me = client.get("/auth/me", headers=_bearer(token)).get_json()
+    assert me == {"id": registered["user"]["id"], "role": "user", "expires_at": me["expires_at"]}
+    assert client.get("/auth/me").status_code == 401
+
+
+def test_register_validation(client):
+    assert client.post("/auth/register", json={"email": "nope", "password": "long enough"}).status_code == 400
+    assert client.post("/auth/register", json={"email": "a@example.com", "password": "short"}).status_code == 400
+
+
+def test_rejects_bad_tokens(client):
+    token = issue_token("u1", "user")
+    header, payload, signature = token.split(".")
+    forged_payload = issue_token("u1", "admin").split(".")[1]
+
+    for bad in [
+        f"{header}.{forged_payload}.{signature}",       # payload swapped, old signature
+        f"eyJhbGciOiJub25lIn0.{payload}.",              # alg none
+        "not-a-token",
+        issue_token("u1", "user", ttl=-1),              # expired
+    ]:
+        resp = client.get("/auth/me", headers=_bearer(bad))
+        assert resp.status_code == 401, bad
+        assert resp.headers["WWW-Authenticate"].startswith("Bearer")
+
+
+def test_role_checks(client, enforced):
+    body = {"name": f"Cuisine {uuid4().hex[:8]}"}
+    assert client.post("/cuisines", json=body).status_code == 401
+    assert client.post("/cuisines", json=body, headers=_bearer(issue_token("u1", "user"))).status_code == 403
+    manager = _bearer(issue_token("m1", "content_manager"))
+    assert client.post("/cuisines", json=body, headers=manager).status_code == 201
+    # Reads stay open.
+    assert client.get("/cuisines").status_code == 200
+
+
+def test_anonymous_writes_pass_only_if_auth_is_turned_off(client, monkeypatch):
+    monkeypatch.setattr(security, "AUTH_REQUIRED", False)
+    body = {"name": f"Cuisine {uuid4().hex[:8]}"}
+    assert client.post("/cuisines", json=body).status_code == 201
+    # A token that is sent is still checked.
+    assert client.post("/cuisines", json=body, headers=_bearer(issue_token("u1", "user"))).status_code == 403
+    assert client.post("/cuisines", json=body, headers=_bearer("garbage")).status_code == 401
+
+
+def test_dev_logs_always_need_an_admin(client):
+    # Even with AUTH_REQUIRED turned off (as in these tests).
+    assert client.get("/dev/logs").status_code == 401
+    assert client.get("/dev/logs", headers=_bearer(issue_token("m1", "content_manager"))).status_code == 403
+
+
+def _create_app(**env):
+    # backend.app.main builds its app on import; it does not need Mongo for that.
+    env = {**os.environ, "MONGO_ENSURE_INDEXES": "0", "MONGO_SERVER_SELECTION_TIMEOUT_MS": "100", **env}
+    env = {k: v for k, v in env.items() if v is not None}
+    return subprocess.run(
+        [sys.executable, "-c", "import backend.app.main, backend.app.security as s; print(s.AUTH_REQUIRED)"],
+        env=env, capture_output=True, text=True, cwd=Path(__file__).resolve().parents[2],
+    )
+
+
+def test_fails_closed_by_default():
+    missing_secret = _create_app(AUTH_SECRET=None, AUTH_DEV_MODE=None)
+    assert missing_secret.returncode != 0
+    assert "AUTH_SECRET is not set" in missing_secret.stderr
+    assert _create_app(AUTH_SECRET=None, AUTH_DEV_MODE="1", AUTH_REQUIRED=None).stdout.strip() == "True"
+    assert _create_app(AUTH_REQUIRED=None).stdout.strip() == "True"
+
+
+def test_logout_revokes_the_token(client):
+    _, registered = _register(client)
+    token = registered["access_token"]
+    assert client.post("/auth/logout", headers=_bearer(token)).status_code == 200
+    assert client.get("/auth/me", headers=_bearer(token)).status_code == 401
+
+
+def test_role_change_revokes_existing_tokens(client):
+    email, registered = _register(client)
+    user_id, old = registered["user"]["id"], registered["access_token"]
+    admin = _bearer(issue_token("admin-1", "admin"))
+
+    assert client.patch(f"/admin/users/{user_id}/role", json={"role": "content_manager"}).status_code == 401
+    assert client.patch(f"/admin/users/{user_id}/role", json={"role": "content_manager"},
+                        headers=_bearer(old)).status_code == 403
+    assert client.patch(f"/admin/users/{user_id}/role", json={"role": "chef"}, headers=admin).status_code == 400
+    resp = client.patch(f"/admin/users/{user_id}/role", json={"role": "content_manager"}, headers=admin)
+    assert resp.get_json()["role"] == "content_manager"
+
+    assert client.get("/auth/me", headers=_bearer(old)).status_code == 401
+    new = client.post("/auth/login", json={"email": email, "password": "correct horse"}).get_json()["access_token"]
+    assert client.get("/auth/me", headers=_bearer(new)).get_json()["role"] == "content_manager"
+
+    client.patch(f"/admin/users/{user_id}/status", json={"status": "suspended"}, headers=admin)
+    assert client.get("/auth/me", headers=_bearer(new)).status_code == 401
+    assert client.post("/auth/login", json={"email": email, "password": "correct horse"}).status_code == 403
+
+
+def test_verified_tokens_are_cached(monkeypatch):
+    token_cache.clear()
+    calls = []
+    decode = security.decode_token
+    monkeypatch.setattr(security, "decode_token", lambda t: calls.append(t) or decode(t))
+
+    token = issue_token("u1", "user")
+    for _ in range(5):
+        assert verify_token(token)["sub"] == "u1"
+    assert calls == [token]
+
+
+def test_revocations_sync_periodically_not_per_request():
+    now = [0.0]
+    other_process = RevocationList(sync_interval=30, clock=lambda: now[0])
+    claims = verify_token(issue_token(f"u-{uuid4().hex}", "user"))
+
+    assert not other_process.is_revoked(claims)
+    revocations.revoke_token(claims)
+    for _ in range(100):
+        assert not other_process.is_revoked(claims)  # still on its last copy
+    assert other_process.syncs == 1
+
+    now[0] = 31.0
+    assert other_process.is_revoked(claims)
+    assert other_process.syncs == 2
+
+
+def test_password_hashing():
+    stored = hash_password("s3cret-pass")
+    assert stored.startswith("scrypt$")
+    assert stored != hash_password("s3cret-pass")  # salted
+    assert check_password("s3cret-pass", stored)
+    assert not check_password("s3cret-pasS", stored)
+    assert not check_password("s3cret-pass", "garbage")
+
+
+def test_issue_token_rejects_unknown_roles():
+    with pytest.raises(ValueError):
+        issue_token("u1", "chef")
+    assert verify_token(issue_token("u1", "admin", ttl=60))["exp"] <= time.time() + 60
@@ -0,0 +1,40 @@
+from backend.app.features.recipes.bitset_scorer import BitsetScorer
+
+
+def _scorer():
+    return BitsetScorer(
+        ["r1", "r2", "r3"],
+        [
+            ["tomato", "egg"],
+            ["Tomato", "egg", "salt", "oil"],
+            ["pasta", "garlic", "butter"],
+        ],
+    )
+
+
+def test_score_ratio_and_missing():
+    scorer = _scorer()
+    ratio, missing = scorer.score([["tomato", "egg", "milk"], ["garlic"]])
+
+    assert ratio.shape == (2, 3)
+    assert list(ratio[0]) == [1.0, 0.5, 0.0]
+    assert list(missing[0]) == [0, 2, 3]
+    assert list(missing[1]) == [2, 4, 2]
+
+
+def test_wide_vocabulary_spans_several_words():
+    names = [f"i{n}" for n in range(200)]
+    scorer = BitsetScorer(["all", "tail"], [names, names[150:]])
+    ratio, missing = scorer.score([names[100:]])
+
+    assert abs(ratio[0, 0] - 0.5) < 1e-6
+    assert missing[0, 0] == 100
+    assert ratio[0, 1] == 1.0
+
+
+def test_top_k_orders_by_ratio():
+    scorer = _scorer()
+    top = scorer.top_k([["tomato", "egg"]], k=2)
+
+    assert [m["recipe_id"] for m in top[0]] == ["r1", "r2"]
+    assert top[0][1]["missing"] == 2
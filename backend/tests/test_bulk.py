@@ -0,0 +1,57 @@
+import json
+
+from backend.app.db import get_db
+
+
+def test_bulk_recipes_from_json_array(client):
+    get_db().recipes.delete_many({})
+    items = [
+        {"name": "Tomato Egg", "ingredients": ["tomato", "egg"]},
+        {"name": ""},
+        {"name": "Omelette", "ingredients": ["egg"]},
+    ]
+    resp = client.post("/recipes/bulk", json=items)
+    assert resp.status_code == 207
+
+    data = resp.get_json()
+    assert data["received"] == 3
+    assert data["created"] == 2
+    assert data["failed"] == 1
+    assert [r["status"] for r in data["results"]] == ["created", "error", "created"]
+
+    rid = data["results"][0]["_id"]
+    assert client.get(f"/recipes/{rid}").get_json()["name"] == "Tomato Egg"
+
+    # Bulk-created recipes are visible to the match index right away.
+    matches = client.get("/recipes/match?ingredients=egg").get_json()["matches"]
+    assert {m["_id"] for m in matches} == {rid, data["results"][2]["_id"]}
+
+
+def test_bulk_ingredients_from_ndjson(client, db_calls):
+    body = "\n".join(json.dumps({"name": f"Spice {i}"}) for i in range(5))
+    resp = client.post(
+        "/ingredients/bulk", data=body, content_type="application/x-ndjson"
+    )
+    assert resp.status_code == 200
+    assert resp.get_json()["created"] == 5
+    assert db_calls.calls == ["ingredients.insert_many"]
+
+
+def test_bulk_upsert_is_idempotent(client):
+    get_db().ingredients.delete_many({"name": "Saffron"})
+    first = client.post("/ingredients/bulk?upsert=true", json=[{"name": "Saffron"}]).get_json()
+    second = client.post(
+        "/ingredients/bulk?upsert=true", json=[{"name": "Saffron", "notes": "threads"}]
+    ).get_json()
+
+    assert first["created"] == 1
+    assert second["updated"] == 1
+    assert second["results"][0]["_id"] == first["results"][0]["_id"]
+    assert get_db().ingredients.count_documents({"name": "Saffron"}) == 1
+
+
+def test_bulk_rejects_bad_bodies(client):
+    assert client.post("/recipes/bulk", json={"name": "x"}).status_code == 400
+    assert client.post("/recipes/bulk", json=[]).status_code == 400
+    resp = client.post("/ingredients/bulk", data="{bad", content_type="application/x-ndjson")
+    assert resp.status_code == 400
@@ -0,0 +1,110 @@
+from bson import ObjectId
+
+from backend.app.cache import DocumentCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_read_through_counts_hits_and_misses():
+    cache = DocumentCache(maxsize=10, ttl=60)
+    oid = ObjectId()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return {"_id": oid, "name": "Garlic"}
+
+    assert cache.get_or_load("ingredients", oid, loader)["name"] == "Garlic"
+    assert cache.get_or_load("ingredients", oid, loader)["name"] == "Garlic"
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_missing_documents_are_not_cached():
+    cache = DocumentCache(maxsize=10, ttl=60)
+    oid = ObjectId()
+    assert cache.get_or_load("recipes", oid, lambda: None) is None
+    assert cache.stats()["size"] == 0
+
+
+def test_lru_eviction():
+    cache = DocumentCache(maxsize=2, ttl=60)
+    a, b, c = ObjectId(), ObjectId(), ObjectId()
+    cache.put("recipes", a, {"_id": a})
+    cache.put("recipes", b, {"_id": b})
+    cache.get("recipes", a)  # a is now most recently used
+    cache.put("recipes", c, {"_id": c})
+
+    assert cache.get("recipes", b) is None
+    assert cache.get("recipes", a) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = DocumentCache(maxsize=10, ttl=5, clock=clock)
+    oid = ObjectId()
+    cache.put("cuisines", oid, {"_id": oid})
+
+    clock.now = 4.9
+    assert cache.get("cuisines", oid) is not None
+    clock.now = 5.0
+    assert cache.get("cuisines", oid) is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_returned_documents_are_copies():
+    cache = DocumentCache(maxsize=10, ttl=60)
+    oid = ObjectId()
+    cache.put("recipes", oid, {"_id": oid})
+    cache.get("recipes", oid)["_id"] = str(oid)
+    assert cache.get("recipes", oid)["_id"] == oid
+
+
+def test_patch_invalidates_cached_recipe(client):
+    created = client.post("/recipes", json={"name": "Old"}).get_json()
+    rid = created["_id"]
+
+    assert client.get(f"/recipes/{rid}").get_json()["name"] == "Old"
+    client.patch(f"/recipes/{rid}", json={"name": "New"})
+    assert client.get(f"/recipes/{rid}").get_json()["name"] == "New"
+
+    client.delete(f"/recipes/{rid}")
+    assert client.get(f"/recipes/{rid}").status_code == 404
+
+    stats = client.get("/db/cache").get_json()
+    assert stats["misses"] >= 2
+
+
+def test_load_overlapping_an_invalidate_is_not_cached():
+    cache = DocumentCache(maxsize=10, ttl=60)
+    oid = ObjectId()
+
+    def loader():
+        # A PATCH lands after this GET read the old document.
+        cache.invalidate("recipes", oid)
+        return {"_id": oid, "name": "Old"}
+
+    assert cache.get_or_load("recipes", oid, loader)["name"] == "Old"
+    assert cache.get("recipes", oid) is None
+    assert cache.get_or_load("recipes", oid, lambda: {"_id": oid, "name": "New"})["name"] == "New"
+    assert cache.get("recipes", oid)["name"] == "New"
+
+
+def test_load_overlapping_a_clear_is_not_cached():
+    cache = DocumentCache(maxsize=10, ttl=60)
+    oid = ObjectId()
+
+    def loader():
+        cache.clear()
+        return {"_id": oid}
+
+    cache.get_or_load("ingredients", oid, loader)
+    assert cache.stats()["size"] == 0
@@ -0,0 +1,97 @@
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+import pytest
+from bson import ObjectId
+
+from backend.app.db import get_client
+
+
+def _user():
+    return f"user-{uuid4().hex}"
+
+
+def _items(cart):
+    return {item["ingredient_id"]: item["quantity"] for item in cart["items"]}
+
+
+def test_cart_lifecycle(client, login_as):
+    user = _user()
+    login_as(client, user)
+    a, b = str(ObjectId()), str(ObjectId())
+
+    assert client.get(f"/carts/{user}").get_json()["items"] == []
+
+    client.post(f"/carts/{user}/items", json={"ingredient_id": a})
+    client.post(f"/carts/{user}/items", json={"ingredient_id": a, "quantity": 2})
+    cart = client.post(f"/carts/{user}/items", json={"ingredient_id": b, "quantity": 5}).get_json()
+    assert _items(cart) == {a: 3, b: 5}
+
+    cart = client.put(f"/carts/{user}/items/{b}", json={"quantity": 1}).get_json()
+    assert _items(cart) == {a: 3, b: 1}
+
+    cart = client.put(f"/carts/{user}/items/{b}", json={"quantity": 0}).get_json()
+    assert _items(cart) == {a: 3}
+
+    cart = client.delete(f"/carts/{user}/items/{a}").get_json()
+    assert cart["items"] == []
+    assert client.get(f"/carts/{user}").get_json()["updated_at"] is not None
+
+
+def test_cart_validation(client, login_as):
+    user = _user()
+    login_as(client, user)
+    assert client.post(f"/carts/{user}/items", json={"ingredient_id": "nope"}).status_code == 400
+    assert client.post(f"/carts/{user}/items", json={"ingredient_id": "a.b$c"}).status_code == 400
+    ingredient = str(ObjectId())
+    assert client.post(f"/carts/{user}/items", json={"ingredient_id": ingredient, "quantity": 0}).status_code == 400
+    assert client.put(f"/carts/{user}/items/{ingredient}", json={"quantity": "2"}).status_code == 400
+    assert client.put(f"/carts/{user}/items/{ingredient}", json={}).status_code == 400
+
+
+def test_each_mutation_is_one_round_trip(client, db_calls, login_as):
+    user, ingredient = _user(), str(ObjectId())
+    login_as(client, user)
+    for method, path, body in [
+        ("post", f"/carts/{user}/items", {"ingredient_id": ingredient}),
+        ("put", f"/carts/{user}/items/{ingredient}", {"quantity": 4}),
+        ("delete", f"/carts/{user}/items/{ingredient}", None),
+        ("delete", f"/carts/{user}", None),
+    ]:
+        db_calls.reset()
+        assert getattr(client, method)(path, json=body).status_code == 200
+        assert db_calls.calls == ["carts.find_one_and_update"]
+
+
+def test_concurrent_adds_are_not_lost(app, login_as):
+    if type(get_client()).__module__.startswith("mongomock"):
+        pytest.skip("mongomock is not thread-safe; needs a real mongod")
+    user = _user()
+    shared, own = str(ObjectId()), [str(ObjectId()) for _ in range(8)]
+
+    def tap(worker):
+        c = login_as(app.test_client(), user)
+        for _ in range(25):
+            c.post(f"/carts/{user}/items", json={"ingredient_id": shared})
+        c.post(f"/carts/{user}/items", json={"ingredient_id": own[worker], "quantity": 2})
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(tap, range(8)))
+
+    items = _items(login_as(app.test_client(), user).get(f"/carts/{user}").get_json())
+    assert items[shared] == 200
+    assert all(items[i] == 2 for i in own)
+
+
+def test_carts_belong_to_their_user(client, login_as):
+    user, ingredient = _user(), str(ObjectId())
+    assert client.get(f"/carts/{user}").status_code == 401
+
+    login_as(client, _user())
+    assert client.get(f"/carts/{user}").status_code == 403
+    assert client.post(f"/carts/{user}/items", json={"ingredient_id": ingredient}).status_code == 403
+
+    login_as(client, user)
+    assert client.post(f"/carts/{user}/items", json={"ingredient_id": ingredient}).status_code == 200
+    login_as(client, "admin-1", "admin")
+    assert _items(client.get(f"/carts/{user}").get_json()) == {ingredient: 1}
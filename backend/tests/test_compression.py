@@ -0,0 +1,58 @@
+import gzip
+
+import pytest
+
+from backend.app import compression
+
+
+def _seed_recipes(client, n=20):
+    for i in range(n):
+        client.post("/recipes", json={
+            "name": f"Compress {i}", "cuisine": "Compress Test",
+            "ingredients": ["flour", "water", "salt"], "steps": ["mix well"] * 10,
+        })
+
+
+def test_large_json_is_gzipped_when_accepted(client):
+    _seed_recipes(client)
+    plain = client.get("/recipes?cuisine=Compress%20Test")
+    res = client.get("/recipes?cuisine=Compress%20Test", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in plain.headers
+    assert res.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in res.headers["Vary"]
+    assert gzip.decompress(res.data) == plain.data
+    # The weak ETag is the same for both encodings.
+    assert res.headers["ETag"] == plain.headers["ETag"]
+
+
+def test_small_bodies_are_not_compressed(client):
+    res = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in res.headers
+
+
+@pytest.mark.skipif(compression.brotli is None, reason="brotli not installed")
+def test_brotli_preferred_on_tie():
+    from werkzeug.datastructures import Accept
+    from werkzeug.http import parse_accept_header
+
+    assert compression.choose_encoding(parse_accept_header("gzip, br", Accept)) == "br"
+    assert compression.choose_encoding(parse_accept_header("gzip;q=1, br;q=0.5", Accept)) == "gzip"
+    assert compression.choose_encoding(parse_accept_header("identity", Accept)) is None
+
+
+def test_snapshot_variants_are_compressed_once(client, monkeypatch):
+    for i in range(40):
+        client.post("/ingredients", json={"name": f"Compress ingredient {i}", "category": "bench"})
+    calls = []
+    real = compression.compress
+    monkeypatch.setattr("backend.app.snapshot.compress", lambda body, enc: calls.append(enc) or real(body, enc))
+
+    plain = client.get("/ingredients")
+    first = client.get("/ingredients", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/ingredients", headers={"Accept-Encoding": "gzip"})
+
+    assert first.headers["Content-Encoding"] == "gzip"
+    assert first.data == second.data
+    assert gzip.decompress(first.data) == plain.data
+    assert calls == ["gzip"]
@@ -0,0 +1,52 @@
+from uuid import uuid4
+
+import pytest
+
+import backend.app.security as security
+from backend.app.db import get_db
+from backend.scripts.create_admin import create_admin
+
+
+@pytest.fixture(autouse=True)
+def enforced(monkeypatch):
+    monkeypatch.setattr(security, "PASSWORD_SCRYPT_N", 2 ** 10)
+    monkeypatch.setattr(security, "AUTH_REQUIRED", True)
+
+
+def _login(client, email, password):
+    resp = client.post("/auth/login", json={"email": email, "password": password})
+    assert resp.status_code == 200
+    return {"Authorization": f"Bearer {resp.get_json()['access_token']}"}
+
+
+def test_fresh_database_reaches_an_admin(client):
+    db = get_db()
+    db.users.delete_many({})
+    email = f"Admin-{uuid4().hex}@Example.com"
+    with pytest.raises(ValueError):
+        create_admin(db, email, "short")
+
+    user, created = create_admin(db, email, "correct horse")
+    assert created and user["role"] == "admin"
+    admin = _login(client, email.lower(), "correct horse")
+    assert client.get("/auth/me", headers=admin).get_json()["role"] == "admin"
+
+    # The admin can now hand out roles, which unlocks content writes.
+    editor = f"editor-{uuid4().hex}@example.com"
+    registered = client.post("/auth/register", json={"email": editor, "password": "battery staple"}).get_json()
+    resp = client.patch(f"/admin/users/{registered['user']['id']}/role", json={"role": "content_manager"},
+                        headers=admin)
+    assert resp.status_code == 200
+    manager = _login(client, editor, "battery staple")
+    assert client.post("/cuisines", json={"name": f"Bootstrap {uuid4().hex[:8]}"}, headers=manager).status_code == 201
+
+
+def test_promotes_an_existing_account(client):
+    email = f"user-{uuid4().hex}@example.com"
+    old = client.post("/auth/register", json={"email": email, "password": "correct horse"}).get_json()
+
+    user, created = create_admin(get_db(), email, None)
+    assert not created and user["role"] == "admin"
+    # The old token carried role "user" and is revoked; the password is unchanged.
+    assert client.get("/auth/me", headers={"Authorization": f"Bearer {old['access_token']}"}).status_code == 401
+    assert client.get("/auth/me", headers=_login(client, email, "correct horse")).get_json()["role"] == "admin"
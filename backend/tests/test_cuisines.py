@@ -41,3 +41,41 @@ def test_update_cuisine(client):
     data = response.get_json()
 
     assert data["name"] == "Thai Updated"
+
+
+def test_list_reflects_created_and_deleted_cuisines(client):
+    created = client.post("/cuisines", json={"name": "Snapshot Test"}).get_json()
+    names = [c["name"] for c in client.get("/cuisines").get_json()["cuisines"]]
+    assert "Snapshot Test" in names
+
+    client.delete(f"/cuisines/{created['_id']}")
+    names = [c["name"] for c in client.get("/cuisines").get_json()["cuisines"]]
+    assert "Snapshot Test" not in names
+
+
+def test_list_is_served_from_snapshot(client, db_calls):
+    client.get("/cuisines")
+    db_calls.reset()
+
+    first = client.get("/cuisines")
+    assert first.status_code == 200
+    again = client.get("/cuisines", headers={"If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304
+    assert db_calls.calls == []
+
+
+def test_snapshot_reloads_after_ttl():
+    from backend.app.db import get_db
+    from backend.app.features.cuisines.snapshot import load_cuisines
+    from backend.app.snapshot import EncodedSnapshot
+
+    now = [0.0]
+    snapshot = EncodedSnapshot(load_cuisines, ttl=10, clock=lambda: now[0])
+    db = get_db()
+    snapshot.get(db)
+    snapshot.get(db)
+    assert snapshot.loads == 1
+
+    now[0] = 10.0
+    snapshot.get(db)
+    assert snapshot.loads == 2
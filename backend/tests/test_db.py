@@ -0,0 +1,35 @@
+import os
+
+from backend.app import db
+
+
+def test_client_options_from_env(monkeypatch):
+    monkeypatch.setenv("MONGO_MAX_POOL_SIZE", "50")
+    monkeypatch.setenv("MONGO_MIN_POOL_SIZE", "5")
+    monkeypatch.setenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "2000")
+    monkeypatch.setenv("MONGO_COMPRESSORS", "zlib")
+    monkeypatch.delenv("MONGO_SOCKET_TIMEOUT_MS", raising=False)
+
+    options = db.client_options()
+    assert options["maxPoolSize"] == 50
+    assert options["minPoolSize"] == 5
+    assert options["serverSelectionTimeoutMS"] == 2000
+    assert options["compressors"] == "zlib"
+    assert "socketTimeoutMS" not in options
+
+
+def test_client_is_recreated_in_a_new_process(monkeypatch):
+    first = db.get_client()
+    assert db.get_client() is first
+
+    monkeypatch.setattr(db, "_client_pid", os.getpid() + 1)
+    assert db.get_client() is not first
+
+
+def test_pool_endpoint(client):
+    client.get("/db/health")
+    resp = client.get("/db/pool")
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert data["pid"] == os.getpid()
+    assert "in_use" in data["connections"]
@@ -0,0 +1,50 @@
+"""
+Every create/update handler should cost exactly one DB round trip
+(slug uniqueness is left to the cuisines unique index).
+"""
+
+
+def test_recipe_writes_are_single_round_trip(client, db_calls):
+    resp = client.post("/recipes", json={"name": "Tomato Egg", "ingredients": ["tomato"]})
+    assert resp.status_code == 201
+    assert db_calls.calls == ["recipes.insert_one"]
+    rid = resp.get_json()["_id"]
+
+    db_calls.reset()
+    resp = client.patch(f"/recipes/{rid}", json={"name": "Egg Tomato"})
+    assert resp.status_code == 200
+    assert resp.get_json()["name"] == "Egg Tomato"
+    assert db_calls.calls == ["recipes.find_one_and_update"]
+
+    db_calls.reset()
+    resp = client.patch("/recipes/000000000000000000000000", json={"name": "x"})
+    assert resp.status_code == 404
+    assert len(db_calls.calls) == 1
+
+
+def test_ingredient_writes_are_single_round_trip(client, db_calls):
+    resp = client.post("/ingredients", json={"name": "Garlic"})
+    assert resp.status_code == 201
+    assert db_calls.calls == ["ingredients.insert_one"]
+    iid = resp.get_json()["id"]
+
+    db_calls.reset()
+    resp = client.put(f"/ingredients/{iid}", json={"notes": "minced"})
+    assert resp.status_code == 200
+    assert resp.get_json()["notes"] == "minced"
+    assert db_calls.calls == ["ingredients.find_one_and_update"]
+
+
+def test_cuisine_writes_skip_read_after_write(client, db_calls):
+    resp = client.post("/cuisines", json={"name": "Round Trip Cuisine"})
+    assert resp.status_code == 201
+    assert db_calls.calls == ["cuisines.insert_one"]
+    cid = resp.get_json()["_id"]
+
+    db_calls.reset()
+    resp = client.patch(f"/cuisines/{cid}", json={"region": "Nowhere"})
+    assert resp.status_code == 200
+    assert resp.get_json()["region"] == "Nowhere"
+    assert db_calls.calls == ["cuisines.find_one_and_update"]
+
+    client.delete(f"/cuisines/{cid}")
@@ -0,0 +1,54 @@
+import gzip
+import json
+
+from backend.app.utils.export import gzip_chunks, ndjson_chunks
+
+
+def _lines(body: bytes) -> list:
+    return [json.loads(line) for line in body.decode("utf-8").splitlines()]
+
+
+def test_ndjson_chunks_are_bounded():
+    docs = ({"n": i, "pad": "x" * 100} for i in range(2000))
+
+    chunks = list(ndjson_chunks(docs, lambda d: d, chunk_bytes=4096))
+
+    assert len(_lines(chunks[0])) == 1  # first document goes out alone
+    assert max(len(c) for c in chunks) < 4096 + 200
+    assert [d["n"] for d in _lines(b"".join(chunks))] == list(range(2000))
+
+
+def test_gzip_chunks_round_trip():
+    chunks = [b'{"a":1}\n', b'{"a":2}\n']
+    assert gzip.decompress(b"".join(gzip_chunks(iter(chunks)))) == b"".join(chunks)
+
+
+def test_recipe_export_streams_all_matching_recipes(client):
+    for i in range(3):
+        client.post("/recipes", json={
+            "name": f"Export {i}", "cuisine": "Export Test",
+            "ingredients": ["salt"], "steps": ["cook"], "tags": [],
+        })
+
+    res = client.get("/recipes/export?cuisine=Export%20Test&fields=name")
+
+    assert res.status_code == 200
+    assert res.is_streamed
+    assert res.mimetype == "application/x-ndjson"
+    rows = _lines(res.data)
+    assert sorted(r["name"] for r in rows) == ["Export 0", "Export 1", "Export 2"]
+    assert all(set(r) == {"_id", "name"} for r in rows)
+
+
+def test_ingredient_export_gzip(client):
+    created = client.post("/ingredients", json={"name": "Export Garlic"}).get_json()
+
+    res = client.get("/ingredients/export", headers={"Accept-Encoding": "gzip"})
+
+    assert res.headers["Content-Encoding"] == "gzip"
+    rows = _lines(gzip.decompress(res.data))
+    assert created in rows
+
+
+def test_recipe_export_rejects_unknown_field(client):
+    assert client.get("/recipes/export?fields=bogus").status_code == 400
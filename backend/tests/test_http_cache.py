@@ -0,0 +1,41 @@
+def test_etag_and_304_on_repeat_request(client):
+    client.post("/ingredients", json={"name": "Basil"})
+
+    first = client.get("/ingredients")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert "max-age=60" in first.headers["Cache-Control"]
+
+    second = client.get("/ingredients", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.data == b""
+
+
+def test_etag_changes_after_write(client):
+    etag = client.get("/ingredients").headers["ETag"]
+    client.post("/ingredients", json={"name": "Thyme"})
+
+    resp = client.get("/ingredients", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != etag
+
+
+def test_form_and_recipes_cache_control(client):
+    form = client.get("/form")
+    assert "max-age=3600" in form.headers["Cache-Control"]
+    assert client.get("/form", headers={"If-None-Match": form.headers["ETag"]}).status_code == 304
+
+    recipes = client.get("/recipes")
+    assert recipes.headers["Cache-Control"] == "no-cache"
+
+
+def test_max_age_is_configurable(app):
+    app.config["CACHE_MAX_AGE"]["cuisines"] = 5
+    resp = app.test_client().get("/cuisines")
+    assert "max-age=5" in resp.headers["Cache-Control"]
+
+
+def test_uncached_namespaces_and_writes_have_no_etag(client):
+    assert "ETag" not in client.get("/health").headers
+    assert "ETag" not in client.post("/ingredients", json={"name": "Dill"}).headers
@@ -0,0 +1,78 @@
+import logging
+
+from bson import ObjectId
+from flask import Flask
+from pymongo.errors import ServerSelectionTimeoutError
+
+import backend.app.indexes as indexes
+from backend.app.db import get_db
+from backend.app.indexes import INDEX_MANIFEST, ensure_indexes
+
+
+def test_ensure_indexes_is_idempotent():
+    db = get_db()
+    first = ensure_indexes(db)
+    second = ensure_indexes(db)
+    assert first["failed"] == {}
+    assert second["created"] == first["created"]
+
+    for collection, models in INDEX_MANIFEST.items():
+        names = set(db[collection].index_information())
+        for model in models:
+            assert model.document["name"] in names
+
+
+def test_duplicate_cuisine_slug_is_rejected(client):
+    get_db().cuisines.delete_many({"slug": "dup-slug"})
+    assert client.post("/cuisines", json={"name": "Dup", "slug": "dup-slug"}).status_code == 201
+    assert client.post("/cuisines", json={"name": "Dup 2", "slug": "dup-slug"}).status_code == 409
+
+    other = client.post("/cuisines", json={"name": "Other Dup"}).get_json()
+    resp = client.patch(f"/cuisines/{other['_id']}", json={"slug": "dup-slug"})
+    assert resp.status_code == 409
+
+
+# The queries behind each route, in the shape the handlers issue them.
+def test_route_queries_use_indexes(assert_indexed):
+    db = get_db()
+    ensure_indexes(db)
+
+    assert_indexed(db.recipes.find({}).sort("_id", -1).limit(51))
+    assert_indexed(db.recipes.find({"_id": {"$lt": ObjectId()}}).sort("_id", -1).limit(51))
+    assert_indexed(db.recipes.find({"_id": ObjectId()}))
+    assert_indexed(db.recipes.find({"ingredients": "egg"}))
+    assert_indexed(db.recipes.find({"tags": "quick"}))
+    assert_indexed(db.recipes.find({"name": "Tomato Egg"}))
+    assert_indexed(db.recipes.find({}).sort([("name", 1), ("_id", 1)]).limit(51))
+    assert_indexed(db.recipes.find({"cuisine": "Chinese"}).sort("_id", -1).limit(51))
+    assert_indexed(db.recipes.find({"tags": {"$all": ["quick"]}}).sort("_id", -1).limit(51))
+    assert_indexed(db.recipes.find({"ingredients": {"$all": ["egg"]}}).sort("_id", -1).limit(51))
+    assert_indexed(db.ingredients.find({}).sort("name", 1))
+    assert_indexed(db.ingredients.find({"name": "Garlic"}))
+    assert_indexed(db.cuisines.find({"slug": "chinese"}))
+
+
+def test_index_build_is_retried_once_mongo_is_reachable(monkeypatch, caplog):
+    calls = []
+
+    def flaky(db):
+        calls.append(db)
+        if len(calls) == 1:
+            raise ServerSelectionTimeoutError("no servers")
+        return {"created": [], "failed": {"users.email_unique": "E11000 duplicate key"}}
+
+    monkeypatch.setattr(indexes, "ensure_indexes", flaky)
+    monkeypatch.setattr(indexes, "INDEX_RETRY_SECONDS", 0)
+    app = Flask(__name__)
+    app.get("/ping")(lambda: "pong")
+    indexes.init_indexes(app, db=get_db)
+    assert len(calls) == 1
+
+    client = app.test_client()
+    with caplog.at_level(logging.ERROR):
+        client.get("/ping")
+    assert len(calls) == 2
+    assert "users.email_unique" in caplog.text
+
+    client.get("/ping")
+    assert len(calls) == 2  # built once, not retried per request
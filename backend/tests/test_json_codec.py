@@ -0,0 +1,49 @@
+import json
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from backend.app import json_codec
+
+ENCODERS = [json_codec.stdlib_dumps]
+if json_codec.orjson is not None:
+    ENCODERS.append(json_codec.orjson_dumps)
+
+
+@pytest.mark.parametrize("dumps", ENCODERS)
+def test_encoders_handle_mongo_types(dumps):
+    oid = ObjectId()
+    doc = {"_id": oid, "at": datetime(2024, 5, 1, 12, 30), "name": "Crème brûlée", "tags": ["a"]}
+
+    decoded = json.loads(dumps(doc))
+
+    assert decoded == {"_id": str(oid), "at": "2024-05-01T12:30:00", "name": "Crème brûlée", "tags": ["a"]}
+
+
+@pytest.mark.parametrize("dumps", ENCODERS)
+def test_encoders_reject_unknown_types(dumps):
+    with pytest.raises(TypeError):
+        dumps({"x": object()})
+
+
+def test_error_responses_are_still_json(client):
+    res = client.get("/ingredients/not-an-id")
+    assert res.status_code == 400
+    assert res.mimetype == "application/json"
+    assert "message" in res.get_json()
+
+
+def test_ingredient_list_is_served_pre_encoded(client, db_calls):
+    client.post("/ingredients", json={"name": "Saffron"})
+    first = client.get("/ingredients")
+    db_calls.reset()
+
+    again = client.get("/ingredients")
+    assert again.data == first.data
+    assert db_calls.calls == []
+    assert client.get("/ingredients", headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+
+    client.post("/ingredients", json={"name": "Sumac"})
+    names = [x["name"] for x in client.get("/ingredients").get_json()]
+    assert "Sumac" in names
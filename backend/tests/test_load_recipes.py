@@ -0,0 +1,130 @@
+import json
+
+import pytest
+
+import backend.scripts.load_recipes as load_recipes
+from backend.app.db import get_db
+from backend.scripts.load_recipes import Checkpoint, load, read_records
+
+
+def _write_jsonl(path, n):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n):
+            f.write(json.dumps({"name": f"Loader {i}", "ingredients": ["salt"]}) + "\n")
+        f.write(json.dumps({"name": ""}) + "\n")
+
+
+def test_load_is_idempotent(tmp_path):
+    db = get_db()
+    db.recipes.delete_many({})
+    path = tmp_path / "dump.jsonl"
+    _write_jsonl(path, 25)
+
+    totals = load(read_records(str(path)), db.recipes, batch_size=4, workers=3)
+    assert totals["read"] == 26
+    assert totals["upserted"] == 25
+    assert totals["invalid"] == 1
+
+    again = load(read_records(str(path)), db.recipes, batch_size=4, workers=3)
+    assert again["upserted"] == 0
+    assert db.recipes.count_documents({}) == 25
+
+
+def test_load_resumes_from_checkpoint(tmp_path):
+    db = get_db()
+    db.recipes.delete_many({})
+    path = tmp_path / "dump.jsonl"
+    _write_jsonl(path, 10)
+
+    checkpoint = Checkpoint(str(tmp_path / "dump.checkpoint"))
+    checkpoint.mark(0, 6)  # as if an earlier run stopped after 6 records
+
+    resumed = Checkpoint(checkpoint.path)
+    totals = load(read_records(str(path)), db.recipes, batch_size=3, workers=2, checkpoint=resumed)
+    assert totals["skipped"] == 6
+    assert totals["read"] == 5
+    assert db.recipes.count_documents({}) == 4
+    assert resumed.position == 11
+
+
+def test_checkpoint_only_advances_over_contiguous_batches(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / "cp"))
+    checkpoint.mark(10, 20)
+    assert checkpoint.position == 0
+    checkpoint.mark(0, 10)
+    assert checkpoint.position == 20
+    assert Checkpoint(checkpoint.path).position == 20
+
+
+def test_read_csv_splits_list_cells(tmp_path):
+    path = tmp_path / "dump.csv"
+    path.write_text("name,ingredients,tags\nTomato Egg,tomato|egg,quick\n", encoding="utf-8")
+
+    records = list(read_records(str(path)))
+    assert records == [{"name": "Tomato Egg", "ingredients": ["tomato", "egg"], "tags": ["quick"]}]
+
+
+def test_malformed_lines_are_invalid_not_fatal(tmp_path):
+    db = get_db()
+    db.recipes.delete_many({})
+    path = tmp_path / "dump.jsonl"
+    path.write_text('{"name": "Loader ok"}\n{"name": "Loader tr\n[1, 2]\n', encoding="utf-8")
+
+    totals = load(read_records(str(path)), db.recipes, batch_size=2, workers=1)
+    assert totals["read"] == 3
+    assert totals["invalid"] == 2
+    assert totals["upserted"] == 1
+
+
+def test_failed_batches_are_not_checkpointed(tmp_path, monkeypatch):
+    db = get_db()
+    db.recipes.delete_many({})
+    path = tmp_path / "dump.jsonl"
+    _write_jsonl(path, 9)
+    real = load_recipes.write_batch
+
+    def flaky(collection, docs, key):
+        if any(d["name"] == "Loader 4" for d in docs):
+            return {"upserted": 0, "modified": 0, "failed": len(docs)}
+        return real(collection, docs, key)
+
+    monkeypatch.setattr(load_recipes, "write_batch", flaky)
+    checkpoint = Checkpoint(str(tmp_path / "dump.checkpoint"))
+    totals = load(read_records(str(path)), db.recipes, batch_size=3, workers=2, checkpoint=checkpoint)
+    assert totals["failed"] == 3
+    assert checkpoint.position == 3  # stops before the batch holding Loader 4
+
+    monkeypatch.setattr(load_recipes, "write_batch", real)
+    resumed = Checkpoint(checkpoint.path)
+    load(read_records(str(path)), db.recipes, batch_size=3, workers=2, checkpoint=resumed)
+    assert db.recipes.count_documents({}) == 9
+    assert resumed.position == 10
+
+
+def test_key_must_be_a_kept_field():
+    with pytest.raises(ValueError):
+        load([], get_db().recipes, key="source_id")
+
+
+def test_compound_key_keeps_one_name_per_cuisine():
+    db = get_db()
+    db.recipes.delete_many({})
+    records = [{"name": "Loader Curry", "cuisine": c} for c in ("Thai", "Indian", "Thai")]
+
+    totals = load(iter(records), db.recipes, key="name+cuisine", batch_size=1, workers=3)
+    assert totals["upserted"] == 2
+    assert totals["duplicates"] == 1
+    assert sorted(d["cuisine"] for d in db.recipes.find({"name": "Loader Curry"})) == ["Indian", "Thai"]
+
+
+def test_repeated_keys_are_written_once(tmp_path):
+    # Spread over concurrent batches, a repeated new key could be inserted twice.
+    db = get_db()
+    db.recipes.delete_many({})
+    records = [{"name": "Loader Twin", "steps": [f"step {i}"]} for i in range(12)]
+
+    checkpoint = Checkpoint(str(tmp_path / "cp"))
+    totals = load(iter(records), db.recipes, batch_size=2, workers=4, checkpoint=checkpoint)
+    assert (totals["upserted"], totals["duplicates"], totals["invalid"]) == (1, 11, 0)
+    assert db.recipes.find_one({"name": "Loader Twin"})["steps"] == ["step 0"]
+    assert checkpoint.position == 12
@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+from backend.app.metrics import RequestStats, _current, command_timer, registry
+
+
+def test_server_timing_header(client):
+    resp = client.get("/health")
+    assert resp.status_code == 200
+    timing = resp.headers["Server-Timing"]
+    assert timing.startswith("app;dur=")
+    assert "db;dur=" in timing
+
+
+def test_metrics_endpoint_has_route_histograms(client):
+    registry.reset()
+    client.get("/health")
+    client.get("/health")
+    client.get("/recipes/000000000000000000000000")
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/plain"
+    body = resp.get_data(as_text=True)
+
+    assert '# TYPE kitchen_request_duration_seconds histogram' in body
+    assert 'kitchen_request_duration_seconds_count{method="GET",route="/health"} 2' in body
+    assert 'kitchen_request_duration_seconds_bucket{method="GET",route="/health",le="+Inf"} 2' in body
+    assert ('kitchen_responses_total{method="GET",route="/recipes/<string:recipe_id>",status="404"} 1'
+            in body)
+
+
+def test_command_listener_attributes_to_current_request():
+    stats = RequestStats()
+    _current.set(stats)
+    try:
+        command_timer.succeeded(SimpleNamespace(duration_micros=1500))
+        command_timer.failed(SimpleNamespace(duration_micros=500))
+    finally:
+        _current.set(None)
+
+    assert stats.db_commands == 2
+    assert abs(stats.db_seconds - 0.002) < 1e-9
+
+    # Outside a request nothing is recorded (and nothing raises).
+    command_timer.succeeded(SimpleNamespace(duration_micros=1500))
+    command_timer.failed(SimpleNamespace(duration_micros=500))
+    assert _current.get() is None
+    assert stats.db_commands == 2
+    assert abs(stats.db_seconds - 0.002) < 1e-9
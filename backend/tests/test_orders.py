@@ -0,0 +1,267 @@
+import threading
+import time
+from uuid import uuid4
+
+import pytest
+from bson import ObjectId
+from pymongo.errors import PyMongoError, ServerSelectionTimeoutError
+
+import backend.app.features.orders.forwarder as forwarder_module
+from backend.app.db import get_db
+from backend.app.features.orders.forwarder import FAILED, FORWARDED, QUEUED, OrderForwarder, claim_batch
+from backend.scripts.fake_vendor import FakeVendor
+
+
+@pytest.fixture(autouse=True)
+def signed_in(client, login_as):
+    login_as(client, "user-1")
+
+
+@pytest.fixture
+def vendor():
+    """A fake vendor registered in vendors, with two mapped ingredients."""
+    db = get_db()
+    db.orders.delete_many({})
+    fake = FakeVendor(skus=10)
+    url = fake.start()
+    vendor_id = db.vendors.insert_one({"name": f"fake-{uuid4().hex}", "catalog_url": url,
+                                       "api_enabled": True}).inserted_id
+    ingredients = [str(ObjectId()), str(ObjectId())]
+    db.vendor_products.insert_many([
+        {"vendor_id": vendor_id, "vendor_sku": f"SKU-{i}", "ingredient_id": ObjectId(iid), "available": True}
+        for i, iid in enumerate(ingredients)
+    ])
+    yield fake, str(vendor_id), ingredients
+    fake.stop()
+
+
+def _place(client, vendor_id, ingredients, user="user-1"):
+    resp = client.post("/orders", json={
+        "user_id": user,
+        "vendor_id": vendor_id,
+        "items": [{"ingredient_id": iid, "quantity": 2} for iid in ingredients],
+    })
+    assert resp.status_code == 202
+    return resp.get_json()["id"]
+
+
+def _forwarder(**kwargs):
+    kwargs.setdefault("workers", 2)
+    kwargs.setdefault("batch_size", 5)
+    return OrderForwarder(get_db(), **kwargs)
+
+
+def test_placing_an_order_is_one_insert(client, db_calls, vendor):
+    _, vendor_id, ingredients = vendor
+    order_id = _place(client, vendor_id, ingredients)
+    assert db_calls.calls == ["orders.insert_one"]
+
+    order = client.get(f"/orders/{order_id}").get_json()
+    assert order["status"] == QUEUED
+    assert order["items"] == [{"ingredient_id": iid, "quantity": 2} for iid in ingredients]
+    assert [o["id"] for o in client.get("/orders?user_id=user-1").get_json()] == [order_id]
+
+
+def test_orders_belong_to_their_user(app, client, login_as, vendor):
+    _, vendor_id, ingredients = vendor
+    # user_id defaults to the token's user.
+    resp = client.post("/orders", json={"vendor_id": vendor_id, "items": [{"ingredient_id": ingredients[0]}]})
+    assert resp.get_json()["user_id"] == "user-1"
+    order_id = resp.get_json()["id"]
+
+    assert app.test_client().get(f"/orders/{order_id}").status_code == 401
+    other = login_as(app.test_client(), "user-2")
+    assert other.get(f"/orders/{order_id}").status_code == 403
+    assert other.get("/orders?user_id=user-1").status_code == 403
+    assert other.post("/orders", json={"user_id": "user-1", "vendor_id": vendor_id,
+                                       "items": [{"ingredient_id": ingredients[0]}]}).status_code == 403
+    assert other.get("/orders").get_json() == []
+    admin = login_as(app.test_client(), "admin-1", "admin")
+    assert admin.get(f"/orders/{order_id}").status_code == 200
+
+
+def test_order_validation(client):
+    vendor_id, iid = str(ObjectId()), str(ObjectId())
+    no_user = {"user_id": "", "vendor_id": vendor_id, "items": [{"ingredient_id": iid}]}
+    assert client.post("/orders", json=no_user).status_code == 400
+    bad_vendor = {"user_id": "u", "vendor_id": "x", "items": [{"ingredient_id": iid}]}
+    assert client.post("/orders", json=bad_vendor).status_code == 400
+    assert client.post("/orders", json={"user_id": "u", "vendor_id": vendor_id, "items": []}).status_code == 400
+    bad_quantity = {"user_id": "u", "vendor_id": vendor_id, "items": [{"ingredient_id": iid, "quantity": 0}]}
+    assert client.post("/orders", json=bad_quantity).status_code == 400
+    assert client.get("/orders/nope").status_code == 400
+    assert client.get(f"/orders/{ObjectId()}").status_code == 404
+
+
+def test_orders_are_forwarded_in_vendor_batches(client, vendor):
+    fake, vendor_id, ingredients = vendor
+    ids = [_place(client, vendor_id, ingredients) for _ in range(12)]
+
+    forwarder = _forwarder()
+    assert forwarder.drain() == 12
+    forwarder.close()
+
+    orders = [client.get(f"/orders/{i}").get_json() for i in ids]
+    assert {o["status"] for o in orders} == {FORWARDED}
+    assert all(o["vendor_order_reference"] == fake.orders[o["id"]]["reference"] for o in orders)
+    assert fake.orders[ids[0]]["items"] == [{"sku": "SKU-0", "quantity": 2}, {"sku": "SKU-1", "quantity": 2}]
+    # 12 orders at batch_size=5 is 3 vendor calls, give or take a split claim.
+    assert fake.order_batches <= 4
+
+
+def test_transient_vendor_errors_are_retried(client, vendor, monkeypatch):
+    fake, vendor_id, ingredients = vendor
+    monkeypatch.setattr(forwarder_module, "ORDER_RETRY_BASE", 0)
+    fake.fail_rate = 0.5
+    ids = [_place(client, vendor_id, ingredients) for _ in range(6)]
+
+    forwarder = _forwarder(batch_size=2, max_attempts=20)
+    forwarder.drain()
+    forwarder.close()
+
+    assert forwarder.stats["retried"] > 0
+    assert {client.get(f"/orders/{i}").get_json()["status"] for i in ids} == {FORWARDED}
+    assert len(fake.orders) == 6
+
+
+def test_gives_up_after_max_attempts(client, vendor, monkeypatch):
+    fake, vendor_id, ingredients = vendor
+    monkeypatch.setattr(forwarder_module, "ORDER_RETRY_BASE", 0)
+    fake.fail_rate = 1.0
+    order_id = _place(client, vendor_id, ingredients)
+
+    forwarder = _forwarder(max_attempts=3)
+    forwarder.drain()
+    forwarder.close()
+
+    order = client.get(f"/orders/{order_id}").get_json()
+    assert order["status"] == FAILED
+    assert order["attempts"] == 3
+    assert "503" in order["last_error"]
+
+
+def test_backoff_delays_the_next_attempt(client, vendor):
+    fake, vendor_id, ingredients = vendor
+    fake.fail_rate = 1.0
+    order_id = _place(client, vendor_id, ingredients)
+
+    forwarder = _forwarder()
+    assert forwarder.drain() == 1  # not claimable again until its backoff passes
+    forwarder.close()
+    doc = get_db().orders.find_one({"_id": ObjectId(order_id)})
+    assert doc["status"] == QUEUED
+    assert doc["available_at"] > doc["updated_at"]
+
+
+def test_unmapped_ingredients_fail_the_order(client, vendor):
+    _, vendor_id, ingredients = vendor
+    unknown = str(ObjectId())
+    bad = _place(client, vendor_id, [ingredients[0], unknown])
+    good = _place(client, vendor_id, ingredients)
+
+    _forwarder().drain()
+
+    assert client.get(f"/orders/{good}").get_json()["status"] == FORWARDED
+    order = client.get(f"/orders/{bad}").get_json()
+    assert order["status"] == FAILED
+    assert unknown in order["last_error"]
+
+
+def test_expired_lease_is_reclaimed(client, vendor):
+    _, vendor_id, ingredients = vendor
+    order_id = _place(client, vendor_id, ingredients)
+
+    # A worker claims with a lease that is already over, then "dies".
+    stale = claim_batch(get_db(), batch_size=5, lease=0)
+    assert [str(o["_id"]) for o in stale] == [order_id]
+
+    _forwarder().drain()
+    order = client.get(f"/orders/{order_id}").get_json()
+    assert order["status"] == FORWARDED
+    assert order["attempts"] == 2
+
+    # The stale worker's late outcome no longer matches the lease token.
+    res = get_db().orders.update_one({"_id": stale[0]["_id"], "lease_token": stale[0]["lease_token"]},
+                                     {"$set": {"status": FAILED}})
+    assert res.matched_count == 0
+
+
+def test_slow_vendor_does_not_slow_checkout(client, vendor):
+    fake, vendor_id, ingredients = vendor
+    fake.latency = 1.0
+    forwarder = _forwarder(poll_interval=0.05)
+    stop = threading.Event()
+    worker = threading.Thread(target=forwarder.run, args=(stop,), daemon=True)
+    worker.start()
+    try:
+        timings, ids = [], []
+        for _ in range(5):
+            started = time.perf_counter()
+            ids.append(_place(client, vendor_id, ingredients))
+            timings.append(time.perf_counter() - started)
+        assert max(timings) < 0.5
+
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            if get_db().orders.count_documents({"status": FORWARDED}) == len(ids):
+                break
+            time.sleep(0.05)
+        assert get_db().orders.count_documents({"status": FORWARDED}) == len(ids)
+    finally:
+        stop.set()
+        worker.join()
+        forwarder.close()
+
+
+@pytest.mark.parametrize("error", [ServerSelectionTimeoutError("no primary"), KeyError("bug")])
+def test_worker_errors_are_logged_and_counted(caplog, error):
+    forwarder = _forwarder(workers=1, poll_interval=0.01)
+    stop = threading.Event()
+    calls = []
+
+    def run_once():
+        calls.append(1)
+        if len(calls) == 3:
+            stop.set()
+        raise error
+
+    forwarder.run_once = run_once
+    with caplog.at_level("WARNING", logger=forwarder_module.__name__):
+        forwarder.run(stop)
+
+    assert forwarder.stats["errors"] == len(calls) == 3
+    assert len(caplog.records) == 3
+    assert caplog.records[0].levelname == ("WARNING" if isinstance(error, PyMongoError) else "ERROR")
+
+
+class _OddVendor:
+    def post(self, path, body):
+        return ["not", "an", "object"]
+
+
+def test_malformed_vendor_response_is_retried_then_failed(client, vendor, monkeypatch):
+    _, vendor_id, ingredients = vendor
+    monkeypatch.setattr(forwarder_module, "ORDER_RETRY_BASE", 0)
+    order_id = _place(client, vendor_id, ingredients)
+
+    forwarder = _forwarder(max_attempts=2)
+    monkeypatch.setattr(forwarder, "_client", lambda url: _OddVendor())
+    forwarder.drain()
+
+    order = client.get(f"/orders/{order_id}").get_json()
+    assert order["status"] == FAILED
+    assert order["attempts"] == 2
+    assert "unexpected response" in order["last_error"]
+
+
+def test_orders_whose_leases_keep_expiring_are_failed(client, vendor):
+    fake, vendor_id, ingredients = vendor
+    order_id = _place(client, vendor_id, ingredients)
+    for _ in range(3):  # three workers died mid-send
+        assert claim_batch(get_db(), lease=0)
+
+    _forwarder(max_attempts=3).drain()
+    order = client.get(f"/orders/{order_id}").get_json()
+    assert order["status"] == FAILED
+    assert "No outcome after 3 attempts" in order["last_error"]
+    assert order_id not in fake.orders
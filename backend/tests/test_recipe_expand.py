@@ -0,0 +1,60 @@
+from backend.app.cache import ingredient_cache
+
+
+def _create_ingredient(client, name):
+    return client.post("/ingredients", json={"name": name, "category": "spice"}).get_json()
+
+
+def test_expand_resolves_ids_and_names_in_one_query(client, db_calls):
+    cumin = _create_ingredient(client, "Expand Cumin")
+    _create_ingredient(client, "Expand Salt")
+    for i in range(5):
+        client.post("/recipes", json={
+            "name": f"Expand {i}", "cuisine": "Expand Test",
+            "ingredients": [
+                {"ingredient_id": cumin["id"], "quantity": 1, "unit": "tsp"},
+                "Expand Salt",
+                "unknown thing",
+            ],
+        })
+    ingredient_cache.clear()
+    db_calls.reset()
+
+    res = client.get("/recipes?cuisine=Expand%20Test&expand=ingredients")
+
+    assert res.status_code == 200
+    assert db_calls.calls == ["recipes.find", "ingredients.find"]
+    for recipe in res.get_json()["recipes"]:
+        by_id, by_name, unknown = recipe["ingredients"]
+        assert by_id == {
+            "ingredient_id": cumin["id"], "quantity": 1, "unit": "tsp", "ingredient": cumin,
+        }
+        assert by_name["name"] == "Expand Salt"
+        assert by_name["ingredient"]["category"] == "spice"
+        assert unknown == {"name": "unknown thing", "ingredient": None}
+
+    # Resolved and unresolved references are both cached now.
+    db_calls.reset()
+    client.get("/recipes?cuisine=Expand%20Test&expand=ingredients")
+    assert db_calls.calls == ["recipes.find"]
+
+
+def test_expand_on_single_recipe_sees_ingredient_updates(client):
+    garlic = _create_ingredient(client, "Expand Garlic")
+    recipe = client.post("/recipes", json={
+        "name": "Expand One", "ingredients": [{"ingredient_id": garlic["id"]}],
+    }).get_json()
+
+    first = client.get(f"/recipes/{recipe['_id']}?expand=ingredients").get_json()
+    assert first["ingredients"][0]["ingredient"]["name"] == "Expand Garlic"
+
+    client.put(f"/ingredients/{garlic['id']}", json={"notes": "minced"})
+    again = client.get(f"/recipes/{recipe['_id']}?expand=ingredients").get_json()
+    assert again["ingredients"][0]["ingredient"]["notes"] == "minced"
+
+    plain = client.get(f"/recipes/{recipe['_id']}").get_json()
+    assert plain["ingredients"] == [{"ingredient_id": garlic["id"]}]
+
+
+def test_expand_rejects_unknown_values(client):
+    assert client.get("/recipes?expand=steps").status_code == 400
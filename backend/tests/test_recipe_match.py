@@ -0,0 +1,127 @@
+from array import array
+
+from backend.app.main import create_app
+from backend.app.db import get_db
+from backend.app.features.recipes.ingredient_index import IngredientIndex, intersect_postings
+
+
+def _client():
+    get_db().recipes.delete_many({})
+    return create_app().test_client()
+
+
+def test_intersect_postings():
+    a = array("I", [1, 3, 5, 7, 9])
+    b = array("I", [3, 4, 5, 9])
+    c = array("I", [5, 9, 11])
+    assert list(intersect_postings([a, b, c])) == [5, 9]
+    assert list(intersect_postings([a, array("I")])) == []
+
+
+def test_index_ranks_by_coverage():
+    index = IngredientIndex()
+    index.add("r1", ["Tomato", "egg"])
+    index.add("r2", ["tomato", "egg", "salt", "oil"])
+    index.add("r3", ["pasta", "garlic"])
+
+    ranked = index.match(["tomato", "egg"], k=5)
+    assert [m["recipe_id"] for m in ranked] == ["r1", "r2"]
+    assert ranked[0]["coverage"] == 1.0
+    assert ranked[1]["missing"] == ["oil", "salt"]
+
+
+def test_index_tracks_updates_and_removals():
+    index = IngredientIndex()
+    index.add("r1", ["tomato"])
+    index.update("r1", ["garlic"])
+    assert index.match(["tomato"]) == []
+    assert index.match(["garlic"])[0]["recipe_id"] == "r1"
+
+    index.remove("r1")
+    assert index.match(["garlic"]) == []
+    assert len(index) == 0
+
+
+def test_match_endpoint_follows_writes():
+    client = _client()
+
+    r1 = client.post("/recipes", json={"name": "Tomato Egg", "ingredients": ["tomato", "egg"]}).get_json()
+    r2 = client.post("/recipes", json={"name": "Omelette", "ingredients": ["egg", "milk", "butter"]}).get_json()
+
+    resp = client.get("/recipes/match?ingredients=tomato,egg")
+    assert resp.status_code == 200
+    matches = resp.get_json()["matches"]
+    assert [m["_id"] for m in matches] == [r1["_id"], r2["_id"]]
+    assert matches[0]["name"] == "Tomato Egg"
+    assert matches[0]["coverage"] == 1.0
+
+    resp = client.get("/recipes/match?ingredients=tomato,egg&all=true")
+    assert [m["_id"] for m in resp.get_json()["matches"]] == [r1["_id"]]
+
+    client.patch(f"/recipes/{r2['_id']}", json={"ingredients": ["egg", "tomato"]})
+    client.delete(f"/recipes/{r1['_id']}")
+    matches = client.get("/recipes/match?ingredients=tomato,egg").get_json()["matches"]
+    assert [m["_id"] for m in matches] == [r2["_id"]]
+
+
+def test_match_endpoint_requires_ingredients():
+    client = _client()
+    assert client.get("/recipes/match").status_code == 400
+
+
+def test_index_reuses_slots_across_churn():
+    index = IngredientIndex()
+    index.add("r1", ["tomato"])
+    index.add("r2", ["egg"])
+    for i in range(101):
+        index.update("r1", ["garlic"] if i % 2 else ["tomato", "basil"])
+        index.remove("r2")
+        index.add("r2", ["egg", "tomato"])
+    assert len(index._recipe_ids) == 2
+    assert sorted(index._postings) == ["basil", "egg", "tomato"]
+    assert [m["recipe_id"] for m in index.match(["tomato", "basil"])] == ["r1", "r2"]
+    assert list(index._postings["tomato"]) == sorted(index._postings["tomato"])
+
+
+def test_index_matches_ingredient_objects():
+    index = IngredientIndex()
+    index.add("r1", [{"name": "Cumin", "quantity": 1}, {"ingredient_id": "65a1b2c3d4e5f6a7b8c9d0e1"}, "salt"])
+    ranked = index.match(["cumin", "65a1b2c3d4e5f6a7b8c9d0e1"])
+    assert ranked[0]["recipe_id"] == "r1"
+    assert ranked[0]["missing"] == ["salt"]
+
+
+def test_index_picks_up_other_processes_writes_after_max_age():
+    db = get_db()
+    now = [0.0]
+    index = IngredientIndex(max_age=60, clock=lambda: now[0])
+    index.refresh(db)
+    # Written by another worker or the loader: this process never sees the insert.
+    oid = db.recipes.insert_one({"name": "Elsewhere", "ingredients": ["sumac-elsewhere"]}).inserted_id
+
+    index.refresh(db)
+    assert index.match(["sumac-elsewhere"]) == []
+    now[0] = 61.0
+    index.refresh(db)
+    assert [m["recipe_id"] for m in index.match(["sumac-elsewhere"])] == [str(oid)]
+    assert index.rebuilds == 2
+
+
+def test_writes_during_a_rebuild_are_kept():
+    index = IngredientIndex()
+
+    class Recipes:
+        def find(self, *args):
+            return self
+
+        def sort(self, *args):
+            yield {"_id": "r1", "ingredients": ["tomato"]}
+            index.add("r2", ["tomato", "egg"])  # a write handler runs mid-build
+            index.remove("r1")
+            yield {"_id": "r3", "ingredients": ["egg"]}
+
+    class Db:
+        recipes = Recipes()
+
+    index.rebuild(Db())
+    assert sorted(m["recipe_id"] for m in index.match(["tomato", "egg"])) == ["r2", "r3"]
@@ -93,3 +93,92 @@ def test_delete_recipe_removes_it():
     # confirm gone
     resp2 = client.get(f"/recipes/{rid}")
     assert resp2.status_code == 404
+
+def test_get_recipes_paginates_with_next_link():
+    _clear_recipes()
+    client = _client()
+
+    created = [client.post("/recipes", json={"name": f"R{i}"}).get_json() for i in range(5)]
+    newest_first = [r["_id"] for r in reversed(created)]
+
+    resp = client.get("/recipes?limit=2")
+    assert resp.status_code == 200
+    page1 = resp.get_json()
+    assert [r["_id"] for r in page1["recipes"]] == newest_first[:2]
+    assert "next" in page1["_links"]
+
+    page2 = client.get(page1["_links"]["next"]["href"]).get_json()
+    assert [r["_id"] for r in page2["recipes"]] == newest_first[2:4]
+
+    page3 = client.get(page2["_links"]["next"]["href"]).get_json()
+    assert [r["_id"] for r in page3["recipes"]] == newest_first[4:]
+    assert "next" not in page3["_links"]
+
+def test_get_recipes_fields_projection():
+    _clear_recipes()
+    client = _client()
+
+    client.post("/recipes", json={"name": "Soup", "steps": ["boil"], "ingredients": ["water"]})
+
+    resp = client.get("/recipes?fields=name")
+    assert resp.status_code == 200
+    recipe = resp.get_json()["recipes"][0]
+    assert set(recipe) == {"_id", "name"}
+
+def test_get_recipes_rejects_bad_query_params():
+    client = _client()
+
+    assert client.get("/recipes?limit=0").status_code == 400
+    assert client.get("/recipes?limit=abc").status_code == 400
+    assert client.get("/recipes?after=not-an-id").status_code == 400
+    assert client.get("/recipes?fields=password").status_code == 400
+
+def test_get_recipes_filters_by_cuisine_tag_and_ingredients():
+    _clear_recipes()
+    client = _client()
+
+    a = client.post("/recipes", json={
+        "name": "Mapo Tofu", "cuisine": "Chinese",
+        "ingredients": ["tofu", "chili"], "tags": ["spicy", "dinner"],
+    }).get_json()
+    b = client.post("/recipes", json={
+        "name": "Tomato Egg", "cuisine": "Chinese",
+        "ingredients": ["tomato", "egg"], "tags": ["quick", "dinner"],
+    }).get_json()
+    client.post("/recipes", json={
+        "name": "Tacos", "cuisine": "Mexican",
+        "ingredients": ["tortilla", "chili"], "tags": ["spicy"],
+    })
+
+    def ids(url):
+        resp = client.get(url)
+        assert resp.status_code == 200
+        return [r["_id"] for r in resp.get_json()["recipes"]]
+
+    assert ids("/recipes?cuisine=Chinese") == [b["_id"], a["_id"]]
+    assert ids("/recipes?cuisine=Chinese&tag=spicy&tag=dinner") == [a["_id"]]
+    assert ids("/recipes?tag=spicy,dinner") == [a["_id"]]
+    assert ids("/recipes?cuisine=Chinese&has=chili") == [a["_id"]]
+    assert ids("/recipes?cuisine=Chinese&without=chili") == [b["_id"]]
+
+def test_get_recipes_sort_by_name_paginates():
+    _clear_recipes()
+    client = _client()
+    for name in ("Cabbage", "Apple Pie", "Beet Salad"):
+        client.post("/recipes", json={"name": name, "tags": ["veg"]})
+
+    page1 = client.get("/recipes?sort=name&limit=2&tag=veg").get_json()
+    assert [r["name"] for r in page1["recipes"]] == ["Apple Pie", "Beet Salad"]
+    next_href = page1["_links"]["next"]["href"]
+    assert "tag=veg" in next_href and "sort=name" in next_href
+
+    page2 = client.get(next_href).get_json()
+    assert [r["name"] for r in page2["recipes"]] == ["Cabbage"]
+
+    desc = client.get("/recipes?sort=-name").get_json()
+    assert [r["name"] for r in desc["recipes"]] == ["Cabbage", "Beet Salad", "Apple Pie"]
+
+def test_get_recipes_rejects_bad_filters():
+    client = _client()
+    assert client.get("/recipes?sort=calories").status_code == 400
+    assert client.get("/recipes?has=egg&without=egg").status_code == 400
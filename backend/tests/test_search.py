@@ -0,0 +1,150 @@
+import threading
+import time
+
+import backend.app.features.search.index as search_module
+from backend.app.features.search.index import SearchIndex, prefix_distance
+
+
+def _index():
+    index = SearchIndex()
+    index.put("recipe", "r1", "Tomato Egg Stir Fry")
+    index.put("recipe", "r2", "Tomato Soup")
+    index.put("ingredient", "i1", "Tomato", ["roma"])
+    index.put("ingredient", "i2", "Garlic")
+    index.put("cuisine", "c1", "Chinese", ["chinese-food"])
+    return index
+
+
+def test_prefix_distance():
+    assert prefix_distance("tom", "tomato", 1) == 0
+    assert prefix_distance("tmo", "tomato", 1) == 1
+    assert prefix_distance("xyz", "tomato", 1) == 2
+
+
+def test_prefix_search_ranks_exact_words_first():
+    results = _index().search("tomato")
+    assert results[0]["id"] == "i1"
+    assert {r["id"] for r in results} == {"i1", "r1", "r2"}
+
+
+def test_multi_word_queries_match_all_words():
+    results = _index().search("tom eg")
+    assert [r["id"] for r in results] == ["r1"]
+
+
+def test_typo_tolerance_and_aliases():
+    index = _index()
+    assert [r["id"] for r in index.search("garlci")] == ["i2"]
+    assert index.search("garlci", fuzzy=False) == []
+    assert [r["id"] for r in index.search("roma")] == ["i1"]
+
+
+def test_type_filter_and_removal():
+    index = _index()
+    assert [r["id"] for r in index.search("tomato", kinds={"ingredient"})] == ["i1"]
+
+    index.remove("ingredient", "i1")
+    assert "i1" not in {r["id"] for r in index.search("tomato")}
+    assert index.search("roma", fuzzy=False) == []
+
+
+def test_common_words_read_only_the_head_of_their_postings(monkeypatch):
+    index = SearchIndex()
+    for i in range(3000):
+        index.put("recipe", f"r{i}", f"Chicken with {'x' * (i % 50)} sauce {i}")
+    index.put("ingredient", "i1", "Chicken")
+    index.put("recipe", "short", "Chicken Pie")
+
+    results = index.search("chicken", limit=3)
+    assert [r["id"] for r in results[:2]] == ["i1", "short"]
+    assert len(results) == 3
+
+    # Entries past the scan cap are not read, even when filtered out.
+    monkeypatch.setattr(search_module, "ENTRY_SCAN_CAP", 2)
+    assert [r["id"] for r in index.search("chicken", kinds={"recipe"})] == ["short"]
+
+
+def test_search_endpoint_tracks_writes(client):
+    recipe = client.post("/recipes", json={"name": "Zucchini Fritters"}).get_json()
+    cuisine = client.post("/cuisines", json={"name": "Zanzibari"}).get_json()
+
+    resp = client.get("/search?q=zuc")
+    assert resp.status_code == 200
+    assert recipe["_id"] in {r["id"] for r in resp.get_json()["results"]}
+
+    client.patch(f"/recipes/{recipe['_id']}", json={"name": "Courgette Fritters"})
+    assert recipe["_id"] not in {r["id"] for r in client.get("/search?q=zuc").get_json()["results"]}
+
+    hits = client.get("/search?q=zanzi&type=cuisine").get_json()["results"]
+    assert [r["id"] for r in hits] == [cuisine["_id"]]
+    client.delete(f"/cuisines/{cuisine['_id']}")
+    assert client.get("/search?q=zanzi&type=cuisine").get_json()["results"] == []
+
+
+def test_search_endpoint_validates_params(client):
+    assert client.get("/search").status_code == 400
+    assert client.get("/search?q=a&limit=0").status_code == 400
+    assert client.get("/search?q=a&type=user").status_code == 400
+
+
+class _Collection:
+    def __init__(self, docs, on_read=None):
+        self.docs, self.on_read, self.reads = docs, on_read, 0
+
+    def find(self, *args):
+        self.reads += 1
+        for doc in self.docs:
+            if self.on_read:
+                self.on_read()
+            yield doc
+
+
+class _Db:
+    def __init__(self, recipes, on_read=None):
+        self.recipes = _Collection(recipes, on_read)
+        self.ingredients = _Collection([])
+        self.cuisines = _Collection([])
+
+
+def test_concurrent_first_searches_build_once():
+    db = _Db([{"_id": "r1", "name": "Tomato Soup"}], on_read=lambda: time.sleep(0.2))
+    index = SearchIndex()
+    threads = [threading.Thread(target=index.refresh, args=(db,)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert index.rebuilds == 1
+    assert db.recipes.reads == 1
+
+
+def test_rebuilds_pick_up_other_processes_writes_and_keep_own():
+    now = [0.0]
+    index = SearchIndex(max_age=60, clock=lambda: now[0])
+    docs = [{"_id": "r1", "name": "Tomato Soup"}]
+    db = _Db(docs)
+    index.refresh(db)
+    docs.append({"_id": "r2", "name": "Tomato Tart"})  # written by another worker
+
+    index.refresh(db)
+    assert [r["id"] for r in index.search("tart")] == []
+    now[0] = 61.0
+    # This process writes while the rebuild is reading.
+    db.recipes.on_read = lambda: index.put("recipe", "r3", "Tomato Pie")
+    index.refresh(db)
+    assert sorted(r["id"] for r in index.search("tomato")) == ["r1", "r2", "r3"]
+
+
+def test_non_ascii_labels_are_searchable():
+    index = SearchIndex()
+    index.put("recipe", "r1", "Crème Brûlée")
+    index.put("recipe", "r2", "麻婆豆腐")
+    index.put("ingredient", "i1", "Straße Spätzle")
+    index.put("recipe", "r3", "Ψητό κοτόπουλο")
+
+    for q in ("creme brulee", "Crème", "BRÛ"):
+        assert [r["id"] for r in index.search(q)] == ["r1"], q
+    assert [r["id"] for r in index.search("麻婆")] == ["r2"]
+    assert [r["id"] for r in index.search("strasse spatz")] == ["i1"]
+    assert [r["id"] for r in index.search("κοτοπουλο")] == ["r3"]
+    assert search_module.tokenize("Crème brûlée") == ["creme", "brulee"]
@@ -0,0 +1,83 @@
+import pytest
+from bson import ObjectId
+
+from backend.app.db import get_db
+from backend.app.utils.http_client import HTTPError, PooledHTTPClient
+from backend.scripts.fake_vendor import FakeVendor
+from backend.scripts.sync_vendor_products import sync_vendor
+
+
+@pytest.fixture
+def vendor():
+    fake = FakeVendor(skus=300, change_rate=0.1)
+    url = fake.start()
+    yield fake, url
+    fake.stop()
+
+
+def _sync(db, vendor_id, url, **kwargs):
+    client = PooledHTTPClient(url, pool_size=4, sleep=lambda s: None)
+    try:
+        return sync_vendor(db, vendor_id, client, page_size=40, concurrency=4, batch_size=50, **kwargs)
+    finally:
+        client.close()
+
+
+def test_sync_writes_only_changes(vendor):
+    fake, url = vendor
+    db = get_db()
+    vendor_id = ObjectId()
+
+    first = _sync(db, vendor_id, url)
+    assert first["items"] == 300
+    assert first["upserted"] == 300
+    assert db.vendor_products.count_documents({"vendor_id": vendor_id}) == 300
+
+    again = _sync(db, vendor_id, url)
+    assert again["unchanged"] == 300
+    assert again["upserted"] == again["modified"] == 0
+
+    fake.version = 1
+    changed = _sync(db, vendor_id, url)
+    expected = sum(fake.item(i)["price"] != FakeVendor(change_rate=0.1).item(i)["price"] for i in range(300))
+    assert 0 < expected < 300
+    assert changed["modified"] == expected
+    assert changed["unchanged"] == 300 - expected
+
+    row = db.vendor_products.find_one({"vendor_id": vendor_id, "vendor_sku": "SKU-0000001"})
+    assert row["price_snapshot"]["currency"] == "USD"
+    assert row["last_synced_at"] is not None
+
+
+def test_removed_skus_are_marked_unavailable(vendor):
+    fake, url = vendor
+    db = get_db()
+    vendor_id = ObjectId()
+    _sync(db, vendor_id, url)
+
+    fake.removed = {0, 1, 2}
+    totals = _sync(db, vendor_id, url)
+
+    assert totals["removed"] == 3
+    assert db.vendor_products.count_documents({"vendor_id": vendor_id, "available": False}) == 3
+
+
+def test_sync_retries_through_transient_errors(vendor):
+    fake, url = vendor
+    fake.fail_rate = 0.3
+    totals = _sync(get_db(), ObjectId(), url)
+
+    assert totals["failed_pages"] == 0
+    assert totals["upserted"] == 300
+    assert totals["http_retries"] > 0
+
+
+def test_client_gives_up_after_max_retries(vendor):
+    fake, url = vendor
+    fake.fail_rate = 1.0
+    client = PooledHTTPClient(url, max_retries=2, sleep=lambda s: None)
+
+    with pytest.raises(HTTPError) as exc:
+        client.get("/catalog")
+    assert exc.value.status == 503
+    assert client.requests == 3
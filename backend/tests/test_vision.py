@@ -0,0 +1,235 @@
+import io
+import os
+import pickle
+import time
+from uuid import uuid4
+
+import pytest
+
+import backend.app.features.vision.routes as vision_routes
+from backend.app.db import get_db
+from backend.app.features.vision.detector import StubDetector, run_detection
+from backend.app.features.vision.pipeline import DetectionPipeline
+from backend.app.features.vision.sources import GridFSSource
+from backend.app.features.vision.storage import DiskStorage, GridFSStorage, UploadTooLarge
+from backend.app.security import issue_token
+
+
+class SlowDetector:
+    model_version = "slow-1"
+
+    def detect(self, data: bytes) -> list[dict]:
+        time.sleep(1.0)
+        return StubDetector().detect(data)
+
+
+class BrokenDetector:
+    model_version = "broken-1"
+
+    def detect(self, data: bytes) -> list[dict]:
+        raise RuntimeError("model weights missing")
+
+
+@pytest.fixture(autouse=True)
+def signed_in(client, login_as):
+    # Polls read every user's uploads; each upload sends its own user's token.
+    login_as(client, "admin-1", "admin")
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    disk = DiskStorage(str(tmp_path))
+    monkeypatch.setattr(vision_routes, "storage", disk)
+    return disk
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    pipelines = []
+
+    def use(detector="backend.app.features.vision.detector:StubDetector"):
+        p = DetectionPipeline(workers=1, detector=detector)
+        monkeypatch.setattr(vision_routes, "pipeline", p)
+        pipelines.append(p)
+        return p
+
+    yield use
+    for p in pipelines:
+        p.shutdown()
+
+
+def _image() -> bytes:
+    return b"\x89PNG\r\n\x1a\n" + uuid4().bytes * 4096
+
+
+def _upload(client, data, user="user-1"):
+    return client.post("/vision/upload", data=data, content_type="image/png",
+                       headers={"Authorization": f"Bearer {issue_token(user, 'user')}"})
+
+
+def _wait_for_results(client, image_id, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        resp = client.get(f"/vision/{image_id}/results")
+        if resp.status_code != 202:
+            return resp.get_json()
+        assert resp.headers["Retry-After"] == "1"
+        time.sleep(0.05)
+    raise AssertionError("detection did not finish")
+
+
+def test_upload_is_streamed_stored_and_detected(client, storage, pipeline):
+    pipeline()
+    data = _image()
+    resp = _upload(client, data)
+    assert resp.status_code == 202
+    upload = resp.get_json()
+    assert upload["status"] == "queued"
+    assert upload["size"] == len(data)
+    with open(storage.source(upload["content_hash"]), "rb") as f:
+        assert f.read() == data
+
+    result = _wait_for_results(client, upload["id"])
+    assert result["status"] == "done"
+    assert result["model_version"] == StubDetector.model_version
+    expected = sorted(StubDetector().detect(data), key=lambda d: -d["confidence"])
+    assert [(d["name"], d["confidence"]) for d in result["detections"]] == \
+        [(d["name"], d["confidence"]) for d in expected]
+    assert client.get(f"/vision/{upload['id']}/status").get_json()["status"] == "done"
+
+
+def test_duplicate_images_reuse_detections(client, storage, pipeline):
+    p = pipeline()
+    data = _image()
+    first = _upload(client, data).get_json()
+    # Still queued: the second upload waits on the same run.
+    second = _upload(client, data, user="user-2").get_json()
+    assert second["status"] == "queued"
+    assert p.submitted == 1
+
+    assert _wait_for_results(client, second["id"])["status"] == "done"
+    third = _upload(client, data)
+    assert third.status_code == 200
+    assert third.get_json()["status"] == "done"
+    assert p.submitted == 1
+    assert _wait_for_results(client, first["id"])["detections"] == \
+        _wait_for_results(client, third.get_json()["id"])["detections"]
+    assert len(os.listdir(os.path.dirname(storage.source(first["content_hash"])))) == 1
+
+
+class LostPipeline:
+    """Accepts runs and never finishes them, like a process that died."""
+
+    submitted = 0
+
+    def submit(self, db, image_id, content_hash, source):
+        self.submitted += 1
+
+
+def test_lost_runs_are_resubmitted_when_stale(client, storage, pipeline, monkeypatch):
+    lost = LostPipeline()
+    monkeypatch.setattr(vision_routes, "pipeline", lost)
+    data = _image()
+    first = _upload(client, data).get_json()
+    second = _upload(client, data, user="user-2").get_json()
+    assert second["status"] == "queued"
+    assert lost.submitted == 1
+
+    # Past the timeout, a new upload of the same bytes runs detection again.
+    monkeypatch.setattr(vision_routes.pipeline_module, "VISION_QUEUE_TIMEOUT", 0)
+    p = pipeline()
+    third = _upload(client, data, user="user-3").get_json()
+    assert p.submitted == 1
+    assert _wait_for_results(client, third["id"])["status"] == "done"
+    assert _wait_for_results(client, first["id"])["status"] == "done"
+
+    # Polling a stale queued upload resubmits it too.
+    monkeypatch.setattr(vision_routes, "pipeline", lost)
+    monkeypatch.setattr(vision_routes.pipeline_module, "VISION_QUEUE_TIMEOUT", 300)
+    lonely = _upload(client, _image()).get_json()
+    monkeypatch.setattr(vision_routes.pipeline_module, "VISION_QUEUE_TIMEOUT", 0)
+    p = pipeline()
+    assert client.get(f"/vision/{lonely['id']}/results").status_code == 202
+    assert p.submitted == 1
+    monkeypatch.setattr(vision_routes.pipeline_module, "VISION_QUEUE_TIMEOUT", 300)
+    assert _wait_for_results(client, lonely["id"])["status"] == "done"
+    assert p.submitted == 1
+
+
+def test_uploads_belong_to_their_user(app, client, storage, pipeline, login_as):
+    pipeline()
+    upload = _upload(client, _image()).get_json()
+    assert upload["user_id"] == "user-1"
+
+    assert app.test_client().get(f"/vision/{upload['id']}/status").status_code == 401
+    other = login_as(app.test_client(), "user-2")
+    assert other.get(f"/vision/{upload['id']}/status").status_code == 403
+    assert other.get(f"/vision/{upload['id']}/results").status_code == 403
+    assert other.post("/vision/upload?user_id=user-1", data=_image(), content_type="image/png").status_code == 403
+    owner = login_as(app.test_client(), "user-1")
+    assert owner.get(f"/vision/{upload['id']}/status").status_code == 200
+
+
+def test_multipart_upload(client, storage, pipeline):
+    pipeline()
+    data = _image()
+    resp = client.post("/vision/upload?user_id=user-1", content_type="multipart/form-data",
+                       data={"image": (io.BytesIO(data), "fridge.jpg", "image/jpeg")})
+    assert resp.status_code == 202
+    assert resp.get_json()["content_type"] == "image/jpeg"
+    assert _wait_for_results(client, resp.get_json()["id"])["status"] == "done"
+
+
+def test_slow_detector_does_not_block_upload(client, storage, pipeline):
+    pipeline("backend.tests.test_vision:SlowDetector")
+    _wait_for_results(client, _upload(client, _image()).get_json()["id"])  # pays the worker spawn
+
+    started = time.perf_counter()
+    resp = _upload(client, _image())
+    assert time.perf_counter() - started < 0.5
+    assert resp.get_json()["status"] == "queued"
+    assert _wait_for_results(client, resp.get_json()["id"])["model_version"] == "slow-1"
+
+
+def test_detector_failure_marks_upload_failed(client, storage, pipeline):
+    pipeline("backend.tests.test_vision:BrokenDetector")
+    result = _wait_for_results(client, _upload(client, _image()).get_json()["id"])
+    assert result["status"] == "failed"
+    assert "model weights missing" in result["error"]
+
+
+def test_upload_validation(client, storage, pipeline, monkeypatch):
+    pipeline()
+    assert client.post("/vision/upload?user_id=", data=_image(), content_type="image/png").status_code == 400
+    assert client.post("/vision/upload?user_id=u", data=b"hi", content_type="text/plain").status_code == 415
+    assert client.post("/vision/upload?user_id=u", data=b"", content_type="image/png").status_code == 400
+    monkeypatch.setattr(vision_routes, "VISION_MAX_UPLOAD_BYTES", 1024)
+    assert _upload(client, _image()).status_code == 413
+    assert client.get("/vision/nope/status").status_code == 400
+
+
+def test_disk_storage_cleans_up_oversized_uploads(tmp_path):
+    disk = DiskStorage(str(tmp_path))
+    with pytest.raises(UploadTooLarge):
+        disk.save(iter([b"x" * 600, b"x" * 600]), max_bytes=1000)
+    assert os.listdir(tmp_path) == []
+
+    key, size = disk.save(iter([b"ab", b"cd"]), max_bytes=1000)
+    assert size == 4
+    assert disk.save(iter([b"abcd"]))[0] == key
+
+
+def test_gridfs_source_is_a_reference():
+    # Reading it back needs a real mongod; here only what is handed to the worker is checked.
+    key = "ab" * 32
+    source = GridFSStorage().source(key)
+    # The worker gets where the image is, not the image.
+    assert isinstance(source, GridFSSource)
+    assert (source.db_name, source.bucket, source.key) == (get_db().name, "images", key)
+    assert len(pickle.dumps(source)) < 1024
+
+
+def test_run_detection_reads_sources():
+    data = _image()
+    assert run_detection("backend.app.features.vision.detector:StubDetector", io.BytesIO(data)) == \
+        (StubDetector.model_version, StubDetector().detect(data))